@@ -0,0 +1,106 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import threading
+import time
+
+MACD_CSV = "time,MACD,MACD_Hist,MACD_Signal\n2024-01-03,1.5,0.5,1.0\n2024-01-02,1.4,0.3,1.1\n2023-12-01,9,9,9\n"
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, text, delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(dict(params))
+        time.sleep(self.delay)
+        return _FakeResponse(self.text)
+
+
+def test_macd_siblings_share_one_request(monkeypatch):
+    from tradingagents.dataflows import alpha_vantage_common, alpha_vantage_indicator
+
+    session = _FakeSession(MACD_CSV)
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage_common, "_get_session", lambda: session)
+    monkeypatch.setattr(alpha_vantage_indicator, "_series_cache", type(alpha_vantage_indicator._series_cache)())
+
+    outputs = {
+        name: alpha_vantage_indicator.get_indicator("IBM", name, "2024-01-03", 5)
+        for name in ("macd", "macds", "macdh")
+    }
+
+    assert len(session.calls) == 1 and session.calls[0]["function"] == "MACD"
+    assert "2024-01-02: 1.4\n2024-01-03: 1.5\n" in outputs["macd"]
+    assert "2024-01-02: 1.1\n2024-01-03: 1.0\n" in outputs["macds"]
+    assert "2024-01-02: 0.3\n2024-01-03: 0.5\n" in outputs["macdh"]
+
+
+def test_indicators_batch_joins_series_from_one_request(monkeypatch):
+    from tradingagents.dataflows import alpha_vantage_common, alpha_vantage_indicator
+
+    session = _FakeSession(MACD_CSV)
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage_common, "_get_session", lambda: session)
+    monkeypatch.setattr(alpha_vantage_indicator, "_series_cache", type(alpha_vantage_indicator._series_cache)())
+
+    output = alpha_vantage_indicator.get_indicators_batch("IBM", ["MACD", "macdh", "macd", "vwma"], "2024-01-03", 5)
+
+    assert len(session.calls) == 1
+    assert "date,macd,macdh\n2024-01-02,1.4,0.3\n2024-01-03,1.5,0.5" in output
+    assert "vwma" in output.split("\n\n")[-1]
+
+
+def test_indicators_batch_raises_when_nothing_was_fetched(monkeypatch):
+    import pytest
+    from tradingagents.dataflows import alpha_vantage_common, alpha_vantage_indicator
+
+    session = _FakeSession('{"Information": "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day."}')
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage_common, "_get_session", lambda: session)
+    monkeypatch.setattr(alpha_vantage_common, "get_vendor_quota", lambda config=None: None)
+    monkeypatch.setattr(alpha_vantage_indicator, "_series_cache", type(alpha_vantage_indicator._series_cache)())
+
+    with pytest.raises(alpha_vantage_common.AlphaVantageRateLimitError):
+        alpha_vantage_indicator.get_indicators_batch("IBM", ["rsi", "macd"], "2024-01-03", 5)
+
+    session.text = "time,Real Middle Band\n"
+    with pytest.raises(RuntimeError):
+        alpha_vantage_indicator.get_indicators_batch("IBM", ["rsi", "vwma"], "2024-01-03", 5)
+
+
+def test_identical_in_flight_requests_are_collapsed(monkeypatch):
+    from tradingagents.dataflows import alpha_vantage_common
+
+    session = _FakeSession("ok", delay=0.2)
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage_common, "_get_session", lambda: session)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(alpha_vantage_common._make_api_request("OVERVIEW", {"symbol": "IBM"})))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["ok"] * 4
+    assert len(session.calls) == 1
+    # Once it has completed, the same request goes out again
+    alpha_vantage_common._make_api_request("OVERVIEW", {"symbol": "IBM"})
+    assert len(session.calls) == 2
@@ -0,0 +1,27 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import json
+import os
+
+
+def test_range_matches_key_filter_and_reloads_on_change(tmp_path):
+    from tradingagents.dataflows.finnhub_store import load_finnhub_table, unique_entries
+
+    path = tmp_path / "AAPL_data_formatted.json"
+    data = {"2024-01-05": [{"a": 1}], "2024-01-01": [{"a": 1}, {"b": 2}], "2024-01-03": [], "2024-01-09": [{"c": 3}]}
+    path.write_text(json.dumps(data))
+
+    table = load_finnhub_table(str(path))
+    expected = {key: value for key, value in data.items() if "2024-01-01" <= key <= "2024-01-05" and value}
+    assert table.range("2024-01-01", "2024-01-05") == expected
+    assert list(table.range("2024-01-01", "2024-01-05")) == ["2024-01-01", "2024-01-05"]
+    assert load_finnhub_table(str(path)) is table
+    assert list(unique_entries(table.range("2024-01-01", "2024-01-09").values())) == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+    path.write_text(json.dumps({"2024-02-01": [{"d": 4}]}))
+    os.utime(path, (0, os.stat(path).st_mtime + 5))
+    assert load_finnhub_table(str(path)).range("2024-01-01", "2024-12-31") == {"2024-02-01": [{"d": 4}]}
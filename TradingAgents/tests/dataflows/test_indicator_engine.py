@@ -0,0 +1,97 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def _write_ohlcv(path, rows=300):
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    pd.DataFrame(
+        {
+            "Date": pd.bdate_range("2023-01-02", periods=rows).strftime("%Y-%m-%d"),
+            "Open": close + rng.normal(0, 0.5, rows),
+            "High": close + np.abs(rng.normal(0, 1, rows)),
+            "Low": close - np.abs(rng.normal(0, 1, rows)),
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, rows),
+        }
+    ).to_csv(path, index=False)
+
+
+def test_indicator_matrix_matches_stockstats(tmp_path):
+    from stockstats import wrap
+    from tradingagents.dataflows.indicator_engine import SUPPORTED_INDICATORS, load_indicator_matrix
+
+    csv_path = tmp_path / "AAPL.csv"
+    _write_ohlcv(csv_path)
+    matrix = load_indicator_matrix("AAPL", str(csv_path), cache_root=str(tmp_path / "indicators"))
+
+    frame = wrap(pd.read_csv(csv_path))
+    for indicator in SUPPORTED_INDICATORS:
+        expected = {
+            row["Date"]: "N/A" if pd.isna(row[indicator]) else str(row[indicator])
+            for _, row in frame[["Date", indicator]].iterrows()
+        }
+        assert matrix.window(indicator, "2000-01-01", "2100-01-01") == expected, indicator
+
+
+def test_indicator_matrix_window_and_versioning(tmp_path):
+    from tradingagents.dataflows.indicator_engine import load_indicator_matrix
+
+    csv_path = tmp_path / "MSFT.csv"
+    cache_root = tmp_path / "indicators"
+    _write_ohlcv(csv_path, rows=10)
+    matrix = load_indicator_matrix("MSFT", str(csv_path), cache_root=str(cache_root))
+
+    window = matrix.window("rsi", "2023-01-07", "2023-01-10")
+    assert list(window) == ["2023-01-09", "2023-01-10"]
+    assert matrix.window("rsi", "2024-01-01", "2024-01-31") == {}
+
+    _write_ohlcv(csv_path, rows=12)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, (stat.st_atime, stat.st_mtime + 5))
+    assert len(load_indicator_matrix("MSFT", str(csv_path), cache_root=str(cache_root))) == 12
+    assert len(os.listdir(cache_root)) == 1
+
+
+def test_indicators_batch_table_matches_windows(tmp_path, monkeypatch):
+    from tradingagents.dataflows import indicator_engine, y_finance
+
+    csv_path = tmp_path / "AAPL.csv"
+    _write_ohlcv(csv_path, rows=40)
+    matrix = indicator_engine.load_indicator_matrix("AAPL", str(csv_path), cache_root=str(tmp_path / "indicators"))
+    monkeypatch.setattr(y_finance, "_get_ohlcv_source", lambda symbol: str(csv_path))
+    monkeypatch.setattr(y_finance, "load_indicator_matrix", lambda symbol, path: matrix)
+
+    output = y_finance.get_stock_stats_indicators_batch("AAPL", "rsi, close_10_ema,RSI", "2023-02-20", 10)
+
+    lines = output.split("\n\n", 1)[1].split("\n")
+    assert lines[0] == "date,rsi,close_10_ema"
+    rsi = matrix.window("rsi", "2023-02-10", "2023-02-20")
+    ema = matrix.window("close_10_ema", "2023-02-10", "2023-02-20")
+    assert lines[1:] == [f"{day},{rsi[day]},{ema[day]}" for day in rsi]
+
+
+def test_stale_version_cleanup_keeps_other_symbols(tmp_path):
+    from tradingagents.dataflows.indicator_engine import load_indicator_matrix
+
+    cache_root = tmp_path / "indicators"
+    cache_root.mkdir()
+    (cache_root / "BRK-B-0123456789ab.npz").write_bytes(b"")
+    (cache_root / "BRK-00000000aaaa.npz").write_bytes(b"")
+
+    csv_path = tmp_path / "BRK.csv"
+    _write_ohlcv(csv_path, rows=10)
+    load_indicator_matrix("BRK", str(csv_path), cache_root=str(cache_root))
+
+    names = sorted(path.name for path in cache_root.iterdir())
+    assert "BRK-B-0123456789ab.npz" in names
+    assert "BRK-00000000aaaa.npz" not in names
+    assert len(names) == 2
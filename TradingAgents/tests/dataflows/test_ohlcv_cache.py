@@ -0,0 +1,90 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import json
+
+import pandas as pd
+
+
+class _FakeSource:
+    def __init__(self, closes):
+        self.closes = closes  # date -> close
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        dates = sorted(day for day in self.closes if day >= start and (end is None or day < end))
+        return pd.DataFrame({"Date": dates, "Close": [self.closes[day] for day in dates], "Volume": [1] * len(dates)})
+
+
+def test_refresh_fetches_only_trailing_rows_and_redownloads_on_adjustment(tmp_path, monkeypatch):
+    from tradingagents.dataflows import ohlcv_cache
+
+    history = {f"2024-01-{day:02d}": float(day) for day in range(1, 21)}
+    source = _FakeSource(history)
+    (tmp_path / "AAPL-YFin-data-2009-10-17-2024-10-17.csv").write_text("x")
+    (tmp_path / "AAPL-YFin-data-2015-01-01-2025-03-25.csv").write_text("x")
+    cache = ohlcv_cache.OhlcvCache(str(tmp_path / "ohlcv"), history_years=1, sources={"fake": source}, legacy_dir=str(tmp_path))
+
+    monkeypatch.setattr(ohlcv_cache, "_today", lambda: "2024-01-20")
+    cache.ensure("AAPL", "fake", start="2024-01-01")
+    assert len(source.calls) == 1
+    assert list(cache.frame("AAPL", "fake", "2024-01-18", "2024-01-19")["Close"]) == [18.0, 19.0]
+    assert len(source.calls) == 1  # same day: served from the cache
+    # legacy per-day download removed, fixed local dataset kept
+    assert not (tmp_path / "AAPL-YFin-data-2009-10-17-2024-10-17.csv").exists()
+    assert (tmp_path / "AAPL-YFin-data-2015-01-01-2025-03-25.csv").exists()
+
+    history["2024-01-21"] = 21.0
+    monkeypatch.setattr(ohlcv_cache, "_today", lambda: "2024-01-22")
+    frame = cache.frame("AAPL", "fake", "2024-01-01")
+    assert source.calls[-1] == ("2024-01-16", None)
+    assert list(frame["Close"])[-2:] == [20.0, 21.0] and len(frame) == 21
+
+    # A split re-adjusts the whole history: the overlap disagrees, so everything is downloaded again
+    for day in list(history):
+        history[day] /= 2
+    monkeypatch.setattr(ohlcv_cache, "_today", lambda: "2024-01-23")
+    assert cache.frame("AAPL", "fake", "2024-01-01")["Close"].iloc[0] == 0.5
+    assert source.calls[-1] == ("2023-01-20", None)  # the whole covered range (history_years before the first fetch)
+
+    manifest = json.loads((tmp_path / "ohlcv" / "manifest.json").read_text())
+    assert manifest["entries"]["fake/AAPL"]["rows"] == 21
+
+
+def test_manifest_shared_by_instances_and_gc_spares_fresh_unknown_csvs(tmp_path):
+    import os
+    import threading
+    import time
+
+    from tradingagents.dataflows import ohlcv_cache
+
+    root = str(tmp_path / "ohlcv")
+    # Two instances stand in for two processes: they share nothing but the files
+    first, second = ohlcv_cache.OhlcvCache(root), ohlcv_cache.OhlcvCache(root)
+
+    def update(cache, prefix):
+        for index in range(20):
+            cache._update_manifest(f"fake/{prefix}{index}", {"path": "x", "refreshed_on": "2024-01-01"})
+
+    threads = [threading.Thread(target=update, args=(cache, prefix)) for cache, prefix in ((first, "A"), (second, "B"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(first._read_manifest()["entries"]) == 40
+
+    # A CSV whose manifest entry another process has not written yet survives GC; stale orphans do not
+    directory = tmp_path / "ohlcv" / "yfinance"
+    directory.mkdir(parents=True)
+    (directory / "NEW.csv").write_text("Date,Close\n")
+    (directory / "OLD.csv").write_text("Date,Close\n")
+    old = time.time() - ohlcv_cache.ORPHAN_GRACE_SECONDS - 60
+    os.utime(directory / "OLD.csv", (old, old))
+
+    removed = first.gc()
+    assert str(directory / "OLD.csv") in removed
+    assert (directory / "NEW.csv").exists() and not (directory / "OLD.csv").exists()
@@ -0,0 +1,84 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import os
+
+import pandas as pd
+
+
+def _write_prices(path, dates, closes):
+    pd.DataFrame({"Date": dates, "Close": closes, "Volume": range(len(dates))}).to_csv(path, index=False)
+
+
+def test_price_table_slices_match_string_filter(tmp_path):
+    from tradingagents.dataflows.price_store import load_price_table
+
+    csv_path = tmp_path / "AAPL.csv"
+    dates = ["2024-01-02", "2024-01-03", "2024-01-05", "2024-01-08", "2024-01-09"]
+    _write_prices(csv_path, dates, [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    table = load_price_table(str(csv_path), cache_root=str(tmp_path / "store"))
+    sliced = table.slice("2024-01-03", "2024-01-08")
+
+    assert list(sliced["Date"]) == ["2024-01-03", "2024-01-05", "2024-01-08"]
+    assert list(sliced["Close"]) == [2.0, 3.0, 4.0]
+    assert list(table.slice("2024-01-04", "2024-01-08", keep_index=True).index) == [2, 3]
+    assert table.slice("2024-02-01", "2024-02-05").empty
+    assert list(table.column("Close", "2024-01-09")) == [5.0]
+
+
+def test_price_table_rebuilds_when_source_changes(tmp_path):
+    from tradingagents.dataflows.price_store import load_price_table
+
+    csv_path = tmp_path / "MSFT.csv"
+    _write_prices(csv_path, ["2024-01-02"], [10.0])
+    assert len(load_price_table(str(csv_path), cache_root=str(tmp_path / "store"))) == 1
+
+    _write_prices(csv_path, ["2024-01-02", "2024-01-03"], [10.0, 11.0])
+    stat = os.stat(csv_path)
+    os.utime(csv_path, (stat.st_atime, stat.st_mtime + 5))
+
+    table = load_price_table(str(csv_path), cache_root=str(tmp_path / "store"))
+    assert list(table.column("Close")) == [10.0, 11.0]
+
+
+def _convert_in_child(csv_path, cache_root, results):
+    from tradingagents.dataflows.price_store import load_price_table
+
+    try:
+        results.put(list(load_price_table(csv_path, cache_root=cache_root).column("Close")))
+    except Exception as exc:  # reported to the parent
+        results.put(repr(exc))
+
+
+def test_concurrent_conversions_across_processes_share_one_version(tmp_path):
+    import multiprocessing
+
+    from tradingagents.dataflows.price_store import load_price_table
+    from tradingagents.dataflows.store_dirs import current_version
+
+    csv_path = tmp_path / "NVDA.csv"
+    _write_prices(csv_path, ["2024-01-02", "2024-01-03"], [1.0, 2.0])
+    cache_root = str(tmp_path / "store")
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_convert_in_child, args=(str(csv_path), cache_root, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    assert outcomes == [[1.0, 2.0]] * 4
+    versions = [name for name in os.listdir(cache_root) if ".v-" in name]
+    assert len(versions) == 1
+
+    # A converted store is reused, not rebuilt, by a later process
+    store_dir = os.path.join(cache_root, versions[0].split(".v-")[0])
+    assert current_version(store_dir) == os.path.join(cache_root, versions[0])
+    assert list(load_price_table(str(csv_path), cache_root=cache_root).column("Close")) == [1.0, 2.0]
+    assert [name for name in os.listdir(cache_root) if ".v-" in name] == versions
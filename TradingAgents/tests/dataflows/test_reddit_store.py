@@ -0,0 +1,92 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import json
+import os
+from datetime import datetime, timezone
+
+
+def _ts(day: str, hour: int = 12) -> float:
+    return datetime.strptime(day, "%Y-%m-%d").replace(hour=hour, tzinfo=timezone.utc).timestamp()
+
+
+def _write_posts(path, posts):
+    with open(path, "w", encoding="utf-8") as handle:
+        for title, day, ups in posts:
+            handle.write(
+                json.dumps({"title": title, "selftext": "", "url": f"u/{title}", "ups": ups, "created_utc": _ts(day), "extra": "x"})
+                + "\n"
+            )
+
+
+def test_range_query_matches_per_day_fetches_and_rebuilds_on_change(tmp_path, monkeypatch):
+    from tradingagents.dataflows import reddit_store
+    from tradingagents.dataflows.reddit_utils import fetch_top_from_category, fetch_top_from_category_range
+
+    monkeypatch.setattr(reddit_store, "get_config", lambda: {"data_cache_dir": str(tmp_path / "cache")})
+    category = tmp_path / "reddit_data" / "global_news"
+    category.mkdir(parents=True)
+    _write_posts(category / "news.jsonl", [("a", "2024-01-01", 5), ("b", "2024-01-01", 9), ("c", "2024-01-02", 1), ("d", "2024-01-01", 7)])
+    _write_posts(category / "worldnews.jsonl", [("e", "2024-01-02", 3), ("f", "2024-01-03", 4)])
+    data_path = str(tmp_path / "reddit_data")
+
+    ranged = fetch_top_from_category_range("global_news", "2024-01-01", "2024-01-03", 4, data_path=data_path)
+    per_day = []
+    for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+        per_day.extend(fetch_top_from_category("global_news", day, 4, data_path=data_path))
+
+    assert ranged == per_day
+    # 2 per subreddit per day, highest upvotes first (subreddits in directory order within a day)
+    assert [post["title"] for post in ranged[:2]] == ["b", "d"]
+    assert sorted(post["title"] for post in ranged[2:4]) == ["c", "e"]
+    assert ranged[4]["title"] == "f"
+    assert ranged[0] == {"title": "b", "content": "", "url": "u/b", "upvotes": 9, "posted_date": "2024-01-01"}
+
+    _write_posts(category / "worldnews.jsonl", [("g", "2024-01-03", 8)])
+    os.utime(category / "worldnews.jsonl", (0, os.stat(category / "worldnews.jsonl").st_mtime + 5))
+    titles = [post["title"] for post in fetch_top_from_category_range("global_news", "2024-01-03", "2024-01-03", 4, data_path=data_path)]
+    assert titles == ["g"]
+
+
+def test_company_news_reads_mention_index(tmp_path, monkeypatch):
+    from tradingagents.dataflows import entity_matcher, reddit_store
+    from tradingagents.dataflows.reddit_utils import fetch_top_from_category_range
+
+    universe = tmp_path / "universe.json"
+    universe.write_text(json.dumps({"ACME": ["Acme Corp", "Acme"]}))
+    config = {"data_cache_dir": str(tmp_path / "cache"), "entity_universe_path": str(universe)}
+    monkeypatch.setattr(reddit_store, "get_config", lambda: config)
+    monkeypatch.setattr(entity_matcher, "get_config", lambda: config)
+
+    category = tmp_path / "reddit_data" / "company_news"
+    category.mkdir(parents=True)
+    _write_posts(
+        category / "stocks.jsonl",
+        [
+            ("Acme Corp beats estimates", "2024-01-01", 5),
+            ("Visa and $ACME partner", "2024-01-02", 3),
+            ("acmeville weather", "2024-01-02", 9),
+            ("Apple event recap", "2024-01-02", 4),
+            ("v for vendetta", "2024-01-02", 8),
+            ("GME to the moon", "2024-01-03", 2),
+        ],
+    )
+    data_path = str(tmp_path / "reddit_data")
+
+    def titles(query):
+        posts = fetch_top_from_category_range("company_news", "2024-01-01", "2024-01-03", 10, query=query, data_path=data_path)
+        return [post["title"] for post in posts]
+
+    assert titles("ACME") == ["Acme Corp beats estimates", "Visa and $ACME partner"]
+    # Symbols match case-sensitively as whole words; company names case-insensitively.
+    assert titles("V") == ["Visa and $ACME partner"]
+    assert titles("AAPL") == ["Apple event recap"]
+    # Tickers outside the universe fall back to a symbol scan.
+    assert titles("GME") == ["GME to the moon"]
+    assert titles("ZZZZ") == []
+
+    store = reddit_store.load_reddit_store(str(category), matcher=entity_matcher.get_entity_matcher())
+    assert {"ACME", "AAPL", "V"} <= set(store.mention_tickers)
@@ -0,0 +1,79 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import pandas as pd
+
+
+def _original_lookup(csv_path, ticker, curr_date):
+    df = pd.read_csv(csv_path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    filtered = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= pd.to_datetime(curr_date, utc=True).normalize())]
+    return None if filtered.empty else filtered.loc[filtered["Publish Date"].idxmax()]
+
+
+def test_as_of_matches_full_csv_filter(tmp_path):
+    from tradingagents.dataflows.simfin_store import load_simfin_statements
+
+    csv_path = tmp_path / "us-balance-quarterly.csv"
+    pd.DataFrame(
+        {
+            "Ticker": ["AAPL", "MSFT", "AAPL", "AAPL", "MSFT", "AAPL"],
+            "SimFinId": [1, 2, 1, 1, 2, 1],
+            "Report Date": ["2023-09-30", "2023-09-30", "2023-12-31", "2023-06-30", "2023-12-31", "2023-12-31"],
+            "Publish Date": ["2023-11-03", "2023-10-24", "2024-02-02", "2023-08-04", "2024-01-30", "2024-02-02"],
+            "Total Assets": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    ).to_csv(csv_path, sep=";", index=False)
+
+    store = load_simfin_statements(str(csv_path), cache_root=str(tmp_path / "store"))
+    for ticker in ("AAPL", "MSFT", "TSLA"):
+        for date in ("2023-01-01", "2023-08-04", "2023-11-02", "2024-02-01", "2024-02-02", "2025-01-01"):
+            expected = _original_lookup(csv_path, ticker, date)
+            actual = store.as_of(ticker, date)
+            if expected is None:
+                assert actual is None
+            else:
+                assert str(actual) == str(expected)
+    # Equal publish dates resolve to the first row in the CSV, like idxmax.
+    assert store.as_of("AAPL", "2024-03-01")["Total Assets"] == 3.0
+
+
+def _as_of_in_child(csv_path, cache_root, results):
+    from tradingagents.dataflows.simfin_store import load_simfin_statements
+
+    try:
+        results.put(float(load_simfin_statements(csv_path, cache_root=cache_root).as_of("AAPL", "2024-03-01")["Total Assets"]))
+    except Exception as exc:  # reported to the parent
+        results.put(repr(exc))
+
+
+def test_concurrent_first_use_across_processes_converts_once(tmp_path):
+    import multiprocessing
+    import os
+
+    csv_path = tmp_path / "us-cashflow-annual.csv"
+    pd.DataFrame(
+        {
+            "Ticker": ["AAPL", "AAPL"],
+            "Report Date": ["2023-09-30", "2023-12-31"],
+            "Publish Date": ["2023-11-03", "2024-02-02"],
+            "Total Assets": [1.0, 2.0],
+        }
+    ).to_csv(csv_path, sep=";", index=False)
+    cache_root = str(tmp_path / "store")
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_as_of_in_child, args=(str(csv_path), cache_root, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    assert outcomes == [2.0] * 4
+    assert len([name for name in os.listdir(cache_root) if ".v-" in name]) == 1
@@ -0,0 +1,77 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+from datetime import date
+
+
+def test_vendor_cache_roundtrip_and_stats(tmp_path):
+    from tradingagents.dataflows.vendor_cache import VendorCache
+
+    def fake_impl(symbol, start_date, end_date):
+        return "csv"
+
+    cache = VendorCache(str(tmp_path / "cache.sqlite3"))
+    key = cache.make_key("get_stock_data", "yfinance", fake_impl, ("AAPL", "2024-01-01"), {"end_date": "2024-01-31"})
+    same_key = cache.make_key("get_stock_data", "yfinance", fake_impl, (" AAPL", "2024-01-01", "2024-01-31"), {})
+    assert key == same_key
+
+    assert cache.get(key, "get_stock_data") == (False, None)
+    assert cache.set(key, "get_stock_data", "yfinance", "date,close\n2024-01-02,1.0", None)
+    assert cache.get(key, "get_stock_data") == (True, "date,close\n2024-01-02,1.0")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["by_method"]["get_stock_data"] == {"hits": 1, "misses": 1}
+
+
+def test_vendor_cache_skips_errors_and_expires(tmp_path):
+    from tradingagents.dataflows.vendor_cache import VendorCache
+
+    cache = VendorCache(str(tmp_path / "cache.sqlite3"))
+    assert not cache.set("k1", "get_news", "alpha_vantage", "", 60)
+    assert not cache.set("k1", "get_news", "alpha_vantage", '{"Error Message": "bad"}', 60)
+    assert not cache.set("k1", "get_stock_data", "yfinance", "No data found for symbol 'AAPL' between a and b", None)
+    assert not cache.set("k1", "get_balance_sheet", "yfinance", "No balance sheet data found for symbol 'AAPL'", None)
+
+    # Empty but valid answers expire quickly even in never-expiring categories
+    assert cache.set("k3", "get_indicators", "yfinance", "## rsi values:\n\nNo data available for the specified date range.", None)
+    expires_at = cache._conn.execute("SELECT expires_at FROM vendor_responses WHERE key = 'k3'").fetchone()[0]
+    assert expires_at is not None
+
+    cache.set("k2", "get_news", "alpha_vantage", "headline", -1)
+    assert cache.get("k2", "get_news") == (False, None)
+
+
+def test_vendor_cache_ttl_shortened_for_live_ranges(tmp_path):
+    from tradingagents.dataflows.vendor_cache import LIVE_DATA_TTL, VendorCache
+
+    cache = VendorCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.ttl_for("core_stock_apis", {"end_date": "2020-01-31"}) is None
+    assert cache.ttl_for("core_stock_apis", {"end_date": date.today().isoformat()}) == LIVE_DATA_TTL
+    assert cache.ttl_for("fundamental_data", {"curr_date": "2020-01-31"}) == 3 * 24 * 60 * 60
+
+
+def test_route_to_vendor_serves_repeat_calls_from_cache(tmp_path, monkeypatch):
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows.vendor_cache import VendorCache
+
+    calls = []
+
+    def fake_balance_sheet(ticker, freq="quarterly", curr_date=None):
+        calls.append(ticker)
+        return f"balance sheet for {ticker}"
+
+    cache = VendorCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: cache)
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_balance_sheet", {"alpha_vantage": fake_balance_sheet})
+
+    first = interface.route_to_vendor("get_balance_sheet", "NVDA", "quarterly", "2024-01-10")
+    second = interface.route_to_vendor("get_balance_sheet", "NVDA", freq="quarterly", curr_date="2024-01-10")
+
+    assert first == second == "balance sheet for NVDA"
+    assert calls == ["NVDA"]
+    assert cache.stats()["hits"] == 1
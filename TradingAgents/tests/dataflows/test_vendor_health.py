@@ -0,0 +1,137 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_open_circuit_skips_failing_vendor_until_probe_succeeds(monkeypatch):
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows.vendor_health import VendorHealth
+
+    clock = _Clock()
+    health = VendorHealth(failure_threshold=3, cooldown=30, clock=clock)
+    calls = []
+    primary_up = [False]
+
+    def primary(ticker, freq="quarterly", curr_date=None):
+        calls.append("alpha_vantage")
+        if not primary_up[0]:
+            raise TimeoutError("read timed out")
+        return "primary"
+
+    def fallback(ticker, freq="quarterly", curr_date=None):
+        calls.append("yfinance")
+        return "fallback"
+
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_limiter", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_health", lambda: health)
+    monkeypatch.setattr(interface, "get_vendor", lambda category, method=None: "alpha_vantage")
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_balance_sheet", {"alpha_vantage": primary, "yfinance": fallback})
+
+    for _ in range(3):
+        assert interface.route_to_vendor("get_balance_sheet", "NVDA") == "fallback"
+    assert calls.count("alpha_vantage") == 3
+
+    # Circuit open: the primary is not called at all
+    calls.clear()
+    assert interface.route_to_vendor("get_balance_sheet", "NVDA") == "fallback"
+    assert calls == ["yfinance"]
+    assert health.snapshot()["get_balance_sheet"]["alpha_vantage"]["state"] == "open"
+
+    # After the cooldown one probe goes through; a failed probe doubles the cooldown
+    clock.now += 31
+    calls.clear()
+    interface.route_to_vendor("get_balance_sheet", "NVDA")
+    assert calls == ["alpha_vantage", "yfinance"]
+    clock.now += 31
+    calls.clear()
+    interface.route_to_vendor("get_balance_sheet", "NVDA")
+    assert calls == ["yfinance"]
+
+    clock.now += 30
+    primary_up[0] = True
+    calls.clear()
+    assert interface.route_to_vendor("get_balance_sheet", "NVDA") == "primary"
+    assert calls == ["alpha_vantage"]
+    assert health.snapshot()["get_balance_sheet"]["alpha_vantage"]["state"] == "closed"
+
+
+def test_fallbacks_are_ordered_by_latency_after_primaries():
+    from tradingagents.dataflows.vendor_health import VendorHealth
+
+    health = VendorHealth()
+    for _ in range(3):
+        health.record("get_news", "google", True, 2.0)
+        health.record("get_news", "local", True, 0.1)
+        health.record("get_news", "openai", True, 5.0)
+
+    assert health.order("get_news", ["openai", "google", "local"], ["openai"]) == ["openai", "local", "google"]
+    # Vendors without enough samples are tried before measured ones so they get measured
+    assert health.order("get_news", ["openai", "google", "gemini"], ["openai"]) == ["openai", "gemini", "google"]
+
+
+def test_error_text_trips_breaker_but_rejected_arguments_do_not(monkeypatch):
+    import pytest
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows.utils import UnsupportedArgumentError
+    from tradingagents.dataflows.vendor_health import VendorHealth
+
+    health = VendorHealth(failure_threshold=2, cooldown=30, clock=_Clock())
+
+    def alpha_vantage(symbol, indicator, curr_date, look_back_days):
+        if indicator == "bogus":
+            raise UnsupportedArgumentError(f"Indicator {indicator} is not supported.")
+        return f"Error retrieving {indicator} data: timeout"
+
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_limiter", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_health", lambda: health)
+    monkeypatch.setattr(interface, "get_vendor", lambda category, method=None: "alpha_vantage")
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_indicators", {"alpha_vantage": alpha_vantage})
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            interface.route_to_vendor("get_indicators", "IBM", "bogus", "2024-01-10", 5)
+    assert health.snapshot()["get_indicators"]["alpha_vantage"]["calls"] == 0
+
+    for _ in range(2):
+        interface.route_to_vendor("get_indicators", "IBM", "rsi", "2024-01-10", 5)
+    report = health.snapshot()["get_indicators"]["alpha_vantage"]
+    assert report["state"] == "open" and report["error_rate"] == 1.0
+
+
+def test_vendor_value_errors_count_as_failures(monkeypatch):
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows.vendor_health import VendorHealth
+
+    health = VendorHealth(failure_threshold=3, cooldown=30, clock=_Clock())
+    calls = []
+
+    def alpha_vantage(symbol, start_date, end_date):
+        calls.append("alpha_vantage")
+        raise ValueError(f"Unexpected Alpha Vantage response for {symbol}: {{}}")
+
+    def yfinance(symbol, start_date, end_date):
+        return "prices"
+
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_limiter", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_health", lambda: health)
+    monkeypatch.setattr(interface, "get_vendor", lambda category, method=None: "alpha_vantage")
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_stock_data", {"alpha_vantage": alpha_vantage, "yfinance": yfinance})
+
+    for _ in range(10):
+        assert interface.route_to_vendor("get_stock_data", "NVDA", "2024-01-01", "2024-01-10") == "prices"
+
+    assert calls == ["alpha_vantage"] * 3
+    assert health.snapshot()["get_stock_data"]["alpha_vantage"]["state"] == "open"
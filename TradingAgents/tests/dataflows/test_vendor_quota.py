@@ -0,0 +1,51 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+
+def test_budgets_are_shared_through_the_database(tmp_path):
+    from tradingagents.dataflows.vendor_quota import QuotaGovernor
+
+    path = str(tmp_path / "quota.sqlite3")
+    budgets = {"alpha_vantage": {"per_minute": 2, "per_day": 3}}
+    first, second = QuotaGovernor(path, budgets), QuotaGovernor(path, budgets)  # e.g. two runner processes
+
+    assert first.acquire("alpha_vantage") and second.acquire("alpha_vantage")
+    granted, wait = first.try_acquire("alpha_vantage")
+    assert not granted and 0 < wait <= 30  # minute bucket empty: the next token is ~30s away
+    assert not second.acquire("alpha_vantage", max_wait=0)  # caller falls back immediately
+    assert second.acquire("openai")  # vendors without a budget are never limited
+
+    report = first.remaining()["alpha_vantage"]
+    assert report["day_used"] == 2 and report["day_remaining"] == 1 and report["minute_remaining"] == 0
+
+    second.penalize("alpha_vantage", seconds=120)
+    assert first.remaining()["alpha_vantage"]["blocked_for_seconds"] > 100
+
+
+def test_exhausted_budget_falls_back_to_next_indicator_vendor(tmp_path, monkeypatch):
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows import alpha_vantage_common, alpha_vantage_indicator
+    from tradingagents.dataflows.vendor_quota import QuotaGovernor
+
+    governor = QuotaGovernor(str(tmp_path / "quota.sqlite3"), {"alpha_vantage": {"per_day": 10}})
+    governor.penalize("alpha_vantage", until_next_day=True)
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(alpha_vantage_common, "get_vendor_quota", lambda config=None: governor)
+    monkeypatch.setattr(alpha_vantage_indicator, "_series_cache", type(alpha_vantage_indicator._series_cache)())
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_limiter", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_health", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor", lambda category, method=None: "alpha_vantage")
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_indicators",
+        {
+            "alpha_vantage": alpha_vantage_indicator.get_indicator,
+            "yfinance": lambda symbol, indicator, curr_date, look_back_days: f"yfinance {indicator}",
+        },
+    )
+
+    assert interface.route_to_vendor("get_indicators", "IBM", "rsi", "2024-01-10", 5) == "yfinance rsi"
@@ -1,6 +1,6 @@
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-25
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 
@@ -13,9 +13,10 @@ from fastapi.testclient import TestClient
 
 api_app_module = importlib.import_module("tradingagents.api.app")
 from tradingagents.api.app import app
+from tradingagents.api.run_store import RunRecord, RunStore, compact_events
 
 
-def _fake_run_tradingagents(
+async def _fake_run_tradingagents(
     ticker: str,
     trade_date: str,
     *,
@@ -40,16 +41,16 @@ def _fake_run_tradingagents(
     return payload
 
 
-def test_create_run_and_poll_success(monkeypatch) -> None:
+def test_create_run_and_poll_success(monkeypatch, tmp_path) -> None:
     """Runs endpoint schedules a job and surfaces the completion payload."""
     # Ensure we reload settings and start with a clean slate.
     api_app_module.get_settings.cache_clear()
-    api_app_module._runs.clear()  # type: ignore[attr-defined]
+    monkeypatch.setattr(api_app_module, "_runs", RunStore(str(tmp_path / "runs.sqlite3")))
 
     os.environ["SKIP_TOKEN_AUTH"] = "true"
     os.environ.pop("INTERNAL_API_TOKEN", None)
 
-    monkeypatch.setattr(api_app_module, "run_tradingagents", _fake_run_tradingagents)
+    monkeypatch.setattr(api_app_module, "arun_tradingagents", _fake_run_tradingagents)
 
     with TestClient(app) as client:
         response = client.post(
@@ -76,3 +77,144 @@ def test_create_run_and_poll_success(monkeypatch) -> None:
         assert final_state["status"] == "success"
         assert final_state["result"]["ticker"] == "NVDA"
         assert any(event["event"] == "progress" for event in final_state["events"])
+
+
+async def _slow_run_tradingagents(ticker: str, trade_date: str, **_kwargs: Any) -> Dict[str, Any]:
+    import asyncio
+
+    await asyncio.sleep(0.3)
+    return {"ticker": ticker, "trade_date": trade_date}
+
+
+def test_create_run_queues_and_rejects_when_backlog_full(monkeypatch) -> None:
+    """Runs beyond the concurrency limit queue; beyond the backlog they get 429."""
+    from tradingagents.api.scheduler import RunScheduler
+
+    api_app_module.get_settings.cache_clear()
+    monkeypatch.setattr(api_app_module, "_runs", RunStore())
+    os.environ["SKIP_TOKEN_AUTH"] = "true"
+
+    monkeypatch.setattr(api_app_module, "arun_tradingagents", _slow_run_tradingagents)
+    monkeypatch.setattr(api_app_module, "_scheduler", RunScheduler(max_concurrent=1, max_queued=1))
+
+    with TestClient(app) as client:
+        body = {"ticker": "NVDA", "trade_date": "2024-01-01"}
+        first = client.post("/runs", json=body).json()["id"]
+        second = client.post("/runs", json=body).json()["id"]
+        rejected = client.post("/runs", json=body)
+        assert rejected.status_code == 429
+
+        queued = client.get(f"/runs/{second}").json()
+        assert queued["status"] == "queued"
+        assert queued["queue_position"] == 1
+
+        for _ in range(40):
+            statuses = [client.get(f"/runs/{run_id}").json()["status"] for run_id in (first, second)]
+            if statuses == ["success", "success"]:
+                break
+            time.sleep(0.05)
+        assert statuses == ["success", "success"]
+
+
+def test_run_scheduler_priority_order() -> None:
+    import asyncio
+
+    from tradingagents.api.scheduler import RunScheduler
+
+    async def scenario() -> list:
+        order = []
+        gate = asyncio.Event()
+        scheduler = RunScheduler(max_concurrent=1, max_queued=5, policy="priority")
+
+        def job(name: str):
+            async def run() -> None:
+                if name == "blocker":
+                    await gate.wait()
+                order.append(name)
+
+            return run
+
+        scheduler.submit("blocker", job("blocker"))
+        scheduler.submit("low", job("low"), priority=0)
+        scheduler.submit("high", job("high"), priority=5)
+        assert scheduler.position("high") == 1
+        gate.set()
+        while scheduler.running or scheduler.queued:
+            await asyncio.sleep(0.01)
+        return order
+
+    assert asyncio.run(scenario()) == ["blocker", "high", "low"]
+
+
+def test_run_store_persists_pages_and_expires(tmp_path) -> None:
+    from datetime import datetime, timedelta
+
+    path = str(tmp_path / "runs.sqlite3")
+    store = RunStore(path, max_cached=1, owner="worker-a")
+    now = datetime.utcnow()
+    for index in range(3):
+        store.add(RunRecord(id=f"run{index}", ticker="NVDA", trade_date="2024-01-01", status="success",
+                            created_at=now + timedelta(seconds=index), updated_at=now))
+
+    assert len(store._records) == 1  # type: ignore[attr-defined]
+    page, total = store.page(offset=1, limit=1)
+    assert total == 3 and [record.id for record in page] == ["run1"]
+
+    store.add(RunRecord(id="live", ticker="NVDA", trade_date="2024-01-01", status="running",
+                        created_at=now, updated_at=now))
+    completed_at = store._conn.execute("SELECT completed_at FROM runs WHERE id = 'run0'").fetchone()[0]
+    store.save(store.get("run0"))
+    assert store._conn.execute("SELECT completed_at FROM runs WHERE id = 'run0'").fetchone()[0] == completed_at
+
+    # Another worker sharing the database leaves this worker's active run alone
+    assert RunStore(path, owner="worker-b").get("live").status == "running"
+    reopened = RunStore(path, owner="worker-a")
+    assert reopened.get("run0").status == "success"
+    assert reopened.get("live").status == "failed"
+
+    reopened.completed_ttl = -1
+    reopened.evict_expired()
+    assert len(reopened) == 0
+
+
+def test_run_store_without_owner_fails_interrupted_runs_on_restart(tmp_path) -> None:
+    from datetime import datetime
+
+    path = str(tmp_path / "runs.sqlite3")
+    now = datetime.utcnow()
+    RunStore(path).add(RunRecord(id="live", ticker="NVDA", trade_date="2024-01-01", status="running",
+                                 created_at=now, updated_at=now))
+    RunStore(path, owner="worker-b").add(RunRecord(id="other", ticker="NVDA", trade_date="2024-01-01",
+                                                   status="running", created_at=now, updated_at=now))
+
+    reopened = RunStore(path)
+    assert reopened.get("live").status == "failed"
+    assert reopened.get("live").error == "Interrupted by service restart."
+    assert reopened.get("other").status == "running"
+
+    reopened.completed_ttl = -1
+    reopened.evict_expired()
+    assert reopened.get("live") is None
+
+
+def test_compact_events_keeps_latest_report_snapshot() -> None:
+    events: list = []
+    compact_events(events, {"event": "state", "payload": {"reports": {"market_report": "v1"}, "message": {"content": "m"}}})
+    compact_events(events, {"event": "state", "payload": {"reports": {"market_report": "v2", "news_report": "n"}}})
+    compact_events(events, {"event": "state", "payload": {"investment_debate_state": {"history": "a"}}})
+    compact_events(events, {"event": "state", "payload": {"investment_debate_state": {"history": "ab"}}})
+
+    assert [event["payload"] for event in events] == [
+        {"message": {"content": "m"}},
+        {"reports": {"market_report": "v2", "news_report": "n"}},
+        {"investment_debate_state": {"history": "ab"}},
+    ]
+
+    compact_events(events, {"event": "state", "payload": {"deltas": {"reports.market_report": {"offset": 2, "delta": "+"}}}})
+    compact_events(events, {"event": "state", "payload": {"deltas": {"investment_debate_state.history": {"offset": 2, "delta": "c"}}}})
+    compact_events(events, {"event": "state", "payload": {"keyframe": True, "investment_debate_state": {"history": "abc"}}})
+
+    assert [event["payload"] for event in events][-2:] == [
+        {"deltas": {"reports.market_report": {"offset": 2, "delta": "+"}}},
+        {"keyframe": True, "investment_debate_state": {"history": "abc"}},
+    ]
@@ -0,0 +1,121 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import threading
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+
+def _stub_analyst(analyst_type, report_key, seen):
+    """Analyst that calls its tool once, then writes its report; records every message it is shown."""
+    from langchain_core.messages import AIMessage
+
+    def analyst_node(state):
+        seen[analyst_type].append([message.content for message in state["messages"]])
+        if not any(message.type == "tool" for message in state["messages"]):
+            call = {"name": f"{analyst_type}_data", "args": {"ticker": state["company_of_interest"]}, "id": f"call-{analyst_type}"}
+            return {"messages": [AIMessage(content=f"{analyst_type} asks", tool_calls=[call])]}
+        return {"messages": [AIMessage(content=f"{analyst_type} done")], report_key: f"{analyst_type} report"}
+
+    return analyst_node
+
+
+def _stub_tool_node(analyst_type):
+    from langchain_core.tools import StructuredTool
+    from langgraph.prebuilt import ToolNode
+
+    def fetch(ticker: str) -> str:
+        return f"{analyst_type} data for {ticker}"
+
+    return ToolNode([StructuredTool.from_function(fetch, name=f"{analyst_type}_data", description="Stub data.")])
+
+
+def _stub_graph(monkeypatch, parallel_analysts):
+    """Compile the trading graph with stub agents; returns (graph, messages seen per analyst, Bull Researcher states)."""
+    import tradingagents.graph.setup as setup
+    from tradingagents.graph.conditional_logic import ConditionalLogic
+
+    seen = {analyst_type: [] for analyst_type in ANALYSTS}
+    bull_states = []
+    lock = threading.Lock()
+
+    def bull_researcher(state):
+        with lock:
+            bull_states.append(dict(state))
+        return {"investment_debate_state": {**state["investment_debate_state"], "current_response": "Bull: buy", "count": 2}}
+
+    def risky_analyst(state):
+        return {"risk_debate_state": {**state["risk_debate_state"], "latest_speaker": "Risky", "count": 3}}
+
+    factories = {
+        "create_market_analyst": "market",
+        "create_social_media_analyst": "social",
+        "create_news_analyst": "news",
+        "create_fundamentals_analyst": "fundamentals",
+    }
+    for factory, analyst_type in factories.items():
+        node = _stub_analyst(analyst_type, setup.ANALYST_REPORT_KEYS[analyst_type], seen)
+        monkeypatch.setattr(setup, factory, lambda llm, node=node: node)
+    monkeypatch.setattr(setup, "create_bull_researcher", lambda llm, memory: bull_researcher)
+    monkeypatch.setattr(setup, "create_bear_researcher", lambda llm, memory: lambda state: {})
+    monkeypatch.setattr(setup, "create_research_manager", lambda llm, memory: lambda state: {"investment_plan": "plan"})
+    monkeypatch.setattr(setup, "create_trader", lambda llm, memory: lambda state: {"trader_investment_plan": "trade"})
+    monkeypatch.setattr(setup, "create_risky_debator", lambda llm: risky_analyst)
+    monkeypatch.setattr(setup, "create_safe_debator", lambda llm: lambda state: {})
+    monkeypatch.setattr(setup, "create_neutral_debator", lambda llm: lambda state: {})
+    monkeypatch.setattr(setup, "create_risk_manager", lambda llm, memory: lambda state: {"final_trade_decision": "BUY"})
+
+    graph_setup = setup.GraphSetup(
+        quick_thinking_llm=None,
+        deep_thinking_llm=None,
+        tool_nodes={analyst_type: _stub_tool_node(analyst_type) for analyst_type in ANALYSTS},
+        bull_memory=None,
+        bear_memory=None,
+        trader_memory=None,
+        invest_judge_memory=None,
+        risk_manager_memory=None,
+        conditional_logic=ConditionalLogic(),
+    )
+    graph = graph_setup.setup_graph(ANALYSTS, parallel_analysts=parallel_analysts)
+    return graph, seen, bull_states
+
+
+def test_parallel_analysts_join_every_report_before_bull_researcher(monkeypatch):
+    from tradingagents.graph.propagation import Propagator
+    from tradingagents.graph.setup import ANALYST_REPORT_KEYS
+
+    graph, seen, bull_states = _stub_graph(monkeypatch, parallel_analysts=True)
+    propagator = Propagator()
+    final_state = graph.invoke(propagator.create_initial_state("NVDA", "2024-01-10"), config=propagator.get_graph_args()["config"])
+
+    # The Bull Researcher runs once, after all four analysts, with every report filled in
+    assert len(bull_states) == 1
+    for analyst_type, report_key in ANALYST_REPORT_KEYS.items():
+        assert bull_states[0][report_key] == f"{analyst_type} report"
+    assert final_state["final_trade_decision"] == "BUY"
+
+    # Each analyst saw only the ticker, its own tool call and its own tool result
+    for analyst_type in ANALYSTS:
+        assert seen[analyst_type] == [
+            ["NVDA"],
+            ["NVDA", f"{analyst_type} asks", f"{analyst_type} data for NVDA"],
+        ]
+    # No analyst message is written back to the parent state
+    assert [message.content for message in final_state["messages"]] == ["NVDA"]
+
+
+def test_sequential_analysts_produce_the_same_reports(monkeypatch):
+    from tradingagents.graph.propagation import Propagator
+    from tradingagents.graph.setup import ANALYST_REPORT_KEYS
+
+    graph, _, bull_states = _stub_graph(monkeypatch, parallel_analysts=False)
+    propagator = Propagator()
+    graph.invoke(propagator.create_initial_state("NVDA", "2024-01-10"), config=propagator.get_graph_args()["config"])
+
+    assert len(bull_states) == 1
+    assert {key: bull_states[0][key] for key in ANALYST_REPORT_KEYS.values()} == {
+        report_key: f"{analyst_type} report" for analyst_type, report_key in ANALYST_REPORT_KEYS.items()
+    }
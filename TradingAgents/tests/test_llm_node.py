@@ -0,0 +1,36 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import asyncio
+
+from langchain_core.runnables import RunnableLambda
+
+
+def test_llm_node_runs_same_step_sync_and_async():
+    from tradingagents.agents.utils.agent_utils import create_llm_node
+
+    calls = []
+
+    def sync_model(prompt):
+        calls.append("sync")
+        return prompt.upper()
+
+    async def async_model(prompt):
+        calls.append("async")
+        return prompt.upper()
+
+    model = RunnableLambda(sync_model, afunc=async_model)
+
+    def echo_node(state):
+        response = yield model, f"hello {state['company_of_interest']}"
+        return {"final_trade_decision": response}
+
+    node = create_llm_node(echo_node)
+    state = {"company_of_interest": "nvda"}
+
+    assert node.invoke(state) == {"final_trade_decision": "HELLO NVDA"}
+    assert asyncio.run(node.ainvoke(state)) == {"final_trade_decision": "HELLO NVDA"}
+    assert calls == ["sync", "async"]
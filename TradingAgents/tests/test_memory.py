@@ -0,0 +1,312 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import os
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+
+def _fake_embedding(text: str) -> List[float]:
+    return [float(len(text)), float(text.count("rate")), 1.0]
+
+
+def _fake_create(model, input):
+    texts = input if isinstance(input, list) else [input]
+    return SimpleNamespace(
+        data=[SimpleNamespace(index=i, embedding=_fake_embedding(text)) for i, text in enumerate(texts)]
+    )
+
+
+def test_memories_share_pooled_client_and_survive_cleanup(tmp_path, monkeypatch):
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_path": str(tmp_path / "chroma"),
+        "embedding_cache_path": "memory",
+        "llm_provider": "openai",
+    }
+
+    first = FinancialSituationMemory("ns_bull_memory", config)
+    monkeypatch.setattr(first.client.embeddings, "create", _fake_create)
+    assert first.backend._collection is None  # created lazily on first use
+
+    first.add_situations([("rising rate environment", "favor short duration")])
+    first.cleanup()
+
+    second = FinancialSituationMemory("ns_bull_memory", config)
+    monkeypatch.setattr(second.client.embeddings, "create", _fake_create)
+    assert second.backend.client is first.backend.client
+
+    matches = second.get_memories("rising rate environment", n_matches=1)
+    assert [match["recommendation"] for match in matches] == ["favor short duration"]
+
+    second.clear()
+    assert second.backend.count() == 0
+
+
+def test_embedding_cache_is_shared_across_memories_and_persisted(tmp_path, monkeypatch):
+    from tradingagents.agents.utils import embedding_cache
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(embedding_cache, "_cache_instance", None)
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_persist": False,
+        "embedding_cache_path": str(tmp_path / "embeddings.sqlite3"),
+        "llm_provider": "openai",
+    }
+    calls = []
+
+    def fake_create(model, input):
+        calls.append(input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=_fake_embedding(input))])
+
+    memories = [FinancialSituationMemory(name, config) for name in ("bull_memory", "bear_memory")]
+    for memory in memories:
+        monkeypatch.setattr(memory.client.embeddings, "create", fake_create)
+
+    situation = "market report\n\nnews report"
+    assert memories[0].get_embedding(situation) == memories[1].get_embedding(situation)
+    assert len(calls) == 1
+
+    reopened = embedding_cache.EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"))
+    assert reopened.get("embedding", memories[0]._embedding_model_key, situation) == _fake_embedding(situation)
+
+
+def test_chunk_pool_mode_embeds_long_text_in_one_batched_request(monkeypatch):
+    import numpy as np
+
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_persist": False,
+        "embedding_cache_enabled": False,
+        "memory_embedding_mode": "chunk_pool",
+        "memory_chunk_tokens": 8,
+        "llm_provider": "openai",
+    }
+    memory = FinancialSituationMemory("chunk_memory", config)
+    monkeypatch.setattr(memory, "MAX_EMBED_CHARS", 40)
+    monkeypatch.setattr(memory, "_summarize_for_embedding", lambda text: pytest.fail("summarizer called"))
+    requests = []
+
+    def fake_create(model, input):
+        requests.append(input)
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=[1.0, float(i)]) for i, _ in enumerate(input)]
+        )
+
+    monkeypatch.setattr(memory.client.embeddings, "create", fake_create)
+
+    embedding = memory.get_embedding("rates are rising while earnings revisions turn negative " * 4)
+
+    assert len(requests) == 1 and len(requests[0]) > 1
+    assert np.isclose(np.linalg.norm(embedding), 1.0)
+
+
+def test_reflect_many_batches_embeddings_per_memory(monkeypatch):
+    import threading
+    from tradingagents.agents.utils import embedding_cache
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+    from tradingagents.graph.reflection import Reflector
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(embedding_cache, "_cache_instance", None)
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_persist": False,
+        "embedding_cache_path": "memory",
+        "memory_namespace": "reflect_test",
+        "llm_provider": "openai",
+    }
+    requests = []
+    lock = threading.Lock()
+
+    def fake_create(model, input):
+        with lock:
+            requests.append(list(input) if isinstance(input, list) else [input])
+        return _fake_create(model, input)
+
+    class _FakeLLM:
+        def invoke(self, messages):
+            return SimpleNamespace(content="lesson")
+
+    memories = {key: FinancialSituationMemory(f"reflect_test_{key}", config) for key in ("bull", "bear")}
+    for memory in memories.values():
+        memory.clear()
+        monkeypatch.setattr(memory.client.embeddings, "create", fake_create)
+
+    def state(tag):
+        return {
+            "market_report": f"market {tag}",
+            "sentiment_report": "sentiment",
+            "news_report": "news",
+            "fundamentals_report": "fundamentals",
+            "investment_debate_state": {"bull_history": "bull", "bear_history": "bear"},
+        }
+
+    added = Reflector(_FakeLLM(), max_workers=4).reflect_many([(state("a"), 0.1), (state("b"), -0.2)], memories)
+
+    assert added == {"bull": 2, "bear": 2}
+    assert [len(batch) for batch in requests] == [2]  # second memory reuses the cached vectors
+    assert memories["bear"].backend.count() == 2
+
+
+def test_numpy_backend_top_k_matches_brute_force_and_reloads(tmp_path):
+    import numpy as np
+
+    from tradingagents.agents.utils.memory_backends import NumpyBackend
+
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    index = NumpyBackend("bull_memory", str(tmp_path))
+    index.add(
+        ids=[str(i) for i in range(50)],
+        documents=[f"situation {i}" for i in range(50)],
+        metadatas=[{"recommendation": f"advice {i}"} for i in range(50)],
+        embeddings=vectors,
+    )
+
+    query = rng.normal(size=8).astype(np.float32)
+    expected = np.argsort(((vectors - query) ** 2).sum(axis=1))[:3]
+    matches = index.query(query, 3)
+    assert [document for document, _, _ in matches] == [f"situation {i}" for i in expected]
+
+    reopened = NumpyBackend("bull_memory", str(tmp_path), mmap=True)
+    assert reopened.count() == 50
+    assert reopened.query(query, 3) == matches
+    reopened.add(["50"], ["situation 50"], [{"recommendation": "advice 50"}], [query])
+    assert reopened.query(query, 1)[0][0] == "situation 50"
+
+
+def _add_rows_in_child(directory, worker, results):
+    from tradingagents.agents.utils.memory_backends import NumpyBackend
+
+    try:
+        index = NumpyBackend("shared_memory", directory)
+        for row in range(5):
+            index.add([f"{worker}-{row}"], [f"situation {worker}-{row}"], [{}], [[float(worker), float(row)]])
+        results.put("ok")
+    except Exception as exc:  # reported to the parent
+        results.put(repr(exc))
+
+
+def test_numpy_backend_writers_in_several_processes_keep_every_row(tmp_path):
+    import multiprocessing
+
+    from tradingagents.agents.utils.memory_backends import NumpyBackend
+
+    reader = NumpyBackend("shared_memory", str(tmp_path))
+    assert reader.count() == 0
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_add_rows_in_child, args=(str(tmp_path), worker, results)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    assert outcomes == ["ok"] * 4
+    # The reader picks up rows written by other processes after it loaded
+    assert reader.count() == 20
+    assert reader.query([3.0, 4.0], 1)[0][0] == "situation 3-4"
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".npy")]) <= 2
+
+
+def test_numpy_backend_never_overwrites_rows_it_cannot_read(tmp_path):
+    import json
+
+    from tradingagents.agents.utils.memory_backends import NumpyBackend
+
+    index = NumpyBackend("bear_memory", str(tmp_path))
+    index.add(["0", "1"], ["situation 0", "situation 1"], [{}, {}], [[0.0, 1.0], [1.0, 0.0]])
+
+    rows_path = tmp_path / "bear_memory.json"
+    original = rows_path.read_text()
+    rows = json.loads(original)
+    rows["ids"].append("2")
+    rows["documents"].append("situation 2")
+    rows["metadatas"].append({})
+    rows_path.write_text(json.dumps(rows))
+
+    # Rows that do not match the matrix keep what was loaded and are retried on the next call
+    other = NumpyBackend("bear_memory", str(tmp_path))
+    assert other.count() == 0
+    assert index.count() == 2
+    with pytest.raises(RuntimeError):
+        index.add(["3"], ["situation 3"], [{}], [[1.0, 1.0]])
+    assert json.loads(rows_path.read_text()) == rows
+
+    rows_path.write_text(original)
+    assert other.count() == 2
+
+
+def test_local_embedding_provider_works_offline_with_numpy_backend(monkeypatch):
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_embedding_provider": "local",
+        "memory_backend": "numpy",
+        "memory_persist": False,
+    }
+    memory = FinancialSituationMemory("local_offline_memory", config)
+    memory.clear()
+    memory.add_situations(
+        [
+            ("Rising interest rates and sticky inflation pressure bond prices", "Shorten duration"),
+            ("Semiconductor demand surges on AI datacenter orders", "Add chip exposure"),
+        ]
+    )
+
+    best = memory.get_memories("Inflation stays sticky as interest rates keep rising", n_matches=1)[0]
+    assert best["recommendation"] == "Shorten duration"
+    assert memory.get_embedding("same text") == memory.get_embedding("same text")
+
+
+def test_embedding_spaces_get_separate_collections(monkeypatch):
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+    from tradingagents.agents.utils.memory_backends import MAX_COLLECTION_NAME
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "memory_embedding_provider": "local",
+        "memory_backend": "numpy",
+        "memory_persist": False,
+    }
+    small = FinancialSituationMemory("space_memory", {**config, "local_embedding_dim": 64})
+    small.clear()
+    small.add_situations([("Rates rising", "Shorten duration")])
+
+    large = FinancialSituationMemory("space_memory", {**config, "local_embedding_dim": 128})
+    assert large.collection_name != small.collection_name
+    assert large.backend.count() == 0
+    assert large.get_memories("Rates rising") == []
+
+    namespaced = FinancialSituationMemory(f"ta_run_{'a' * 32}_invest_judge_memory", config)
+    assert len(namespaced.collection_name) <= MAX_COLLECTION_NAME
+
+
+def test_memory_backend_requires_the_full_interface():
+    from tradingagents.agents.utils.memory_backends import MemoryBackend
+
+    class AddOnly(MemoryBackend):
+        def add(self, ids, documents, metadatas, embeddings):
+            pass
+
+    with pytest.raises(TypeError):
+        AddOnly()
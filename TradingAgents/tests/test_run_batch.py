@@ -0,0 +1,127 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import io
+import json
+import threading
+from typing import Any, Dict
+
+
+def test_run_batch_reuses_worker_graphs_and_streams_jsonl(tmp_path, monkeypatch):
+    import tradingagents.runner.run_graph as run_graph
+
+    built = []
+    used_graphs = set()
+    lock = threading.Lock()
+
+    class _FakeGraph:
+        def __init__(self) -> None:
+            self.cleaned = False
+
+        def cleanup(self) -> None:
+            self.cleaned = True
+
+    def fake_create_graph(config: Dict[str, Any]):
+        graph = _FakeGraph()
+        built.append(graph)
+        return graph
+
+    def fake_run(ticker, trade_date, *, event_callback=None, graph=None, **_kwargs):
+        with lock:
+            used_graphs.add(id(graph))
+        if ticker == "FAIL":
+            raise RuntimeError("boom")
+        return {"ticker": ticker, "trade_date": trade_date, "decision": "HOLD"}
+
+    monkeypatch.setattr(run_graph, "_create_graph", fake_create_graph)
+    monkeypatch.setattr(run_graph, "run_tradingagents", fake_run)
+
+    batch_file = tmp_path / "jobs.csv"
+    batch_file.write_text("ticker,date\nAAPL,2024-01-02\n# skipped\nmsft,2024-01-03\nFAIL,2024-01-04\nNVDA,2024-01-05\n")
+    jobs = run_graph._read_batch_file(str(batch_file))
+    assert jobs[1] == ("MSFT", "2024-01-03")
+
+    output = io.StringIO()
+    summary = run_graph.run_batch(jobs, concurrency=2, output=output)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    results = [record for record in records if record["event"] == "result"]
+    assert records[0]["event"] == "batch_started"
+    assert records[-1] == summary
+    assert summary["succeeded"] == 3 and summary["failed"] == 1
+    assert {record["ticker"] for record in results} == {"AAPL", "MSFT", "FAIL", "NVDA"}
+    assert next(record for record in results if record["ticker"] == "FAIL")["message"] == "boom"
+    assert 1 <= len(built) <= 2
+    assert len(used_graphs) == len(built)
+    assert all(graph.cleaned for graph in built)
+
+
+def test_vendor_rate_limiter_spaces_calls():
+    from tradingagents.dataflows.vendor_limits import VendorRateLimiter
+
+    limiter = VendorRateLimiter({"alpha_vantage": 600})
+    waits = [limiter.acquire("alpha_vantage") for _ in range(602)]
+    assert sum(waits[:600]) == 0
+    assert waits[-1] > 0
+    assert limiter.acquire("yfinance") == 0
+
+
+def test_waiting_call_releases_its_vendor_slot():
+    import threading
+
+    from tradingagents.dataflows.vendor_limits import VendorRateLimiter
+
+    limiter = VendorRateLimiter(concurrency={"alpha_vantage": 1})
+    waiting, other_ran = threading.Event(), threading.Event()
+
+    def slow_call():
+        with limiter.slot("alpha_vantage"):
+            with limiter.released("alpha_vantage"):  # e.g. waiting for shared quota
+                waiting.set()
+                assert other_ran.wait(5)
+
+    def other_call():
+        waiting.wait(5)
+        with limiter.slot("alpha_vantage"):
+            other_ran.set()
+
+    threads = [threading.Thread(target=slow_call), threading.Thread(target=other_call)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert other_ran.is_set()
+    # The slot was taken back and released again: it is free now
+    assert limiter._slots["alpha_vantage"].acquire(blocking=False)
+
+
+def test_stream_aggregator_emits_appended_text_as_deltas_with_keyframes():
+    from tradingagents.runner.run_graph import _StreamAggregator
+
+    aggregator = _StreamAggregator(keyframe_interval=3)
+    debate = {"history": "Bull: up", "current_response": "Bull: up", "count": 1}
+
+    first = aggregator.process_chunk({"market_report": "Trend", "investment_debate_state": dict(debate)})
+    assert first == {"reports": {"market_report": "Trend"}, "investment_debate_state": debate}
+    assert aggregator.process_chunk({"market_report": "Trend", "investment_debate_state": dict(debate)}) is None
+
+    debate.update(history="Bull: up\nBear: down", current_response="Bear: down", count=2)
+    second = aggregator.process_chunk({"market_report": "Trend is up", "investment_debate_state": dict(debate)})
+    assert second == {
+        "deltas": {
+            "reports.market_report": {"offset": 5, "delta": " is up"},
+            "investment_debate_state.history": {"offset": 8, "delta": "\nBear: down"},
+            "investment_debate_state.current_response": {"value": "Bear: down"},
+            "investment_debate_state.count": {"value": 2},
+        }
+    }
+
+    keyframe = aggregator.process_chunk({"news_report": "Headlines", "investment_debate_state": dict(debate)})
+    assert keyframe == {
+        "keyframe": True,
+        "reports": {"market_report": "Trend is up", "news_report": "Headlines"},
+        "investment_debate_state": debate,
+    }
@@ -0,0 +1,106 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+import threading
+import time
+
+
+def _fundamentals_turn(monkeypatch, limiter, graph_config):
+    """Run one fundamentals turn of three tool calls; returns (tool messages, peak calls in flight)."""
+    import tradingagents.dataflows.interface as interface
+    from langchain_core.messages import AIMessage
+    from langgraph.graph import END, START, MessagesState, StateGraph
+    from langgraph.prebuilt import ToolNode
+    from tradingagents.agents.utils.agent_utils import get_balance_sheet, get_cashflow, get_income_statement
+
+    in_flight = []
+    active = [0]
+    lock = threading.Lock()
+
+    def slow_statement(name):
+        def fetch(ticker, freq="quarterly", curr_date=None):
+            with lock:
+                active[0] += 1
+                in_flight.append(active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return f"{name} for {ticker}"
+
+        return fetch
+
+    monkeypatch.setattr(interface, "get_vendor_cache", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_health", lambda: None)
+    monkeypatch.setattr(interface, "get_vendor_limiter", lambda: limiter)
+    for method in ("get_balance_sheet", "get_cashflow", "get_income_statement"):
+        monkeypatch.setitem(interface.VENDOR_METHODS, method, {"alpha_vantage": slow_statement(method)})
+
+    tools = [get_balance_sheet, get_cashflow, get_income_statement]
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": tool.name, "args": {"ticker": "NVDA", "curr_date": "2024-01-10"}, "id": f"call-{index}"}
+            for index, tool in enumerate(tools)
+        ],
+    )
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("tools", ToolNode(tools))
+    workflow.add_edge(START, "tools")
+    workflow.add_edge("tools", END)
+    result = workflow.compile().invoke({"messages": [message]}, config=graph_config)
+    return result["messages"][1:], max(in_flight)
+
+
+def test_propagator_passes_tool_max_concurrency_to_the_graph():
+    from tradingagents.graph.propagation import Propagator
+
+    assert Propagator(max_concurrency=3).get_graph_args()["config"] == {"recursion_limit": 100, "max_concurrency": 3}
+    assert "max_concurrency" not in Propagator().get_graph_args()["config"]
+
+
+def test_graph_max_concurrency_bounds_tool_fan_out_and_keeps_call_order(monkeypatch):
+    from tradingagents.graph.propagation import Propagator
+
+    graph_config = Propagator(max_concurrency=1).get_graph_args()["config"]
+    messages, peak = _fundamentals_turn(monkeypatch, limiter=None, graph_config=graph_config)
+
+    assert peak == 1
+    assert [message.tool_call_id for message in messages] == ["call-0", "call-1", "call-2"]
+    assert [message.content for message in messages] == [
+        "get_balance_sheet for NVDA",
+        "get_cashflow for NVDA",
+        "get_income_statement for NVDA",
+    ]
+
+
+def test_vendor_concurrency_limit_caps_calls_in_flight(monkeypatch):
+    from tradingagents.dataflows.vendor_limits import VendorRateLimiter
+
+    messages, peak = _fundamentals_turn(
+        monkeypatch, VendorRateLimiter(concurrency={"alpha_vantage": 1}), graph_config={"max_concurrency": 4}
+    )
+
+    assert len(messages) == 3
+    assert peak == 1
+
+
+def test_vendor_limiter_is_rebuilt_when_vendor_concurrency_changes(monkeypatch):
+    from tradingagents.dataflows import vendor_limits
+
+    config = {"vendor_rate_limits": {}, "vendor_concurrency": {}}
+    monkeypatch.setattr(vendor_limits, "get_config", lambda: dict(config))
+    monkeypatch.setattr(vendor_limits, "_limiter", None)
+
+    assert vendor_limits.get_vendor_limiter() is None
+
+    config["vendor_concurrency"] = {"alpha_vantage": 2}
+    first = vendor_limits.get_vendor_limiter()
+    assert first.concurrency == {"alpha_vantage": 2}
+    assert vendor_limits.get_vendor_limiter() is first
+
+    config["vendor_concurrency"] = {"alpha_vantage": 1}
+    second = vendor_limits.get_vendor_limiter()
+    assert second is not first and second.concurrency == {"alpha_vantage": 1}
@@ -1,7 +1,12 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_news, get_global_news
+from tradingagents.agents.utils.agent_utils import create_llm_node, get_news, get_global_news
 from tradingagents.dataflows.config import get_config
 
 
@@ -43,7 +48,7 @@ def create_news_analyst(llm):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -55,4 +60,4 @@ def create_news_analyst(llm):
             "news_report": report,
         }
 
-    return news_analyst_node
+    return create_llm_node(news_analyst_node)
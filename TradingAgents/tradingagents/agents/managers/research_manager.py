@@ -1,6 +1,13 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import create_llm_node
+
 
 def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
@@ -36,7 +43,7 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -52,4 +59,4 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return create_llm_node(research_manager_node)
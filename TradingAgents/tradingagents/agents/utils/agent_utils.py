@@ -1,11 +1,20 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+import asyncio
+
 from langchain_core.messages import HumanMessage, RemoveMessage
+from langchain_core.runnables import RunnableLambda
 
 # Import tools from separate utility files
 from tradingagents.agents.utils.core_stock_tools import (
     get_stock_data
 )
 from tradingagents.agents.utils.technical_indicators_tools import (
-    get_indicators
+    get_indicators,
+    get_indicators_batch
 )
 from tradingagents.agents.utils.fundamental_data_tools import (
     get_fundamentals,
@@ -36,4 +45,31 @@ def create_msg_delete():
     return delete_messages
 
 
-        
\ No newline at end of file
+def create_llm_node(step):
+    """Turn a generator-style agent step into a node usable by invoke and ainvoke.
+
+    ``step(state)`` builds its prompt, yields ``(runnable, model_input)`` once,
+    receives the model response and returns the state update. The sync path calls
+    ``runnable.invoke``. The async path runs the preparation (which may include
+    blocking memory lookups) in a worker thread and awaits ``runnable.ainvoke`` on
+    the event loop.
+    """
+
+    def _finish(steps, response):
+        try:
+            steps.send(response)
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("Agent steps must yield exactly one model call")
+
+    def node(state):
+        steps = step(state)
+        runnable, model_input = next(steps)
+        return _finish(steps, runnable.invoke(model_input))
+
+    async def anode(state):
+        steps = step(state)
+        runnable, model_input = await asyncio.to_thread(next, steps)
+        return _finish(steps, await runnable.ainvoke(model_input))
+
+    return RunnableLambda(node, afunc=anode, name=getattr(step, "__name__", "agent_step"))
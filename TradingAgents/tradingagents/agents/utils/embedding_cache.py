@@ -0,0 +1,147 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Content-addressed cache for memory embeddings and embedding summaries.
+
+Every ``FinancialSituationMemory`` in the process shares one cache, so the
+Bull, Bear, Research Manager, Trader and Risk Judge lookups on the same
+situation text embed (and, for long text, summarize) it only once. Entries are
+keyed on a SHA-256 of ``(kind, model, text)`` and held in an in-memory LRU in
+front of an optional SQLite file that survives restarts.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+
+
+class EmbeddingCache:
+    """LRU of embeddings/summaries with an optional SQLite tier behind it."""
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = path
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, kind TEXT NOT NULL, created_at REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(kind: str, model: str, text: str) -> str:
+        return hashlib.sha256(f"{kind}\0{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, kind: str, model: str, text: str) -> Optional[Any]:
+        """Return the cached value or None."""
+        key = self.make_key(kind, model, text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute("SELECT value FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, kind: str, model: str, text: str, value: Any) -> None:
+        key = self.make_key(kind, model, text)
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, kind, created_at, value) VALUES (?, ?, ?, ?)",
+                    (key, kind, time.time(), sqlite3.Binary(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))),
+                )
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "cached": len(self._entries),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache_instance: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(config: Mapping[str, Any]) -> Optional[EmbeddingCache]:
+    """Return the process-wide cache for ``config``, or None when disabled.
+
+    ``embedding_cache_path`` empty means ``<data_cache_dir>/embedding_cache.sqlite3``;
+    ``"memory"`` keeps only the in-memory LRU.
+    """
+    global _cache_instance
+
+    if not config.get("embedding_cache_enabled", True):
+        return None
+
+    path = config.get("embedding_cache_path") or os.path.join(
+        config.get("data_cache_dir", "data_cache"), "embedding_cache.sqlite3"
+    )
+    if path == "memory":
+        path = None
+    max_entries = int(config.get("embedding_cache_size", 1024))
+
+    with _cache_lock:
+        if _cache_instance is None or _cache_instance.path != path:
+            if _cache_instance is not None:
+                _cache_instance.close()
+            _cache_instance = EmbeddingCache(max_entries, path)
+        else:
+            _cache_instance.max_entries = max(1, max_entries)
+        return _cache_instance
@@ -0,0 +1,61 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""In-process CPU embeddings for agent memories.
+
+``HashedNgramEmbedder`` projects word unigrams and bigrams into a fixed number
+of dimensions with signed feature hashing (CRC32, stable across processes),
+weights them by sublinear term frequency, and L2-normalizes the result. It
+needs no model download, server or network, embeds a full set of analyst
+reports in a few milliseconds, and is deterministic, so it also serves
+offline runs and tests. Quality is lexical, not semantic: situations that
+share vocabulary (tickers, sectors, indicators, rate/inflation language) land
+close together.
+"""
+
+import functools
+import math
+import re
+import zlib
+from collections import Counter
+from typing import List, Sequence
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9.%$-]*")
+
+
+class HashedNgramEmbedder:
+    """Signed hashing of word 1-2 grams into ``dim`` dimensions."""
+
+    def __init__(self, dim: int = 768):
+        self.dim = max(8, int(dim))
+        self.name = f"hashed-ngram-{self.dim}"
+
+    def _features(self, text: str) -> Counter:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = Counter(tokens)
+        features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float64)
+        for feature, count in self._features(text).items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+@functools.lru_cache(maxsize=None)
+def get_local_embedder(dim: int = 768) -> HashedNgramEmbedder:
+    """Return the process-wide embedder for ``dim`` dimensions."""
+    return HashedNgramEmbedder(dim)
@@ -1,17 +1,39 @@
 """
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-26
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 """
+import functools
 import os
-from typing import Mapping, Sequence
+import uuid
+from typing import Dict, List, Mapping, Optional, Sequence
 
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 from openai import OpenAI as OpenAIClient
 
+from .embedding_cache import get_embedding_cache
+from .local_embeddings import get_local_embedder
+from .memory_backends import create_memory_backend, memory_collection_name
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoder():
+    """Load the cl100k_base encoder once; None when tiktoken or its data is unavailable."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+EMBEDDING_MODES = ("summarize", "chunk_pool")
+EMBEDDING_PROVIDERS = ("openai", "local")
+# Output dimension of the remote embedding models, part of each collection's name
+EMBEDDING_DIMENSIONS = {"text-embedding-3-small": 1536, "nomic-embed-text": 768}
+
 
 class FinancialSituationMemory:
     APPROX_CHARS_PER_TOKEN = 3.5
@@ -20,6 +42,22 @@ class FinancialSituationMemory:
 
     def __init__(self, name, config):
         self.config = config
+
+        provider = str(config.get("memory_embedding_provider", "openai")).lower()
+        if provider not in EMBEDDING_PROVIDERS:
+            raise ValueError(
+                f"Unsupported memory_embedding_provider '{provider}', expected one of {EMBEDDING_PROVIDERS}"
+            )
+        self._local_embedder = None
+        if provider == "local":
+            # In-process CPU embeddings: no client, API key, input limit or cache needed.
+            self._local_embedder = get_local_embedder(int(config.get("local_embedding_dim", 768)))
+            self.embedding = self._local_embedder.name
+            self.client = None
+            self._embedding_cache = None
+            self._open_backend(name, self._local_embedder.dim)
+            return
+
         if config["backend_url"] == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
         else:
@@ -48,25 +86,24 @@ class FinancialSituationMemory:
                 client_kwargs["base_url"] = "https://api.openai.com/v1"
 
         self.client = OpenAIClient(**client_kwargs)
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.collection_name = name
-        try:
-            self.situation_collection = self.chroma_client.get_or_create_collection(
-                name=self.collection_name
+        self._embedding_cache = get_embedding_cache(config)
+        self._embedding_mode = str(config.get("memory_embedding_mode", "summarize")).lower()
+        if self._embedding_mode not in EMBEDDING_MODES:
+            raise ValueError(
+                f"Unsupported memory_embedding_mode '{self._embedding_mode}', expected one of {EMBEDDING_MODES}"
             )
-        except AttributeError:
-            # Fallback for older chromadb versions without get_or_create_collection
-            self.situation_collection = self._create_or_get_collection(self.collection_name)
-        except Exception as exc:
-            if self._collection_exists_error(exc):
-                self.situation_collection = self.chroma_client.get_collection(
-                    name=self.collection_name
-                )
-            else:
-                raise
+        self._chunk_tokens = max(1, min(int(config.get("memory_chunk_tokens", 2000)), self.MAX_EMBED_TOKENS))
+        self._chunk_pooling = str(config.get("memory_chunk_pooling", "mean")).lower()
+        self._embedding_model_key = f"{client_kwargs.get('base_url', 'openai')}|{self.embedding}|{self._embedding_mode}"
         self._summarizer_client: OpenAIClient | None = None
         self._summarizer_model = self.config.get("quick_think_llm", "gpt-4o-mini")
         self._summarizer_enabled = self.config.get("llm_provider", "openai").lower() in ("openai", "openrouter")
+        self._open_backend(name, EMBEDDING_DIMENSIONS.get(self.embedding))
+
+    def _open_backend(self, name: str, dimension: Optional[int]) -> None:
+        """Open the collection for ``name`` in this memory's embedding space."""
+        self.collection_name = memory_collection_name(name, self.embedding, dimension)
+        self.backend = create_memory_backend(self.collection_name, self.config)
 
     def _stringify(self, value) -> str:
         if value is None:
@@ -86,10 +123,10 @@ class FinancialSituationMemory:
         return str(value)
 
     def _clip_to_token_limit(self, text: str) -> str:
+        encoder = _token_encoder()
+        if encoder is None:
+            return text[: self.MAX_EMBED_CHARS]
         try:
-            import tiktoken
-
-            encoder = tiktoken.get_encoding("cl100k_base")
             tokens = encoder.encode(text)
             if len(tokens) <= self.MAX_EMBED_TOKENS:
                 return text
@@ -98,6 +135,37 @@ class FinancialSituationMemory:
         except Exception:
             return text[: self.MAX_EMBED_CHARS]
 
+    def _split_into_chunks(self, text: str) -> List[str]:
+        """Split text into pieces of at most ``memory_chunk_tokens`` tokens."""
+        encoder = _token_encoder()
+        if encoder is not None:
+            try:
+                tokens = encoder.encode(text)
+                return [
+                    encoder.decode(tokens[start : start + self._chunk_tokens])
+                    for start in range(0, len(tokens), self._chunk_tokens)
+                ]
+            except Exception:
+                pass
+        size = int(self._chunk_tokens * self.APPROX_CHARS_PER_TOKEN)
+        return [text[start : start + size] for start in range(0, len(text), size)]
+
+    def _embed_chunked(self, text: str) -> List[float]:
+        """Embed all chunks in one request and pool them into a single unit vector."""
+        chunks = [chunk for chunk in self._split_into_chunks(text) if chunk.strip()]
+        response = self.client.embeddings.create(model=self.embedding, input=chunks)
+        ordered = sorted(response.data, key=lambda item: getattr(item, "index", 0))
+        vectors = np.asarray([item.embedding for item in ordered], dtype=np.float64)
+        if self._chunk_pooling == "weighted":
+            weights = np.asarray([len(chunk) for chunk in chunks], dtype=np.float64)
+            pooled = (vectors * weights[:, None]).sum(axis=0) / weights.sum()
+        else:
+            pooled = vectors.mean(axis=0)
+        norm = np.linalg.norm(pooled)
+        if norm > 0:
+            pooled = pooled / norm
+        return pooled.tolist()
+
     def _ensure_summarizer_client(self) -> OpenAIClient | None:
         if not self._summarizer_enabled:
             return None
@@ -187,6 +255,12 @@ class FinancialSituationMemory:
             "Limit the summary to roughly 1200 tokens while retaining essential context."
         )
 
+        cache = self._embedding_cache
+        if cache is not None:
+            cached = cache.get("summary", self._summarizer_model, text)
+            if cached is not None:
+                return cached
+
         try:
             response = client.responses.create(
                 model=self._summarizer_model,
@@ -210,6 +284,8 @@ class FinancialSituationMemory:
             )
             summary = self._extract_summary_text(response)
             if summary:
+                if cache is not None:
+                    cache.set("summary", self._summarizer_model, text, summary)
                 return summary
         except Exception:
             # Any failure falls back to truncation logic.
@@ -266,8 +342,25 @@ class FinancialSituationMemory:
         return effort_to_budget.get(normalized, default_budget)
 
     def get_embedding(self, text):
-        """Get OpenAI embedding for a text."""
-
+        """Get OpenAI embedding for a text, reusing any cached embedding of the same text."""
+
+        if self._local_embedder is not None:
+            return self._local_embedder.embed(self._stringify(text).strip())
+        cache = self._embedding_cache
+        if cache is None:
+            return self._embed(text)
+        key_text = self._stringify(text).strip()
+        embedding = cache.get("embedding", self._embedding_model_key, key_text)
+        if embedding is None:
+            embedding = self._embed(text)
+            cache.set("embedding", self._embedding_model_key, key_text, embedding)
+        return embedding
+
+    def _embed(self, text):
+        if self._embedding_mode == "chunk_pool":
+            normalized = self._stringify(text).strip()
+            if len(normalized) > self.MAX_EMBED_CHARS:
+                return self._embed_chunked(normalized)
         prepared = self._normalize_for_embedding(text)
         response = self.client.embeddings.create(
             model=self.embedding,
@@ -275,72 +368,87 @@ class FinancialSituationMemory:
         )
         return response.data[0].embedding
 
+    def get_embeddings(self, texts) -> List[List[float]]:
+        """Embed several texts; uncached texts within the input limit share one request."""
+        keys = [self._stringify(text).strip() for text in texts]
+        if self._local_embedder is not None:
+            return self._local_embedder.embed_many(keys)
+        cache = self._embedding_cache
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        pending: Dict[str, List[int]] = {}
+        for index, key in enumerate(keys):
+            if cache is not None:
+                cached = cache.get("embedding", self._embedding_model_key, key)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.setdefault(key, []).append(index)
+
+        computed: Dict[str, List[float]] = {}
+        batch = [key for key in pending if len(key) <= self.MAX_EMBED_CHARS]
+        if batch:
+            response = self.client.embeddings.create(model=self.embedding, input=batch)
+            ordered = sorted(response.data, key=lambda item: getattr(item, "index", 0))
+            computed.update(zip(batch, (item.embedding for item in ordered)))
+        for key in pending:
+            if key not in computed:
+                # Long texts still go through summarization or chunk pooling one at a time.
+                computed[key] = self._embed(key)
+
+        for key, indexes in pending.items():
+            if cache is not None:
+                cache.set("embedding", self._embedding_model_key, key, computed[key])
+            for index in indexes:
+                results[index] = computed[key]
+        return results
+
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
 
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
-        offset = self.situation_collection.count()
-
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            # Collections are shared across runs and processes, so ids must not depend on count().
+            ids.append(uuid.uuid4().hex)
+
+        if not situations:
+            return
+        embeddings = self.get_embeddings(situations)
 
-        self.situation_collection.add(
+        self.backend.add(
+            ids=ids,
             documents=situations,
             metadatas=[{"recommendation": rec} for rec in advice],
             embeddings=embeddings,
-            ids=ids,
         )
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
         query_embedding = self.get_embedding(current_situation)
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
-
         matched_results = []
-        for i in range(len(results["documents"][0])):
+        for document, metadata, distance in self.backend.query(query_embedding, n_matches):
             matched_results.append(
                 {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
+                    "matched_situation": document,
+                    "recommendation": metadata["recommendation"],
+                    "similarity_score": 1 - distance,
                 }
             )
 
         return matched_results
 
     def cleanup(self) -> None:
-        """Drop the collection to release resources after a run finishes."""
-        try:
-            self.chroma_client.delete_collection(name=self.collection_name)
-        except Exception:
-            # Best-effort cleanup; ignore if the collection is already gone or backend rejects the request.
-            pass
+        """Release this memory's backend handles; stored situations are kept."""
+        self.backend.release()
 
-    def _collection_exists_error(self, exc: Exception) -> bool:
-        message = str(exc).lower()
-        return "already exists" in message or ("collection" in message and "exists" in message)
-
-    def _create_or_get_collection(self, name: str):
-        """Create collection or reuse existing one when old Chroma client lacks helpers."""
-        try:
-            return self.chroma_client.create_collection(name=name)
-        except Exception as exc:
-            # Some Chroma builds raise InternalError/ValueError strings when the collection already exists.
-            if self._collection_exists_error(exc):
-                return self.chroma_client.get_collection(name=name)
-            raise
+    def clear(self) -> None:
+        """Delete every stored situation in this memory."""
+        self.backend.clear()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,408 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Vector stores behind ``FinancialSituationMemory``.
+
+``memory_backend`` selects the store:
+
+- ``chroma`` (default): collections in a process-wide Chroma client, persistent
+  on disk unless ``memory_persist`` is off. Suited to large corpora.
+- ``numpy``: a float32 matrix per memory with top-k by one matrix-vector
+  product and ``argpartition``. It has no dependency beyond NumPy, is
+  optionally memory-mapped from disk, and can be shared by several processes.
+  Suited to the few thousand reflections an agent typically keeps.
+
+Both report squared L2 distances, so similarity scores are comparable.
+
+Vectors from different embedding models (or dimensions) cannot be compared, so
+each memory's collection name carries a digest of its embedding model and
+dimension (:func:`memory_collection_name`); switching providers starts a new
+collection instead of querying the old one.
+"""
+
+import abc
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from contextlib import nullcontext
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tradingagents.dataflows.store_dirs import file_lock
+
+MEMORY_BACKENDS = ("chroma", "numpy")
+
+# Chroma collection names are limited to 63 characters
+MAX_COLLECTION_NAME = 63
+
+# (document, metadata, distance)
+Match = Tuple[str, Dict[str, Any], float]
+
+
+def resolve_memory_path(config: Mapping[str, Any], default_dirname: str = "chroma") -> Optional[str]:
+    """On-disk directory for memories, or None for in-process memory."""
+    if not config.get("memory_persist", True):
+        return None
+    path = config.get("memory_path")
+    if not path:
+        path = os.path.join(config.get("data_cache_dir", "data_cache"), default_dirname)
+    return os.path.abspath(path)
+
+
+def memory_collection_name(name: str, embedding_model: str, dimension: Optional[int]) -> str:
+    """``<name>_<digest of model and dimension>``, shortened to a valid Chroma collection name."""
+    space = hashlib.sha1(f"{embedding_model}|{dimension}".encode("utf-8")).hexdigest()[:8]
+    limit = MAX_COLLECTION_NAME - len(space) - 1
+    if len(name) > limit:
+        name = f"{name[: limit - 9]}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+    return f"{name}_{space}"
+
+
+class MemoryBackend(abc.ABC):
+    """Store of (id, document, metadata, embedding) rows with nearest-neighbour lookup."""
+
+    @abc.abstractmethod
+    def add(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def query(self, embedding: Sequence[float], n_results: int) -> List[Match]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def release(self) -> None:
+        """Drop handles held for this memory; stored rows are kept."""
+
+
+_chroma_clients: Dict[str, Any] = {}
+_chroma_clients_lock = threading.Lock()
+
+
+def get_chroma_client(path: Optional[str] = None):
+    """Return the process-wide Chroma client for ``path`` (None: in-process only).
+
+    Clients are created once and shared by every memory and graph in the process,
+    so collections outlive individual runs.
+    """
+    import chromadb
+    from chromadb.config import Settings
+
+    key = path or ":memory:"
+    with _chroma_clients_lock:
+        client = _chroma_clients.get(key)
+        if client is None:
+            settings = Settings(allow_reset=True, anonymized_telemetry=False)
+            if path:
+                os.makedirs(path, exist_ok=True)
+                client = chromadb.PersistentClient(path=path, settings=settings)
+            else:
+                client = chromadb.Client(settings)
+            _chroma_clients[key] = client
+        return client
+
+
+class ChromaBackend(MemoryBackend):
+    """One Chroma collection, created on first use."""
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        self.name = name
+        self.client = get_chroma_client(path)
+        self._collection = None
+        self._lock = threading.Lock()
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    self._collection = self._open_collection()
+        return self._collection
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        self.collection.add(
+            documents=list(documents),
+            metadatas=list(metadatas),
+            embeddings=[list(embedding) for embedding in embeddings],
+            ids=list(ids),
+        )
+
+    def query(self, embedding, n_results: int) -> List[Match]:
+        results = self.collection.query(
+            query_embeddings=[list(embedding)],
+            n_results=n_results,
+            include=["metadatas", "documents", "distances"],
+        )
+        return list(zip(results["documents"][0], results["metadatas"][0], results["distances"][0]))
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def clear(self) -> None:
+        try:
+            self.client.delete_collection(name=self.name)
+        except Exception:
+            # Best-effort: ignore if the collection is already gone or the backend rejects the request.
+            pass
+        self._collection = None
+
+    def release(self) -> None:
+        self._collection = None
+
+    def _open_collection(self):
+        try:
+            return self.client.get_or_create_collection(name=self.name)
+        except AttributeError:
+            # Fallback for older chromadb versions without get_or_create_collection
+            return self._create_or_get_collection(self.name)
+        except Exception as exc:
+            if self._collection_exists_error(exc):
+                return self.client.get_collection(name=self.name)
+            raise
+
+    def _collection_exists_error(self, exc: Exception) -> bool:
+        message = str(exc).lower()
+        return "already exists" in message or ("collection" in message and "exists" in message)
+
+    def _create_or_get_collection(self, name: str):
+        """Create collection or reuse existing one when old Chroma client lacks helpers."""
+        try:
+            return self.client.create_collection(name=name)
+        except Exception as exc:
+            # Some Chroma builds raise InternalError/ValueError strings when the collection already exists.
+            if self._collection_exists_error(exc):
+                return self.client.get_collection(name=name)
+            raise
+
+
+class NumpyBackend(MemoryBackend):
+    """Contiguous float32 embedding matrix with exact top-k search.
+
+    Rows live in a preallocated array that doubles when full. With a directory
+    each add writes the matrix to a new ``<name>.<token>.npy`` and then
+    atomically replaces ``<name>.json``, which holds the documents, metadata
+    and the name of the matching matrix, so readers never pair a matrix with
+    the wrong rows. Writers in every process serialize on ``<name>.lock`` and
+    merge what others stored first; readers reload whenever ``<name>.json``
+    changes. The matrix is memory-mapped read-only when ``mmap`` is set, until
+    the next write.
+    """
+
+    # Signature of a rows file that does not exist
+    _MISSING: Tuple[int, ...] = ()
+
+    def __init__(self, name: str, directory: Optional[str] = None, mmap: bool = False):
+        self.name = name
+        self.directory = directory
+        self.mmap = mmap
+        self._lock = threading.Lock()
+        # Stat of the rows file the in-memory rows came from; None until loaded
+        self._signature: Optional[Tuple[int, ...]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        rows = np.asarray(embeddings, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[0] != len(ids):
+            raise ValueError("Expected one embedding per id")
+        with self._lock, self._file_lock():
+            if not self._refresh():
+                raise RuntimeError(f"Stored memory index '{self.name}' is inconsistent; not overwriting it")
+            if self._size and rows.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {rows.shape[1]} does not match stored dimension {self._vectors.shape[1]}"
+                )
+            self._reserve(self._size + rows.shape[0], rows.shape[1])
+            end = self._size + rows.shape[0]
+            self._vectors[self._size : end] = rows
+            self._norms[self._size : end] = np.einsum("ij,ij->i", rows, rows)
+            self._size = end
+            self._ids.extend(ids)
+            self._documents.extend(documents)
+            self._metadatas.extend(dict(metadata) for metadata in metadatas)
+            self._save()
+
+    def query(self, embedding, n_results: int) -> List[Match]:
+        query = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._refresh()
+            size = self._size
+            if size == 0 or n_results <= 0:
+                return []
+            vectors = self._vectors[:size]
+            # ||v - q||^2 = ||v||^2 - 2 v.q + ||q||^2, one matrix-vector product for all rows
+            distances = self._norms[:size] - 2.0 * (vectors @ query) + float(query @ query)
+            k = min(int(n_results), size)
+            nearest = np.argpartition(distances, k - 1)[:k] if k < size else np.arange(size)
+            nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+            return [
+                (self._documents[i], self._metadatas[i], max(0.0, float(distances[i])))
+                for i in nearest
+            ]
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._size
+
+    def clear(self) -> None:
+        with self._lock, self._file_lock():
+            self._reset()
+            self._signature = self._MISSING
+            if not self.directory:
+                return
+            # The rows file goes first so no reader picks up a matrix being deleted
+            for path in [self._rows_path()] + self._matrix_paths():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _rows_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.json")
+
+    def _matrix_paths(self) -> List[str]:
+        """Every matrix file of this memory, including the unversioned ``<name>.npy`` of earlier releases."""
+        pattern = re.compile(rf"^{re.escape(self.name)}(\.[0-9a-f]{{12}})?\.npy$")
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if pattern.match(name)]
+
+    def _file_lock(self):
+        if not self.directory:
+            return nullcontext()
+        return file_lock(os.path.join(self.directory, f"{self.name}.lock"))
+
+    def _stat(self) -> Tuple[int, ...]:
+        try:
+            stat = os.stat(self._rows_path())
+        except FileNotFoundError:
+            return self._MISSING
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        capacity = self._vectors.shape[0]
+        writable = isinstance(self._vectors, np.ndarray) and not isinstance(self._vectors, np.memmap)
+        if rows <= capacity and writable and self._vectors.shape[1] == dim:
+            return
+        new_capacity = max(rows, 2 * capacity, 16)
+        vectors = np.zeros((new_capacity, dim), dtype=np.float32)
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        if self._size:
+            vectors[: self._size] = self._vectors[: self._size]
+            norms[: self._size] = self._norms[: self._size]
+        self._vectors, self._norms = vectors, norms
+
+    def _refresh(self) -> bool:
+        """Reload the rows if another writer changed them; False if they could not be read consistently.
+
+        On failure the rows held in memory are kept and the next call retries.
+        """
+        if not self.directory:
+            self._signature = self._MISSING
+            return True
+        signature = self._stat()
+        if signature == self._signature:
+            return True
+        if signature == self._MISSING:
+            self._reset()
+            self._signature = signature
+            return True
+        try:
+            with open(self._rows_path(), "r", encoding="utf-8") as handle:
+                rows = json.load(handle)
+            matrix_path = os.path.join(self.directory, rows.get("matrix") or f"{self.name}.npy")
+            vectors = np.load(matrix_path, mmap_mode="r" if self.mmap else None)
+        except (OSError, ValueError):
+            # Replaced or pruned between reading the rows and the matrix
+            return False
+        if vectors.ndim != 2 or vectors.shape[0] != len(rows.get("ids", [])):
+            return False
+        self._vectors = vectors
+        self._norms = np.einsum("ij,ij->i", vectors, vectors).astype(np.float32)
+        self._size = vectors.shape[0]
+        self._ids = list(rows["ids"])
+        self._documents = list(rows["documents"])
+        self._metadatas = list(rows["metadatas"])
+        self._signature = signature
+        return True
+
+    def _save(self) -> None:
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        previous = {os.path.basename(path) for path in self._matrix_paths()}
+        try:
+            with open(self._rows_path(), "r", encoding="utf-8") as handle:
+                current = json.load(handle).get("matrix")
+        except (OSError, ValueError):
+            current = None
+        matrix_name = f"{self.name}.{uuid.uuid4().hex[:12]}.npy"
+        with open(os.path.join(self.directory, matrix_name), "wb") as handle:
+            np.save(handle, np.ascontiguousarray(self._vectors[: self._size]))
+        rows_path = self._rows_path()
+        tmp_path = f"{rows_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"matrix": matrix_name, "ids": self._ids, "documents": self._documents, "metadatas": self._metadatas},
+                handle,
+            )
+        os.replace(tmp_path, rows_path)
+        self._signature = self._stat()
+        # Keep the matrix being replaced; readers may have just read the old rows file
+        for name in previous - {current}:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+_numpy_backends: Dict[Tuple[Optional[str], str], NumpyBackend] = {}
+_numpy_backends_lock = threading.Lock()
+
+
+def create_memory_backend(name: str, config: Mapping[str, Any]) -> MemoryBackend:
+    """Build the configured backend for memory ``name``.
+
+    NumPy indexes are shared per (directory, name) within the process, like the
+    pooled Chroma client, so every graph sees the same rows.
+    """
+    backend = str(config.get("memory_backend", "chroma")).lower()
+    if backend == "chroma":
+        return ChromaBackend(name, resolve_memory_path(config, "chroma"))
+    if backend == "numpy":
+        directory = resolve_memory_path(config, "memory_index")
+        with _numpy_backends_lock:
+            index = _numpy_backends.get((directory, name))
+            if index is None:
+                index = NumpyBackend(name, directory, mmap=bool(config.get("memory_mmap", False)))
+                _numpy_backends[(directory, name)] = index
+            return index
+    raise ValueError(f"Unsupported memory_backend '{backend}', expected one of {MEMORY_BACKENDS}")
@@ -1,6 +1,6 @@
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-26
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 
@@ -10,17 +10,24 @@ import asyncio
 import json
 import os
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from tradingagents.runner.run_graph import run_tradingagents
+from tradingagents.runner.run_graph import arun_tradingagents
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.vendor_health import get_vendor_health
+from tradingagents.dataflows.vendor_quota import get_vendor_quota
+
+from .run_store import TERMINAL_STATES, RunRecord, RunStore, compact_events
+from .scheduler import QueueFullError, RunScheduler
 
 
 @dataclass
@@ -29,6 +36,9 @@ class Settings:
 
     internal_api_token: Optional[str]
     skip_token_auth: bool
+    max_concurrent_runs: int = 2
+    max_queued_runs: int = 20
+    run_queue_policy: str = "fifo"
 
 
 @lru_cache(maxsize=1)
@@ -37,7 +47,13 @@ def get_settings() -> Settings:
     load_dotenv()
     skip_auth = os.getenv("SKIP_TOKEN_AUTH", "false").lower() == "true"
     token = os.getenv("INTERNAL_API_TOKEN")
-    return Settings(internal_api_token=token, skip_token_auth=skip_auth)
+    return Settings(
+        internal_api_token=token,
+        skip_token_auth=skip_auth,
+        max_concurrent_runs=int(os.getenv("TRADINGAGENTS_MAX_CONCURRENT_RUNS", "2")),
+        max_queued_runs=int(os.getenv("TRADINGAGENTS_MAX_QUEUED_RUNS", "20")),
+        run_queue_policy=os.getenv("TRADINGAGENTS_RUN_QUEUE_POLICY", "fifo").lower(),
+    )
 
 
 async def require_token(
@@ -76,6 +92,7 @@ class RunCreateRequest(BaseModel):
     config: Optional[Dict[str, Any]] = None
     config_path: Optional[str] = Field(default=None, description="Optional path to a JSON config file.")
     result_path: Optional[str] = Field(default=None, description="Optional path to persist the final payload.")
+    priority: int = Field(default=0, description="Higher runs first when the queue policy is 'priority'.")
 
 
 class RunCreateResponse(BaseModel):
@@ -96,35 +113,61 @@ class RunStatusResponse(BaseModel):
     updated_at: datetime
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    queue_position: Optional[int] = None
     events: List[Dict[str, Any]] = Field(default_factory=list)
 
 
-@dataclass
-class RunRecord:
-    """In-memory representation of a TradingAgents execution."""
-
-    id: str
-    ticker: str
-    trade_date: str
-    status: str
-    created_at: datetime
-    updated_at: datetime
-    events: List[Dict[str, Any]] = field(default_factory=list)
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
-    task: Optional[asyncio.Task[Any]] = None
-    queue: asyncio.Queue[Dict[str, Any]] = field(default_factory=asyncio.Queue)
-
-
 app = FastAPI(
     title="TradingAgents Service",
     version="0.1.0",
     description="HTTP interface for executing TradingAgents runs.",
 )
 
-_runs: Dict[str, RunRecord] = {}
+class RunListResponse(BaseModel):
+    """One page of runs, newest first."""
+
+    items: List[RunStatusResponse]
+    total: int
+    offset: int
+    limit: int
+
+
+def _create_run_store() -> RunStore:
+    """Build the run store from environment variables.
+
+    ``TRADINGAGENTS_RUN_STORE_PATH`` selects the SQLite file (``memory`` disables
+    persistence); finished runs expire after ``TRADINGAGENTS_RUN_TTL_SECONDS``.
+    On startup, runs this worker left unfinished are marked failed;
+    ``TRADINGAGENTS_RUN_STORE_OWNER`` names the worker when several share the file.
+    """
+    path = os.getenv("TRADINGAGENTS_RUN_STORE_PATH", "").strip() or os.path.join(
+        DEFAULT_CONFIG["data_cache_dir"], "api_runs.sqlite3"
+    )
+    return RunStore(
+        path=None if path.lower() == "memory" else path,
+        max_cached=int(os.getenv("TRADINGAGENTS_RUN_CACHE_SIZE", "200")),
+        completed_ttl=float(os.getenv("TRADINGAGENTS_RUN_TTL_SECONDS", str(7 * 24 * 60 * 60))),
+        owner=os.getenv("TRADINGAGENTS_RUN_STORE_OWNER", "").strip(),
+    )
+
+
+_runs: RunStore = _create_run_store()
 _runs_lock = asyncio.Lock()
-_TERMINAL_STATES = {"success", "failed"}
+_TERMINAL_STATES = TERMINAL_STATES
+_scheduler: Optional[RunScheduler] = None
+
+
+def get_scheduler() -> RunScheduler:
+    """Return the process-wide run scheduler, created from settings on first use."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = RunScheduler(
+            max_concurrent=settings.max_concurrent_runs,
+            max_queued=settings.max_queued_runs,
+            policy=settings.run_queue_policy,
+        )
+    return _scheduler
 
 
 def _build_event(event: str, **payload: Any) -> Dict[str, Any]:
@@ -142,8 +185,12 @@ def _enqueue_event(run_id: str, event_payload: Dict[str, Any]) -> None:
         return
 
     event_with_id = {"id": uuid.uuid4().hex, **event_payload}
-    record.events.append(event_with_id)
+    # Stored history keeps only the latest snapshot per report section; live
+    # stream consumers still receive every event through the queue.
+    compact_events(record.events, event_with_id)
     record.updated_at = datetime.utcnow()
+    if record.status in _TERMINAL_STATES:
+        _runs.save(record)
     try:
         record.queue.put_nowait(event_with_id)
     except asyncio.QueueFull:
@@ -175,12 +222,14 @@ async def _update_record(run_id: str, **changes: Any) -> RunRecord:
         for key, value in changes.items():
             setattr(record, key, value)
         record.updated_at = datetime.utcnow()
+        _runs.save(record)
         return record
 
 
 async def _execute_run(record: RunRecord, request: RunCreateRequest) -> None:
     """Background coroutine responsible for running TradingAgents."""
     loop = asyncio.get_running_loop()
+    record.task = asyncio.current_task()
 
     await _update_record(record.id, status="running")
     _enqueue_event(record.id, _build_event("status", state="running"))
@@ -188,26 +237,26 @@ async def _execute_run(record: RunRecord, request: RunCreateRequest) -> None:
     def emit(event: str, **payload: Any) -> None:
         """Adapter translating runner callbacks into structured events."""
         event_payload = _build_event(event, **payload)
+        # Runner callbacks fire on the loop; stay thread-safe in case a worker emits.
         loop.call_soon_threadsafe(_enqueue_event, record.id, event_payload)
 
     config_overrides: Dict[str, Any] = {}
     if request.config:
         config_overrides = dict(request.config)
 
-    memory_namespace = f"run_{record.id}"
     metadata = config_overrides.get("metadata")
     if isinstance(metadata, dict):
         metadata = dict(metadata)
     else:
         metadata = {}
     metadata.setdefault("run_id", record.id)
-    metadata["memory_namespace"] = memory_namespace
     config_overrides["metadata"] = metadata
-    config_overrides["memory_namespace"] = memory_namespace
+    # Memories use the configured shared namespace so reflections carry over between runs;
+    # callers may still pass ``memory_namespace`` in ``config`` to isolate a run.
 
     try:
-        result = await asyncio.to_thread(
-            run_tradingagents,
+        # Runs natively on the event loop; no thread is pinned for the run's lifetime.
+        result = await arun_tradingagents(
             ticker=request.ticker,
             trade_date=request.trade_date,
             config_overrides=config_overrides,
@@ -236,6 +285,7 @@ def _serialize_record(record: RunRecord) -> RunStatusResponse:
         updated_at=record.updated_at,
         result=record.result,
         error=record.error,
+        queue_position=get_scheduler().position(record.id) if record.status == "queued" else None,
         events=record.events,
     )
 
@@ -254,10 +304,23 @@ async def create_run(payload: RunCreateRequest) -> RunCreateResponse:
     )
 
     async with _runs_lock:
-        _runs[run_id] = record
+        _runs.add(record)
 
     _enqueue_event(run_id, _build_event("status", state="queued"))
-    record.task = asyncio.create_task(_execute_run(record, payload))
+    try:
+        get_scheduler().submit(
+            run_id,
+            lambda: _execute_run(record, payload),
+            priority=payload.priority,
+        )
+    except QueueFullError as exc:
+        async with _runs_lock:
+            _runs.pop(run_id, None)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": "30"},
+        ) from exc
 
     return RunCreateResponse(id=run_id, status=record.status)
 
@@ -269,11 +332,35 @@ async def get_run(run_id: str) -> RunStatusResponse:
     return _serialize_record(record)
 
 
-@app.get("/runs", response_model=List[RunStatusResponse], dependencies=[Depends(require_token)])
-async def list_runs() -> List[RunStatusResponse]:
-    """Enumerate all tracked runs (development-only helper endpoint)."""
+@app.get("/runs", response_model=RunListResponse, dependencies=[Depends(require_token)])
+async def list_runs(
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    run_status: Optional[str] = Query(default=None, alias="status"),
+) -> RunListResponse:
+    """List tracked runs newest first, one page at a time."""
     async with _runs_lock:
-        return [_serialize_record(record) for record in _runs.values()]
+        records, total = _runs.page(offset=offset, limit=limit, status=run_status)
+        return RunListResponse(
+            items=[_serialize_record(record) for record in records],
+            total=total,
+            offset=offset,
+            limit=limit,
+        )
+
+
+@app.get("/quota", dependencies=[Depends(require_token)])
+async def get_quota() -> Dict[str, Any]:
+    """Remaining shared vendor call budgets (empty when no ``vendor_quotas`` are configured)."""
+    governor = get_vendor_quota()
+    return {"vendors": governor.remaining() if governor is not None else {}}
+
+
+@app.get("/vendors/health", dependencies=[Depends(require_token)])
+async def get_vendors_health() -> Dict[str, Any]:
+    """Circuit state, error rate and latency per method and vendor in this process."""
+    health = get_vendor_health()
+    return {"methods": health.snapshot() if health is not None else {}}
 
 
 def _event_to_sse(event: Dict[str, Any]) -> str:
@@ -0,0 +1,339 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+"""Run records for the API service: in-memory LRU front, SQLite file behind.
+
+Active runs (queued/running) always stay in memory because they own an asyncio
+task and an event queue. Finished runs are written to SQLite, kept in an LRU of
+bounded size, reloaded from disk on demand, and deleted once their TTL expires.
+
+Each row records the ``owner`` (worker name) that wrote it; a store opened
+without one writes the empty name. On startup a store marks its owner's
+unfinished runs as failed, since they were interrupted; runs of other workers
+sharing the database are left alone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+TERMINAL_STATES = {"success", "failed"}
+
+# Payload keys whose latest value supersedes earlier ones in the stored history.
+_SNAPSHOT_KEYS = ("investment_debate_state", "risk_debate_state")
+
+
+@dataclass
+class RunRecord:
+    """In-memory representation of a TradingAgents execution."""
+
+    id: str
+    ticker: str
+    trade_date: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task[Any]] = None
+    queue: asyncio.Queue[Dict[str, Any]] = field(default_factory=asyncio.Queue)
+
+
+def _is_superseded(path: str, superseded: set) -> bool:
+    return path in superseded or path.split(".", 1)[0] in superseded
+
+
+def compact_events(events: List[Dict[str, Any]], new_event: Dict[str, Any]) -> None:
+    """Append ``new_event`` and drop older snapshots it supersedes.
+
+    ``state`` events carry either the full text of a report section or debate
+    state, or ``deltas`` appended to the last full copy. A new full copy makes
+    every earlier copy and delta for the same path redundant, so those are
+    dropped and a replay of the history still reconstructs the latest text.
+    Earlier events that end up with an empty payload are removed.
+    """
+    payload = new_event.get("payload")
+    superseded = set()
+    if new_event.get("event") == "state" and isinstance(payload, dict):
+        reports = payload.get("reports")
+        if isinstance(reports, dict):
+            superseded.update(f"reports.{section}" for section in reports)
+        superseded.update(key for key in _SNAPSHOT_KEYS if key in payload)
+
+    if superseded:
+        kept: List[Dict[str, Any]] = []
+        for event in events:
+            old_payload = event.get("payload")
+            if event.get("event") != "state" or not isinstance(old_payload, dict):
+                kept.append(event)
+                continue
+            trimmed = dict(old_payload)
+            old_reports = trimmed.get("reports")
+            if isinstance(old_reports, dict):
+                remaining = {
+                    section: text
+                    for section, text in old_reports.items()
+                    if f"reports.{section}" not in superseded
+                }
+                if remaining:
+                    trimmed["reports"] = remaining
+                else:
+                    trimmed.pop("reports")
+            old_deltas = trimmed.get("deltas")
+            if isinstance(old_deltas, dict):
+                remaining_deltas = {
+                    path: change for path, change in old_deltas.items() if not _is_superseded(path, superseded)
+                }
+                if remaining_deltas:
+                    trimmed["deltas"] = remaining_deltas
+                else:
+                    trimmed.pop("deltas")
+            for key in _SNAPSHOT_KEYS:
+                if key in superseded:
+                    trimmed.pop(key, None)
+            if trimmed.keys() != old_payload.keys() or any(
+                len(trimmed[name]) != len(old_payload[name]) for name in ("reports", "deltas") if name in trimmed
+            ):
+                # A partially trimmed keyframe no longer holds the full state.
+                trimmed.pop("keyframe", None)
+            if trimmed:
+                kept.append({**event, "payload": trimmed})
+        events[:] = kept
+
+    events.append(new_event)
+
+
+class RunStore:
+    """LRU cache of run records with optional SQLite persistence."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_cached: int = 200,
+        completed_ttl: Optional[float] = 7 * 24 * 60 * 60,
+        owner: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.owner = owner or ""
+        self.max_cached = max(1, int(max_cached))
+        self.completed_ttl = completed_ttl
+        self._records: "OrderedDict[str, RunRecord]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # -- mapping-style helpers -------------------------------------------------
+
+    def get(self, run_id: str) -> Optional[RunRecord]:
+        record = self._records.get(run_id)
+        if record is not None:
+            self._records.move_to_end(run_id)
+            return record
+        record = self._load(run_id)
+        if record is not None:
+            self._remember(record)
+        return record
+
+    def add(self, record: RunRecord) -> None:
+        self._remember(record)
+        self.save(record)
+        self.evict_expired()
+
+    def pop(self, run_id: str, default: Any = None) -> Any:
+        record = self._records.pop(run_id, default)
+        conn = self._connection()
+        if conn is not None:
+            with self._lock:
+                conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+                conn.commit()
+        return record
+
+    def clear(self) -> None:
+        self._records.clear()
+        conn = self._connection()
+        if conn is not None:
+            with self._lock:
+                conn.execute("DELETE FROM runs")
+                conn.commit()
+
+    def __len__(self) -> int:
+        conn = self._connection()
+        if conn is None:
+            return len(self._records)
+        with self._lock:
+            return int(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    # -- persistence -------------------------------------------------------------
+
+    def save(self, record: RunRecord) -> None:
+        """Write the record's current snapshot to SQLite (no-op without a path)."""
+        conn = self._connection()
+        if conn is None:
+            return
+        completed_at = time.time() if record.status in TERMINAL_STATES else None
+        with self._lock:
+            # A finished run keeps its first completion time, so later saves do not push back its TTL
+            conn.execute(
+                "INSERT INTO runs "
+                "(id, ticker, trade_date, status, created_at, updated_at, completed_at, result, error, events, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET ticker = excluded.ticker, trade_date = excluded.trade_date, "
+                "status = excluded.status, created_at = excluded.created_at, updated_at = excluded.updated_at, "
+                "completed_at = CASE WHEN excluded.completed_at IS NULL THEN NULL "
+                "ELSE COALESCE(runs.completed_at, excluded.completed_at) END, "
+                "result = excluded.result, error = excluded.error, events = excluded.events, "
+                "owner = excluded.owner",
+                (
+                    record.id,
+                    record.ticker,
+                    record.trade_date,
+                    record.status,
+                    record.created_at.isoformat(),
+                    record.updated_at.isoformat(),
+                    completed_at,
+                    json.dumps(record.result, ensure_ascii=True) if record.result is not None else None,
+                    record.error,
+                    json.dumps(record.events, ensure_ascii=True),
+                    self.owner,
+                ),
+            )
+            conn.commit()
+        if record.status in TERMINAL_STATES:
+            self._trim()
+
+    def evict_expired(self) -> int:
+        """Drop finished runs older than the TTL from memory and disk."""
+        if self.completed_ttl is None:
+            return 0
+        cutoff = time.time() - self.completed_ttl
+        cutoff_dt = datetime.utcfromtimestamp(cutoff)
+        expired = [
+            run_id
+            for run_id, record in self._records.items()
+            if record.status in TERMINAL_STATES and record.updated_at < cutoff_dt
+        ]
+        for run_id in expired:
+            self._records.pop(run_id, None)
+
+        removed = len(expired)
+        conn = self._connection()
+        if conn is not None:
+            with self._lock:
+                cursor = conn.execute(
+                    "DELETE FROM runs WHERE completed_at IS NOT NULL AND completed_at < ?", (cutoff,)
+                )
+                conn.commit()
+            removed = max(removed, cursor.rowcount)
+        return removed
+
+    def page(self, offset: int = 0, limit: int = 50, status: Optional[str] = None) -> Tuple[List[RunRecord], int]:
+        """Return one page of runs (newest first) and the total count."""
+        self.evict_expired()
+        conn = self._connection()
+        if conn is None:
+            records = [r for r in self._records.values() if status is None or r.status == status]
+            records.sort(key=lambda r: r.created_at, reverse=True)
+            return records[offset : offset + limit], len(records)
+
+        where, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        with self._lock:
+            total = int(conn.execute(f"SELECT COUNT(*) FROM runs {where}", params).fetchone()[0])
+            ids = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT id FROM runs {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                    (*params, limit, offset),
+                )
+            ]
+        page = []
+        for run_id in ids:
+            # Prefer the live record for active runs; their rows lag behind.
+            record = self._records.get(run_id) or self._load(run_id)
+            if record is not None:
+                page.append(record)
+        return page, total
+
+    # -- internals ---------------------------------------------------------------
+
+    def _remember(self, record: RunRecord) -> None:
+        self._records[record.id] = record
+        self._records.move_to_end(record.id)
+        self._trim()
+
+    def _trim(self) -> None:
+        # Only finished runs may leave memory; active ones own a task and a queue.
+        # Without a SQLite path evicted runs are gone, which bounds memory all the same.
+        if len(self._records) <= self.max_cached:
+            return
+        for run_id in list(self._records):
+            if len(self._records) <= self.max_cached:
+                break
+            if self._records[run_id].status in TERMINAL_STATES:
+                self._records.pop(run_id)
+
+    def _load(self, run_id: str) -> Optional[RunRecord]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        with self._lock:
+            row = conn.execute(
+                "SELECT id, ticker, trade_date, status, created_at, updated_at, result, error, events "
+                "FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return RunRecord(
+            id=row[0],
+            ticker=row[1],
+            trade_date=row[2],
+            status=row[3],
+            created_at=datetime.fromisoformat(row[4]),
+            updated_at=datetime.fromisoformat(row[5]),
+            result=json.loads(row[6]) if row[6] else None,
+            error=row[7],
+            events=json.loads(row[8]) if row[8] else [],
+        )
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    directory = os.path.dirname(os.path.abspath(self.path))
+                    os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS runs ("
+                        "id TEXT PRIMARY KEY, ticker TEXT, trade_date TEXT, status TEXT, "
+                        "created_at TEXT, updated_at TEXT, completed_at REAL, "
+                        "result TEXT, error TEXT, events TEXT, owner TEXT)"
+                    )
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+                    if "owner" not in columns:
+                        conn.execute("ALTER TABLE runs ADD COLUMN owner TEXT")
+                    conn.execute("CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at)")
+                    # This worker's runs that were active when it last stopped will never finish.
+                    # Rows from before the owner column count as the unnamed worker's.
+                    conn.execute(
+                        "UPDATE runs SET status = 'failed', error = 'Interrupted by service restart.', "
+                        "completed_at = ? WHERE COALESCE(owner, '') = ? AND status NOT IN ('success', 'failed')",
+                        (time.time(), self.owner),
+                    )
+                    conn.commit()
+                    self._conn = conn
+        return self._conn
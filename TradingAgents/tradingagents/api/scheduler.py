@@ -0,0 +1,86 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+
+"""Bounded run scheduler with admission control for the API service."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+RunFactory = Callable[[], Awaitable[Any]]
+
+
+class QueueFullError(Exception):
+    """Raised when a run is submitted while the backlog is at capacity."""
+
+
+class RunScheduler:
+    """Start at most ``max_concurrent`` runs at once and queue the rest.
+
+    Queued runs start in FIFO order, or by descending ``priority`` (FIFO among
+    equal priorities) when ``policy`` is ``"priority"``. Submissions beyond
+    ``max_queued`` waiting runs are rejected with :class:`QueueFullError`.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queued: int = 20, policy: str = "fifo") -> None:
+        if policy not in ("fifo", "priority"):
+            raise ValueError(f"Unsupported queue policy '{policy}', expected 'fifo' or 'priority'")
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queued = max(0, int(max_queued))
+        self.policy = policy
+        self._queue: List[Tuple[int, int, str, RunFactory]] = []
+        self._sequence = itertools.count()
+        self._running: Dict[str, asyncio.Task[Any]] = {}
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def submit(self, run_id: str, factory: RunFactory, priority: int = 0) -> Optional[int]:
+        """Admit a run; returns its 1-based queue position, or None if it started."""
+        if len(self._running) >= self.max_concurrent and len(self._queue) >= self.max_queued:
+            raise QueueFullError(
+                f"Run backlog is full ({self.max_queued} queued, {self.max_concurrent} running)."
+            )
+
+        rank = -int(priority) if self.policy == "priority" else 0
+        heapq.heappush(self._queue, (rank, next(self._sequence), run_id, factory))
+        self._dispatch()
+        return self.position(run_id)
+
+    def position(self, run_id: str) -> Optional[int]:
+        """1-based position among waiting runs, or None when not queued."""
+        for index, entry in enumerate(sorted(self._queue)):
+            if entry[2] == run_id:
+                return index + 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "policy": self.policy,
+        }
+
+    def _dispatch(self) -> None:
+        while self._queue and len(self._running) < self.max_concurrent:
+            _, _, run_id, factory = heapq.heappop(self._queue)
+            task = asyncio.create_task(factory())
+            self._running[run_id] = task
+            task.add_done_callback(lambda _task, finished=run_id: self._on_done(finished))
+
+    def _on_done(self, run_id: str) -> None:
+        self._running.pop(run_id, None)
+        self._dispatch()
@@ -1,9 +1,21 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 import os
+import threading
 import requests
 import pandas as pd
 import json
 from datetime import datetime
 from io import StringIO
+from typing import Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+
+from .config import get_config
+from .vendor_limits import outside_vendor_slot
+from .vendor_quota import get_vendor_quota
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
@@ -39,12 +51,71 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Process-wide keep-alive session; its connection pool is shared by all threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = int(get_config().get("alpha_vantage_pool_size", 10))
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size)))
+            _session = session
+        return _session
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+_in_flight: Dict[Tuple, _InFlightCall] = {}
+_in_flight_lock = threading.Lock()
+
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
-    
+
+    Identical requests issued while one is already in flight (e.g. by analysts
+    running in parallel) wait for and share its response instead of spending
+    another call of the API quota.
+
     Raises:
         AlphaVantageRateLimitError: When API rate limit is exceeded
     """
+    entitlement = params.get("entitlement") or globals().get('_current_entitlement')
+    key = (function_name, tuple(sorted((k, str(v)) for k, v in params.items() if k != "entitlement")), entitlement)
+
+    with _in_flight_lock:
+        call = _in_flight.get(key)
+        leader = call is None
+        if leader:
+            call = _in_flight[key] = _InFlightCall()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _send_api_request(function_name, params)
+        return call.result
+    except BaseException as exc:
+        call.error = exc
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        call.done.set()
+
+
+def _send_api_request(function_name: str, params: dict) -> str:
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
     api_params.update({
@@ -63,7 +134,17 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
+    config = get_config()
+    # Shared cross-process budget: wait briefly for a token, otherwise let route_to_vendor fall back
+    governor = get_vendor_quota(config)
+    if governor is not None:
+        with outside_vendor_slot("alpha_vantage"):
+            granted = governor.acquire("alpha_vantage", max_wait=float(config.get("vendor_quota_max_wait", 5)))
+    if governor is not None and not granted:
+        raise AlphaVantageRateLimitError("Alpha Vantage quota budget exhausted; not sending the request")
+
+    timeout = float(config.get("alpha_vantage_timeout", 30))
+    response = _get_session().get(API_BASE_URL, params=api_params, timeout=timeout)
     response.raise_for_status()
 
     response_text = response.text
@@ -75,6 +156,8 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         if "Information" in response_json:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                if governor is not None and "rate limit" in info_message.lower():
+                    governor.penalize("alpha_vantage", until_next_day="per day" in info_message.lower())
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
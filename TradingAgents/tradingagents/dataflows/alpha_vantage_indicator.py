@@ -1,4 +1,85 @@
-from .alpha_vantage_common import _make_api_request
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from .alpha_vantage_common import AlphaVantageRateLimitError, _make_api_request
+from .utils import UnsupportedArgumentError, dedupe_indicators, format_indicator_table
+
+logger = logging.getLogger(__name__)
+
+# Parsed indicator series: (function, params, day) -> (header, rows). Entries expire with the day.
+_SERIES_CACHE_SIZE = 64
+_series_cache: "OrderedDict[Tuple, Tuple[List[str], List[List[str]]]]" = OrderedDict()
+_series_cache_lock = threading.Lock()
+
+
+# Map internal indicator names to expected CSV column names from Alpha Vantage
+_INDICATOR_COLUMNS = {
+    "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
+    "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
+    "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
+    "close_50_sma": "SMA", "close_200_sma": "SMA"
+}
+
+
+def _indicator_request(
+    indicator: str, symbol: str, interval: str, time_period: int, series_type: str
+) -> Tuple[str, Dict[str, str]]:
+    """Alpha Vantage function and parameters that serve ``indicator``."""
+    params = {"symbol": symbol, "interval": interval}
+    if indicator in ("close_50_sma", "close_200_sma"):
+        function_name = "SMA"
+        params["time_period"] = "50" if indicator == "close_50_sma" else "200"
+    elif indicator == "close_10_ema":
+        function_name = "EMA"
+        params["time_period"] = "10"
+    elif indicator in ("macd", "macds", "macdh"):
+        function_name = "MACD"
+    elif indicator == "rsi":
+        function_name = "RSI"
+        params["time_period"] = str(time_period)
+    elif indicator in ("boll", "boll_ub", "boll_lb"):
+        function_name = "BBANDS"
+        params["time_period"] = "20"
+    elif indicator == "atr":
+        return "ATR", {**params, "time_period": str(time_period), "datatype": "csv"}
+    else:
+        raise UnsupportedArgumentError(f"Indicator {indicator} not implemented yet.")
+    params["series_type"] = series_type
+    params["datatype"] = "csv"
+    return function_name, params
+
+
+def _get_indicator_series(function_name: str, params: Dict[str, str]) -> Optional[Tuple[List[str], List[List[str]]]]:
+    """Header and split rows of an indicator CSV, fetched once per day per request."""
+    key = (function_name, tuple(sorted(params.items())), date.today().isoformat())
+    with _series_cache_lock:
+        if key in _series_cache:
+            _series_cache.move_to_end(key)
+            return _series_cache[key]
+
+    lines = _make_api_request(function_name, params).strip().split('\n')
+    if len(lines) < 2:
+        return None
+    header = [col.strip() for col in lines[0].split(',')]
+    rows = [line.split(',') for line in lines[1:] if line.strip()]
+
+    # Only well-formed series are kept; error payloads are retried on the next call
+    if 'time' in header:
+        with _series_cache_lock:
+            _series_cache[key] = (header, rows)
+            _series_cache.move_to_end(key)
+            while len(_series_cache) > _SERIES_CACHE_SIZE:
+                _series_cache.popitem(last=False)
+    return header, rows
+
 
 def get_indicator(
     symbol: str,
@@ -58,7 +139,7 @@ def get_indicator(
     }
 
     if indicator not in supported_indicators:
-        raise ValueError(
+        raise UnsupportedArgumentError(
             f"Indicator {indicator} is not supported. Please choose from: {list(supported_indicators.keys())}"
         )
 
@@ -72,104 +153,26 @@ def get_indicator(
     if required_series_type:
         series_type = required_series_type
 
-    try:
-        # Get indicator data for the period
-        if indicator == "close_50_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "50",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_200_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "200",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_10_ema":
-            data = _make_api_request("EMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "10",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macd":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macds":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macdh":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "rsi":
-            data = _make_api_request("RSI", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator in ["boll", "boll_ub", "boll_lb"]:
-            data = _make_api_request("BBANDS", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "20",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "atr":
-            data = _make_api_request("ATR", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "datatype": "csv"
-            })
-        elif indicator == "vwma":
-            # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
-            # In a real implementation, this would need to be calculated from OHLCV data
-            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
-        else:
-            return f"Error: Indicator {indicator} not implemented yet."
+    if indicator == "vwma":
+        # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
+        # In a real implementation, this would need to be calculated from OHLCV data
+        return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
 
-        # Parse CSV data and extract values for the date range
-        lines = data.strip().split('\n')
-        if len(lines) < 2:
+    try:
+        # macd/macds/macdh share one MACD request and boll/boll_ub/boll_lb one BBANDS request;
+        # the parsed series is cached, so sibling indicators are sliced from the same response
+        function_name, params = _indicator_request(indicator, symbol, interval, time_period, series_type)
+        series = _get_indicator_series(function_name, params)
+        if series is None:
             return f"Error: No data returned for {indicator}"
+        header, rows = series
 
-        # Parse header and data
-        header = [col.strip() for col in lines[0].split(',')]
         try:
             date_col_idx = header.index('time')
         except ValueError:
             return f"Error: 'time' column not found in data for {indicator}. Available columns: {header}"
 
-        # Map internal indicator names to expected CSV column names from Alpha Vantage
-        col_name_map = {
-            "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
-            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
-            "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
-            "close_50_sma": "SMA", "close_200_sma": "SMA"
-        }
-
-        target_col_name = col_name_map.get(indicator)
+        target_col_name = _INDICATOR_COLUMNS.get(indicator)
 
         if not target_col_name:
             # Default to the second column if no specific mapping exists
@@ -181,10 +184,7 @@ def get_indicator(
                 return f"Error: Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {header}"
 
         result_data = []
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-            values = line.split(',')
+        for values in rows:
             if len(values) > value_col_idx:
                 try:
                     date_str = values[date_col_idx].strip()
@@ -217,6 +217,101 @@ def get_indicator(
 
         return result_str
 
+    except AlphaVantageRateLimitError:
+        # Let route_to_vendor fall back to the next vendor
+        raise
     except Exception as e:
-        print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
+        logger.warning("Error getting Alpha Vantage indicator data for %s: %s", indicator, e)
         return f"Error retrieving {indicator} data: {str(e)}"
+
+
+def get_indicators_batch(
+    symbol: str,
+    indicators: List[str],
+    curr_date: str,
+    look_back_days: int,
+    interval: str = "daily",
+    time_period: int = 14,
+) -> str:
+    """
+    Returns several Alpha Vantage technical indicators over a time window as one table.
+
+    Indicators served by the same request (macd/macds/macdh, boll/boll_ub/boll_lb)
+    share one fetch, and each series is joined on its date column.
+
+    Args:
+        symbol: ticker symbol of the company
+        indicators: technical indicators to report, e.g. ["rsi", "macd"]
+        curr_date: The current trading date you are trading on, YYYY-mm-dd
+        look_back_days: how many days to look back
+        interval: Time interval (daily, weekly, monthly)
+        time_period: Number of data points for calculation
+
+    Returns:
+        String containing one CSV row per date with a column per indicator
+    """
+    from datetime import datetime
+    from dateutil.relativedelta import relativedelta
+
+    indicators = dedupe_indicators(indicators)
+    unsupported = [name for name in indicators if name not in _INDICATOR_COLUMNS and name != "vwma"]
+    if unsupported:
+        raise UnsupportedArgumentError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(_INDICATOR_COLUMNS) + ['vwma']}"
+        )
+
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    start_date = (curr_date_dt - relativedelta(days=look_back_days)).strftime("%Y-%m-%d")
+    end_date = curr_date_dt.strftime("%Y-%m-%d")
+
+    notes = []
+    if "vwma" in indicators:
+        notes.append("vwma: VWMA is not directly available from Alpha Vantage API.")
+        indicators = [name for name in indicators if name != "vwma"]
+
+    # One request per distinct (function, params); sibling indicators read different columns
+    requests: "OrderedDict[Tuple, List[str]]" = OrderedDict()
+    for indicator in indicators:
+        function_name, params = _indicator_request(indicator, symbol, interval, time_period, "close")
+        requests.setdefault((function_name, tuple(sorted(params.items()))), []).append(indicator)
+
+    values: Dict[str, Dict[str, str]] = {indicator: {} for indicator in indicators}
+    fetched = []
+    for (function_name, params), members in requests.items():
+        try:
+            series = _get_indicator_series(function_name, dict(params))
+        except AlphaVantageRateLimitError:
+            # Let route_to_vendor fall back to the next vendor
+            raise
+        except Exception as e:
+            logger.warning("Error getting Alpha Vantage indicator data for %s: %s", ", ".join(members), e)
+            notes.append(f"{', '.join(members)}: error retrieving data: {e}")
+            continue
+        if series is None or 'time' not in series[0]:
+            notes.append(f"{', '.join(members)}: no data returned")
+            continue
+        header, rows = series
+        date_col_idx = header.index('time')
+        for indicator in members:
+            target_col_name = _INDICATOR_COLUMNS[indicator]
+            if target_col_name not in header:
+                notes.append(f"{indicator}: column '{target_col_name}' not found. Available columns: {header}")
+                continue
+            value_col_idx = header.index(target_col_name)
+            fetched.append(indicator)
+            for row in rows:
+                if len(row) <= max(date_col_idx, value_col_idx):
+                    continue
+                date_str = row[date_col_idx].strip()
+                # ISO dates compare correctly as strings
+                if start_date <= date_str[:10] <= end_date:
+                    values[indicator][date_str] = row[value_col_idx].strip()
+
+    # An all-failed batch must not look like an (empty) answer: raise so the next vendor is tried
+    # and nothing is cached; notes only describe the gaps of a partial result
+    if not fetched:
+        raise RuntimeError(f"No Alpha Vantage indicator data for {symbol}: {'; '.join(notes)}")
+
+    dates = sorted(set().union(*values.values())) if values else []
+    table = [(date_str, [values[indicator].get(date_str, "N/A") for indicator in indicators]) for date_str in dates]
+    return format_indicator_table(symbol, indicators, start_date, end_date, table, notes)
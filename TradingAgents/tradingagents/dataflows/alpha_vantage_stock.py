@@ -1,5 +1,9 @@
-from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+from .ohlcv_cache import get_ohlcv_cache
 
 def get_stock(
     symbol: str,
@@ -18,21 +22,9 @@ def get_stock(
     Returns:
         CSV string containing the daily adjusted time series data filtered to the date range.
     """
-    # Parse dates to determine the range
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
+    # The shared OHLCV cache downloads the full series once, then refreshes it
+    # with outputsize=compact (latest 100 data points) at most once a day
+    rows = get_ohlcv_cache().frame(symbol, "alpha_vantage", start_date, end_date)
 
-    # Choose outputsize based on whether the requested range is within the latest 100 days
-    # Compact returns latest 100 data points, so check if start_date is recent enough
-    days_from_today_to_start = (today - start_dt).days
-    outputsize = "compact" if days_from_today_to_start < 100 else "full"
-
-    params = {
-        "symbol": symbol,
-        "outputsize": outputsize,
-        "datatype": "csv",
-    }
-
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
-
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+    # Newest first, as the API returns it
+    return rows.iloc[::-1].to_csv(index=False)
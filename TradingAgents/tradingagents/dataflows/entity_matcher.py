@@ -0,0 +1,138 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Company-mention matching over a ticker -> aliases universe.
+
+All aliases are compiled into two combined, trie-factored regexes, so scanning
+a post costs one pass per regex however many tickers the universe holds:
+
+- company names match case-insensitively on word boundaries;
+- ticker symbols match case-sensitively as whole words, optionally ``$``-prefixed,
+  so short symbols such as ``V`` or ``X`` do not match ordinary words.
+
+The default universe is ``reddit_utils.ticker_to_company``. A JSON file of
+``{"TICKER": ["Alias", ...]}`` named by ``entity_universe_path`` extends or
+overrides it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from .config import get_config
+
+_WORD_CHAR = r"A-Za-z0-9"
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    """Regex matching any of ``terms``, factored into a character trie.
+
+    A flat ``a|b|c`` alternation makes the regex engine try every alias at
+    every position; the trie form shares prefixes, so the cost per position
+    depends on the length of the aliases, not on how many there are. Branches
+    are greedy, so the longest alias at a position wins.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return _trie_pattern(trie)
+
+
+def _trie_pattern(node: Dict) -> str:
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 and len(branches[0]) == 1 else f"(?:{'|'.join(branches)})"
+    return f"{body}?" if "" in node else body
+
+
+class EntityMatcher:
+    """Find which tickers of a universe a text mentions."""
+
+    def __init__(self, universe: Mapping[str, Iterable[str]]):
+        self.universe: Dict[str, List[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+        for ticker, aliases in universe.items():
+            ticker = ticker.strip().upper()
+            if not ticker:
+                continue
+            names = [alias.strip() for alias in aliases if alias and alias.strip()]
+            self.universe[ticker] = names
+            self._by_symbol.setdefault(ticker, set()).add(ticker)
+            for name in names:
+                self._by_name.setdefault(name.lower(), set()).add(ticker)
+
+        boundary_start, boundary_end = rf"(?<![{_WORD_CHAR}])", rf"(?![{_WORD_CHAR}])"
+        self._name_pattern = (
+            re.compile(f"{boundary_start}(?:{_alternation(self._by_name)}){boundary_end}", re.IGNORECASE)
+            if self._by_name
+            else None
+        )
+        self._symbol_pattern = (
+            re.compile(rf"{boundary_start}\$?({_alternation(self._by_symbol)}){boundary_end}")
+            if self._by_symbol
+            else None
+        )
+        self.fingerprint = hashlib.sha1(
+            json.dumps(self.universe, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self.universe
+
+    def find(self, *texts: Optional[str]) -> Set[str]:
+        """Tickers mentioned in any of ``texts``."""
+        found: Set[str] = set()
+        for text in texts:
+            if not text:
+                continue
+            if self._name_pattern is not None:
+                for match in self._name_pattern.finditer(text):
+                    found.update(self._by_name[match.group(0).lower()])
+            if self._symbol_pattern is not None:
+                for match in self._symbol_pattern.finditer(text):
+                    found.update(self._by_symbol[match.group(1)])
+        return found
+
+
+def default_universe() -> Dict[str, List[str]]:
+    from .reddit_utils import ticker_to_company
+
+    return {ticker: [name.strip() for name in names.split(" OR ")] for ticker, names in ticker_to_company.items()}
+
+
+def load_universe(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Default universe, extended/overridden by the JSON file at ``path``."""
+    universe = default_universe()
+    if path:
+        with open(path, "r", encoding="utf-8") as handle:
+            extra = json.load(handle)
+        for ticker, aliases in extra.items():
+            universe[ticker.upper()] = [aliases] if isinstance(aliases, str) else list(aliases)
+    return universe
+
+
+_matcher: Optional[EntityMatcher] = None
+_matcher_key: Optional[tuple] = None
+_matcher_lock = threading.Lock()
+
+
+def get_entity_matcher() -> EntityMatcher:
+    """Process-wide matcher for the configured universe (rebuilt when the file changes)."""
+    global _matcher, _matcher_key
+    path = get_config().get("entity_universe_path") or None
+    key = (path, os.stat(path).st_mtime if path and os.path.exists(path) else None)
+    with _matcher_lock:
+        if _matcher is None or _matcher_key != key:
+            _matcher = EntityMatcher(load_universe(path))
+            _matcher_key = key
+        return _matcher
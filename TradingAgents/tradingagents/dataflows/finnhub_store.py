@@ -0,0 +1,73 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Date-sorted, process-memoized view over the Finnhub ``*_data_formatted.json`` files.
+
+Each file maps ``YYYY-MM-DD`` keys to lists of entries. It is parsed once per
+process (and again only when its mtime or size changes) into parallel sorted
+lists of dates and entry lists, so a date-range query is two bisections instead
+of a full JSON parse and a scan of every key. Backtests that ask for the same
+ticker across many dates parse its file once.
+"""
+
+import bisect
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+class FinnhubTable:
+    """Read-only entries of one Finnhub file, sorted by date (empty days dropped)."""
+
+    def __init__(self, data: Dict[str, List[Any]]):
+        items = sorted(((date, entries) for date, entries in data.items() if len(entries) > 0), key=lambda item: item[0])
+        self.dates: List[str] = [date for date, _ in items]
+        self.entries: List[List[Any]] = [entries for _, entries in items]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def range(self, start_date: str, end_date: str) -> Dict[str, List[Any]]:
+        """Entries keyed by date for ``start_date..end_date`` inclusive, in date order."""
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = bisect.bisect_right(self.dates, end_date)
+        return dict(zip(self.dates[lo:hi], self.entries[lo:hi]))
+
+
+def unique_entries(entry_lists: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Yield entries across lists in order, skipping exact duplicates (hash-based)."""
+    seen = set()
+    for entries in entry_lists:
+        for entry in entries:
+            key = json.dumps(entry, sort_keys=True, default=str)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield entry
+
+
+_tables: Dict[str, Tuple[Tuple[float, int], FinnhubTable]] = {}
+_tables_lock = threading.Lock()
+
+
+def load_finnhub_table(path: str) -> FinnhubTable:
+    """Return the parsed table for ``path``, memoized by file mtime and size."""
+    absolute = os.path.abspath(path)
+    stat = os.stat(absolute)
+    fingerprint = (stat.st_mtime, stat.st_size)
+
+    with _tables_lock:
+        cached = _tables.get(absolute)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+    # Parse outside the lock so different tickers load concurrently.
+    with open(absolute, "r") as handle:
+        table = FinnhubTable(json.load(handle))
+
+    with _tables_lock:
+        _tables[absolute] = (fingerprint, table)
+    return table
@@ -0,0 +1,282 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Precomputed technical indicator matrix.
+
+Every indicator the market analyst can request is computed in a single pass over
+a symbol's OHLCV history and saved as one ``.npz`` file keyed by the symbol and
+the version of the underlying price data. Window lookups are then two binary
+searches on the sorted day index instead of re-running stockstats per indicator.
+
+The formulas follow stockstats' defaults (windows, ``min_periods``, EWM
+``adjust=True``, fill values) so the reported numbers are unchanged.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import get_config
+from .price_store import PriceTable, load_price_table, to_day_number
+
+ENGINE_VERSION = 1
+
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+# stockstats default windows
+MACD_WINDOWS = (12, 26, 9)
+RSI_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+
+
+class IndicatorMatrix:
+    """Sorted day index plus one float64 column per supported indicator."""
+
+    def __init__(self, days: np.ndarray, values: Dict[str, np.ndarray]):
+        self.days = days
+        self.values = values
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    def bounds(self, start_date: str, end_date: str) -> Tuple[int, int]:
+        lo = int(np.searchsorted(self.days, to_day_number(start_date), side="left"))
+        hi = int(np.searchsorted(self.days, to_day_number(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def window(self, indicator: str, start_date: str, end_date: str) -> Dict[str, str]:
+        """Map ``YYYY-MM-DD`` to the formatted indicator value for a date range."""
+        if indicator not in self.values:
+            raise ValueError(f"Indicator {indicator} is not precomputed")
+        lo, hi = self.bounds(start_date, end_date)
+        dates = self.days[lo:hi].astype("datetime64[D]").astype(str)
+        column = self.values[indicator][lo:hi]
+        return {
+            date_str: ("N/A" if np.isnan(value) else str(float(value)))
+            for date_str, value in zip(dates, column)
+        }
+
+    def table(self, indicators: Sequence[str], start_date: str, end_date: str) -> List[Tuple[str, List[str]]]:
+        """Rows of ``(YYYY-MM-DD, [formatted value per indicator])`` for a date range, oldest first."""
+        for indicator in indicators:
+            if indicator not in self.values:
+                raise ValueError(f"Indicator {indicator} is not precomputed")
+        lo, hi = self.bounds(start_date, end_date)
+        if not indicators or hi <= lo:
+            return []
+        dates = self.days[lo:hi].astype("datetime64[D]").astype(str)
+        block = np.column_stack([self.values[indicator][lo:hi] for indicator in indicators])
+        return [
+            (str(date_str), ["N/A" if np.isnan(value) else str(float(value)) for value in values])
+            for date_str, values in zip(dates, block)
+        ]
+
+
+def _float_column(table: PriceTable, name: str) -> Optional[np.ndarray]:
+    for candidate in (name, name.capitalize(), name.upper()):
+        if candidate in table.columns:
+            return np.asarray(table.columns[candidate], dtype=np.float64)
+    return None
+
+
+def _rolling(values: np.ndarray, window: int):
+    import pandas as pd
+
+    return pd.Series(values).rolling(window, min_periods=1)
+
+
+def _ema(values: np.ndarray, window: int) -> np.ndarray:
+    import pandas as pd
+
+    return pd.Series(values).ewm(span=window, min_periods=1, adjust=True, ignore_na=False).mean().to_numpy()
+
+
+def _smma(values: np.ndarray, window: int) -> np.ndarray:
+    import pandas as pd
+
+    return pd.Series(values).ewm(alpha=1.0 / window, min_periods=0, adjust=True, ignore_na=False).mean().to_numpy()
+
+
+def _fill_zero(values: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(values)
+    out[1:] = np.diff(values)
+    return out
+
+
+def _rolling_sum_partial(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.cumsum(values)
+    out[window:] = out[window:] - out[:-window]
+    return out
+
+
+def compute_indicators(table: PriceTable) -> Dict[str, np.ndarray]:
+    """Compute every supported indicator for a price table."""
+    close = _float_column(table, "close")
+    high = _float_column(table, "high")
+    low = _float_column(table, "low")
+    volume = _float_column(table, "volume")
+    amount = _float_column(table, "amount")
+    if close is None or high is None or low is None or volume is None:
+        raise ValueError("Price table must contain Close, High, Low and Volume columns")
+
+    out: Dict[str, np.ndarray] = {}
+
+    out["close_50_sma"] = _rolling(close, 50).mean().to_numpy()
+    out["close_200_sma"] = _rolling(close, 200).mean().to_numpy()
+    out["close_10_ema"] = _ema(close, 10)
+
+    short_w, long_w, signal_w = MACD_WINDOWS
+    macd = _ema(close, short_w) - _ema(close, long_w)
+    macds = _ema(macd, signal_w)
+    out["macd"] = macd
+    out["macds"] = macds
+    out["macdh"] = macd - macds
+
+    change = _diff(close)
+    up = _smma(np.where(change > 0, change, 0.0), RSI_WINDOW)
+    down = _smma(np.where(change < 0, -change, 0.0), RSI_WINDOW)
+    total = up + down
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(total != 0, 100 * (up / total), 50.0)
+    if len(rsi):
+        rsi[0] = 50.0
+    out["rsi"] = _fill_zero(rsi)
+
+    boll_rolling = _rolling(close, BOLL_WINDOW)
+    boll = boll_rolling.mean().to_numpy()
+    width = BOLL_STD_TIMES * boll_rolling.std().to_numpy()
+    out["boll"] = boll
+    out["boll_ub"] = boll + width
+    out["boll_lb"] = boll - width
+
+    prev_close = np.empty_like(close)
+    if len(close):
+        prev_close[0] = close[0]
+        prev_close[1:] = close[:-1]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out["atr"] = _smma(_fill_zero(np.nan_to_num(true_range)), ATR_WINDOW)
+
+    if amount is not None:
+        typical = amount / volume
+    else:
+        typical = (close + high + low) / 3.0
+    typical = _fill_zero(typical)
+
+    rolling_tpv = _rolling(volume * typical, VWMA_WINDOW).sum().to_numpy()
+    rolling_volume = _rolling(volume, VWMA_WINDOW).sum().to_numpy()
+    out["vwma"] = np.divide(
+        rolling_tpv, rolling_volume, out=np.zeros_like(rolling_tpv), where=rolling_volume != 0
+    )
+
+    raw_flow = typical * volume
+    typical_change = _diff(typical)
+    pos_sum = _rolling_sum_partial(np.where(typical_change > 0, raw_flow, 0.0), MFI_WINDOW)
+    neg_sum = _rolling_sum_partial(np.where(typical_change < 0, raw_flow, 0.0), MFI_WINDOW)
+    flow_total = pos_sum + neg_sum
+    mfi = np.divide(pos_sum, flow_total, out=np.full_like(pos_sum, 0.5), where=flow_total > 0)
+    mfi[:MFI_WINDOW] = 0.5
+    out["mfi"] = _fill_zero(mfi)
+
+    return out
+
+
+def _matrix_path(symbol: str, source_path: str, cache_root: str) -> str:
+    stat = os.stat(source_path)
+    data_version = hashlib.sha1(
+        f"{os.path.abspath(source_path)}|{stat.st_mtime}|{stat.st_size}|{ENGINE_VERSION}".encode("utf-8")
+    ).hexdigest()[:12]
+    return os.path.join(cache_root, f"{symbol.upper()}-{data_version}.npz")
+
+
+def _read_matrix(path: str) -> Optional[IndicatorMatrix]:
+    try:
+        with np.load(path) as archive:
+            days = archive["_days"]
+            values = {name: archive[name] for name in SUPPORTED_INDICATORS}
+    except (OSError, KeyError, ValueError):
+        return None
+    return IndicatorMatrix(days, values)
+
+
+def _write_matrix(path: str, matrix: IndicatorMatrix) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}.npz"
+    np.savez(tmp_path, _days=matrix.days, **matrix.values)
+    os.replace(tmp_path, path)
+
+
+def _remove_stale_versions(symbol: str, cache_root: str, keep: str) -> None:
+    # Exact match: a plain prefix would also take "BRK-B-<hash>.npz" when refreshing "BRK"
+    pattern = re.compile(rf"^{re.escape(symbol.upper())}-[0-9a-f]+\.npz$")
+    try:
+        entries = os.listdir(cache_root)
+    except OSError:
+        return
+    for name in entries:
+        path = os.path.join(cache_root, name)
+        if pattern.match(name) and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_matrices: Dict[Tuple[str, str], Tuple[str, IndicatorMatrix]] = {}
+_matrices_lock = threading.Lock()
+
+
+def load_indicator_matrix(symbol: str, source_path: str, cache_root: Optional[str] = None) -> IndicatorMatrix:
+    """Return the indicator matrix for ``symbol`` computed from an OHLCV CSV.
+
+    The matrix is memoized in-process and on disk; a change to the source file
+    produces a new data version, and older versions for the symbol are removed.
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+    if cache_root is None:
+        cache_root = os.path.join(get_config().get("data_cache_dir", "data_cache"), "indicators")
+
+    path = _matrix_path(symbol, source_path, cache_root)
+    memo_key = (os.path.abspath(cache_root), symbol.upper())
+    with _matrices_lock:
+        cached = _matrices.get(memo_key)
+        if cached is not None and cached[0] == path:
+            return cached[1]
+
+        matrix = _read_matrix(path) if os.path.exists(path) else None
+        if matrix is None:
+            table = load_price_table(source_path)
+            matrix = IndicatorMatrix(np.array(table.days, dtype=np.int64), compute_indicators(table))
+            _write_matrix(path, matrix)
+            _remove_stale_versions(symbol, cache_root, path)
+
+        _matrices[memo_key] = (path, matrix)
+        return matrix
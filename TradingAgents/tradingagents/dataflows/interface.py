@@ -1,21 +1,25 @@
 """
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-19
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 """
+from contextlib import nullcontext
 from typing import Annotated
+import logging
 import os
+import time
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
+from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_stock_stats_indicators_batch, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
 from .google import get_google_news
 from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
 from .alpha_vantage import (
     get_stock as get_alpha_vantage_stock,
     get_indicator as get_alpha_vantage_indicator,
+    get_indicators_batch as get_alpha_vantage_indicators_batch,
     get_fundamentals as get_alpha_vantage_fundamentals,
     get_balance_sheet as get_alpha_vantage_balance_sheet,
     get_cashflow as get_alpha_vantage_cashflow,
@@ -25,10 +29,16 @@ from .alpha_vantage import (
 )
 from .gemini_browse import get_news_gemini_web, get_global_news_gemini_web
 from .alpha_vantage_common import AlphaVantageRateLimitError
+from .utils import UnsupportedArgumentError
+from .vendor_cache import _looks_like_error, get_vendor_cache, normalize_arguments
+from .vendor_limits import get_vendor_limiter
+from .vendor_health import get_vendor_health
 
 # Configuration and routing logic
 from .config import get_config
 
+logger = logging.getLogger(__name__)
+
 # Tools organized by category
 TOOLS_CATEGORIES = {
     "core_stock_apis": {
@@ -40,7 +50,8 @@ TOOLS_CATEGORIES = {
     "technical_indicators": {
         "description": "Technical analysis indicators",
         "tools": [
-            "get_indicators"
+            "get_indicators",
+            "get_indicators_batch"
         ]
     },
     "fundamental_data": {
@@ -85,6 +96,11 @@ VENDOR_METHODS = {
         "yfinance": get_stock_stats_indicators_window,
         "local": get_stock_stats_indicators_window
     },
+    "get_indicators_batch": {
+        "alpha_vantage": get_alpha_vantage_indicators_batch,
+        "yfinance": get_stock_stats_indicators_batch,
+        "local": get_stock_stats_indicators_batch
+    },
     # fundamental_data
     "get_fundamentals": {
         "alpha_vantage": get_alpha_vantage_fundamentals,
@@ -151,7 +167,11 @@ def get_vendor(category: str, method: str = None) -> str:
     return config.get("data_vendors", {}).get(category, "default")
 
 def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    Vendors whose circuit is open for ``method`` (see ``vendor_health``) are
+    skipped until their cooldown ends, and fallbacks are tried fastest first.
+    """
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
 
@@ -162,10 +182,10 @@ def route_to_vendor(method: str, *args, **kwargs):
     if config.get("llm_provider", "").lower() == "openrouter" and category == "news_data":
         if vendor_config == "openai":
             if os.getenv("GOOGLE_API_KEY"):
-                print("INFO: Overriding news vendor to 'gemini' for OpenRouter mode")
+                logger.info("Overriding news vendor to 'gemini' for OpenRouter mode")
                 vendor_config = "gemini"
             else:
-                print("WARN: GOOGLE_API_KEY missing; falling back from 'gemini' to 'google'/'local'")
+                logger.warning("GOOGLE_API_KEY missing; falling back from 'gemini' to 'google'/'local'")
                 vendor_config = "google" if "google" in VENDOR_METHODS.get(method, {}) else "local"
 
     # Handle comma-separated vendors
@@ -183,87 +203,123 @@ def route_to_vendor(method: str, *args, **kwargs):
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
 
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
+    # Per-(method, vendor) latency/error tracking and circuit breakers (None when disabled)
+    health = get_vendor_health()
+    if health is not None:
+        fallback_vendors = health.order(method, fallback_vendors, primary_vendors)
+
+    logger.debug("%s - Primary: [%s] | Full fallback order: [%s]",
+                 method, " → ".join(primary_vendors), " → ".join(fallback_vendors))
+
+    # Response cache shared across analysts, runs and processes (None when disabled)
+    cache = get_vendor_cache()
+    # Shared per-vendor rate limits (None when no limits are configured)
+    limiter = get_vendor_limiter()
 
     # Track results and execution state
     results = []
     vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
+    skipped_vendors = []
 
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
             if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
+                logger.info("Vendor '%s' not supported for method '%s', falling back to next vendor", vendor, method)
             continue
 
         vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
         vendor_attempt_count += 1
-
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
-
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
+        logger.debug("Attempting %s vendor '%s' for %s (attempt #%d)",
+                     "PRIMARY" if vendor in primary_vendors else "FALLBACK", vendor, method, vendor_attempt_count)
 
         # Handle list of methods for a vendor
         if isinstance(vendor_impl, list):
             vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
         else:
             vendor_methods = [(vendor_impl, vendor)]
 
         # Run methods for this vendor
         vendor_results = []
         for impl_func, vendor_name in vendor_methods:
+            cache_key = None
+            if cache is not None:
+                cache_key = cache.make_key(method, vendor_name, impl_func, args, kwargs)
+                hit, cached_result = cache.get(cache_key, method)
+                if hit:
+                    vendor_results.append(cached_result)
+                    logger.debug("Cache hit: %s from vendor '%s'", impl_func.__name__, vendor_name)
+                    continue
+
+            # Cached responses are still served above while a vendor's circuit is open
+            if health is not None and not health.allow(method, vendor_name):
+                logger.info("Skipping vendor '%s' for %s: circuit open", vendor_name, method)
+                skipped_vendors.append(vendor_name)
+                continue
+
+            started = time.monotonic()
             try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
+                # Wait for a rate token first so a sleeping call does not hold a concurrency slot
+                if limiter is not None:
+                    waited = limiter.acquire(vendor_name)
+                    if waited > 0:
+                        logger.info("Waited %.2fs for vendor '%s' rate limit", waited, vendor_name)
+                with limiter.slot(vendor_name) if limiter is not None else nullcontext():
+                    result = impl_func(*args, **kwargs)
                 vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
+                # Vendors often report failures as text ("Error retrieving ...", "No data found ...")
+                _record_health(health, method, vendor_name, not _looks_like_error(result), time.monotonic() - started)
+                logger.debug("%s from vendor '%s' completed in %.2fs",
+                             impl_func.__name__, vendor_name, time.monotonic() - started)
+
+                if cache_key is not None:
+                    ttl = cache.ttl_for(category, normalize_arguments(impl_func, args, kwargs))
+                    cache.set(cache_key, method, vendor_name, result, ttl)
 
             except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
+                _record_health(health, method, vendor_name, False, time.monotonic() - started)
+                logger.warning("Alpha Vantage rate limit exceeded, falling back to next available vendor: %s", e)
                 # Continue to next vendor for fallback
                 continue
             except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
+                # Log error but continue with other implementations. Rejected arguments (e.g. an
+                # unsupported indicator) say nothing about the vendor's health
+                if not isinstance(e, UnsupportedArgumentError):
+                    _record_health(health, method, vendor_name, False, time.monotonic() - started)
+                logger.warning("%s from vendor '%s' failed: %s", impl_func.__name__, vendor_name, e)
                 continue
 
         # Add this vendor's results
         if vendor_results:
             results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
 
             # Stopping logic: Stop after first successful vendor for single-vendor configs
             # Multiple vendor configs (comma-separated) may want to collect from multiple sources
             if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
                 break
-        else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
 
     # Final result summary
     if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        if skipped_vendors:
+            logger.warning("All vendors failed or have open circuits for method '%s' (skipped: %s)",
+                           method, ", ".join(skipped_vendors))
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
-    else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+    logger.debug("Method '%s' completed with %d result(s) from %d vendor attempt(s)",
+                 method, len(results), vendor_attempt_count)
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
         return results[0]
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        return '\n'.join(str(result) for result in results)
+
+
+def _record_health(health, method: str, vendor: str, ok: bool, latency: float) -> None:
+    """Record a call outcome and log circuit transitions."""
+    if health is None:
+        return
+    transition = health.record(method, vendor, ok, latency)
+    if transition == "opened":
+        logger.warning("Circuit opened for vendor '%s' on %s; skipping it until the cooldown ends", vendor, method)
+    elif transition == "closed":
+        logger.info("Circuit closed for vendor '%s' on %s; vendor recovered", vendor, method)
@@ -0,0 +1,375 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Incremental daily OHLCV cache shared by every price consumer.
+
+One CSV per (source, symbol) lives under ``<data_cache_dir>/ohlcv/<source>/``,
+described by ``<data_cache_dir>/ohlcv/manifest.json`` (covered date range, row
+count, the day it was last refreshed). The first request downloads
+``ohlcv_history_years`` of history; after that, at most once per day, only the
+trailing rows are fetched again (from a few rows before the last cached date)
+and merged in. If the re-fetched overlap disagrees with the cached prices --
+a split or dividend re-adjusted the history -- the whole range is downloaded
+again. Requests for dates before the covered range extend it backwards.
+
+Sources:
+
+- ``yfinance``: ``Ticker.history`` (auto-adjusted, with dividends and splits);
+- ``alpha_vantage``: ``TIME_SERIES_DAILY_ADJUSTED``, ``outputsize=compact`` for
+  refreshes within the last 100 days and ``full`` otherwise.
+
+Symbols not refreshed for ``ohlcv_cache_max_idle_days`` are garbage-collected,
+along with the per-day ``<symbol>-YFin-data-<start>-<end>.csv`` downloads the
+previous cache left in ``data_cache_dir``.
+
+Several processes may share the cache: manifest updates are read-modify-write
+under an exclusive lock on ``manifest.lock``, and GC leaves alone any CSV
+written within the last ``ORPHAN_GRACE_SECONDS``, since a CSV is written before
+its manifest entry.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from io import StringIO
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+try:
+    import fcntl
+except ImportError:  # Windows: the manifest is only guarded within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "manifest.lock"
+# CSVs younger than this are never garbage-collected (their manifest entry may still be on its way)
+ORPHAN_GRACE_SECONDS = 24 * 60 * 60
+MANIFEST_VERSION = 1
+# Cached rows re-fetched on every refresh; their prices must match for an incremental merge.
+REFRESH_OVERLAP_ROWS = 5
+# Alpha Vantage's compact output holds the latest 100 trading days.
+ALPHA_VANTAGE_COMPACT_DAYS = 100
+
+_LEGACY_FILE = re.compile(r"^.+-YFin-data-(\d{4}-\d{2}-\d{2})-(\d{4}-\d{2}-\d{2})\.csv$")
+
+# fetch(symbol, start, end) -> frame whose first column is the YYYY-MM-DD date; end is exclusive, None = latest
+Fetcher = Callable[[str, str, Optional[str]], pd.DataFrame]
+
+
+def _today() -> str:
+    return date.today().isoformat()
+
+
+def _fetch_yfinance(symbol: str, start: str, end: Optional[str]) -> pd.DataFrame:
+    import yfinance as yf
+
+    # Through yesterday by default, like the dated downloads this cache replaces: no partial bar for today.
+    end = end or _today()
+    data = yf.Ticker(symbol.upper()).history(start=start, end=end, auto_adjust=True)
+    if data.empty:
+        return pd.DataFrame(columns=["Date"])
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index = data.index.strftime("%Y-%m-%d")
+    data.index.name = "Date"
+    return data.reset_index()
+
+
+def _fetch_alpha_vantage(symbol: str, start: str, end: Optional[str]) -> pd.DataFrame:
+    from .alpha_vantage_common import _make_api_request
+
+    recent = (datetime.now() - datetime.strptime(start, "%Y-%m-%d")).days < ALPHA_VANTAGE_COMPACT_DAYS
+    response = _make_api_request(
+        "TIME_SERIES_DAILY_ADJUSTED",
+        {"symbol": symbol, "outputsize": "compact" if recent else "full", "datatype": "csv"},
+    )
+    frame = pd.read_csv(StringIO(response))
+    if frame.empty or frame.columns[0] != "timestamp":
+        raise ValueError(f"Unexpected Alpha Vantage response for {symbol}: {response[:200]}")
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"]).dt.strftime("%Y-%m-%d")
+    return frame
+
+
+OHLCV_SOURCES: Dict[str, Fetcher] = {
+    "yfinance": _fetch_yfinance,
+    "alpha_vantage": _fetch_alpha_vantage,
+}
+
+
+def _merge(older: pd.DataFrame, newer: pd.DataFrame) -> pd.DataFrame:
+    """Union of two frames on the date column; ``newer`` wins on shared dates."""
+    if older.empty:
+        return newer.sort_values(newer.columns[0], kind="stable").reset_index(drop=True)
+    if newer.empty:
+        return older
+    date_column = older.columns[0]
+    merged = pd.concat([older, newer], ignore_index=True)
+    merged = merged.drop_duplicates(subset=date_column, keep="last")
+    return merged.sort_values(date_column, kind="stable").reset_index(drop=True)
+
+
+def _overlap_matches(cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+    """Whether prices on dates both frames hold agree (ignoring the last cached, possibly partial, bar)."""
+    date_column = cached.columns[0]
+    settled = cached.iloc[:-1]
+    shared = settled.merge(fresh, on=date_column, suffixes=("_cached", "_fresh"))
+    for column in settled.columns[1:]:
+        if column not in fresh.columns or not pd.api.types.is_numeric_dtype(settled[column]):
+            continue
+        left = shared[f"{column}_cached"].astype(float)
+        right = shared[f"{column}_fresh"].astype(float)
+        if not ((left - right).abs() <= 1e-6 * right.abs().clip(lower=1.0) + 1e-9).all():
+            return False
+    return True
+
+
+class OhlcvCache:
+    """Per-symbol OHLCV CSVs under ``root`` with incremental refresh and GC."""
+
+    def __init__(
+        self,
+        root: str,
+        history_years: int = 15,
+        max_idle_days: int = 30,
+        sources: Optional[Mapping[str, Fetcher]] = None,
+        legacy_dir: Optional[str] = None,
+    ):
+        self.root = root
+        self.history_years = int(history_years)
+        self.max_idle_days = int(max_idle_days)
+        self.sources: Dict[str, Fetcher] = dict(sources or OHLCV_SOURCES)
+        self.legacy_dir = legacy_dir
+        self._lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+
+    def path(self, symbol: str, source: str = "yfinance") -> str:
+        return os.path.join(self.root, source, f"{symbol.upper()}.csv")
+
+    def ensure(self, symbol: str, source: str = "yfinance", start: Optional[str] = None) -> str:
+        """Path of the cached CSV for ``symbol``, fetched or refreshed as needed.
+
+        ``start`` (YYYY-MM-DD) extends the covered range backwards when older
+        than what is cached; by default the cache covers ``history_years``.
+        """
+        if source not in self.sources:
+            raise ValueError(f"Unsupported OHLCV source '{source}', expected one of {tuple(self.sources)}")
+        key = f"{source}/{symbol.upper()}"
+        path = self.path(symbol, source)
+        today = _today()
+        default_start = (pd.Timestamp(today) - pd.DateOffset(years=self.history_years)).strftime("%Y-%m-%d")
+        start = min(start, default_start) if start else default_start
+
+        with self._lock:
+            symbol_lock = self._symbol_locks.setdefault(key, threading.Lock())
+        # One fetch per symbol at a time; other symbols proceed in parallel.
+        with symbol_lock:
+            entry = self._read_manifest()["entries"].get(key)
+            if entry is not None and not os.path.exists(path):
+                entry = None
+            if entry is not None and entry["refreshed_on"] == today and start >= entry["covered_from"]:
+                return path
+
+            fetch = self.sources[source]
+            if entry is None:
+                frame = fetch(symbol, start, None)
+                if frame.empty:
+                    raise ValueError(f"No OHLCV data returned for {symbol} from {source}")
+                frame = _merge(frame.iloc[0:0], frame)
+                covered_from = start
+            else:
+                frame = pd.read_csv(path)
+                covered_from = entry["covered_from"]
+                try:
+                    if start < covered_from:
+                        frame = _merge(fetch(symbol, start, covered_from), frame)
+                        covered_from = start
+                    if entry["refreshed_on"] != today:
+                        since = frame.iloc[max(0, len(frame) - REFRESH_OVERLAP_ROWS)][frame.columns[0]]
+                        recent = fetch(symbol, since, None)
+                        if _overlap_matches(frame, recent):
+                            frame = _merge(frame, recent)
+                        else:
+                            logger.info("OHLCV history for %s was re-adjusted upstream; re-downloading", key)
+                            frame = _merge(frame.iloc[0:0], fetch(symbol, covered_from, None))
+                except Exception as exc:
+                    if start < covered_from:
+                        raise
+                    logger.warning(
+                        "OHLCV refresh failed for %s, serving cached rows through %s: %s", key, entry["last"], exc
+                    )
+                    return path
+
+            self._write_frame(path, frame)
+            self._update_manifest(
+                key,
+                {
+                    "path": os.path.relpath(path, self.root),
+                    "covered_from": covered_from,
+                    "first": str(frame.iloc[0, 0]),
+                    "last": str(frame.iloc[-1, 0]),
+                    "rows": int(len(frame)),
+                    "refreshed_on": today,
+                },
+            )
+        self.gc(only_if_due=True)
+        return path
+
+    def frame(
+        self,
+        symbol: str,
+        source: str = "yfinance",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Cached rows from ``start`` to ``end`` inclusive (dates as YYYY-MM-DD strings)."""
+        data = pd.read_csv(self.ensure(symbol, source, start))
+        dates = data.iloc[:, 0].astype(str)
+        mask = pd.Series(True, index=data.index)
+        if start:
+            mask &= dates >= start
+        if end:
+            mask &= dates <= end
+        return data[mask].reset_index(drop=True)
+
+    def gc(self, only_if_due: bool = False) -> List[str]:
+        """Delete idle symbols, orphaned CSVs and legacy per-day downloads; return removed paths."""
+        today = _today()
+        removed: List[str] = []
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            if only_if_due and manifest.get("last_gc") == today:
+                return removed
+            cutoff = (date.fromisoformat(today) - timedelta(days=self.max_idle_days)).isoformat()
+            for key, entry in list(manifest["entries"].items()):
+                path = os.path.join(self.root, entry["path"])
+                if entry["refreshed_on"] < cutoff and not self._recently_written(path):
+                    removed.append(path)
+                    del manifest["entries"][key]
+            known = {os.path.join(self.root, entry["path"]) for entry in manifest["entries"].values()}
+            for source in self.sources:
+                directory = os.path.join(self.root, source)
+                if os.path.isdir(directory):
+                    removed.extend(
+                        os.path.join(directory, name)
+                        for name in os.listdir(directory)
+                        if name.endswith(".csv")
+                        and os.path.join(directory, name) not in known
+                        and not self._recently_written(os.path.join(directory, name))
+                    )
+            if self.legacy_dir and os.path.isdir(self.legacy_dir):
+                removed.extend(
+                    os.path.join(self.legacy_dir, name)
+                    for name in os.listdir(self.legacy_dir)
+                    if self._is_legacy_download(name)
+                )
+            manifest["last_gc"] = today
+            self._write_manifest(manifest)
+            for path in removed:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return removed
+
+    @staticmethod
+    def _recently_written(path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(path) < ORPHAN_GRACE_SECONDS
+        except OSError:
+            return False
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Exclusive access to the manifest for this thread and, where supported, other processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, LOCK_FILE), "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _is_legacy_download(self, name: str) -> bool:
+        # The previous online cache wrote <symbol>-YFin-data-<today - 15y>-<today>.csv every day.
+        match = _LEGACY_FILE.match(name)
+        if match is None:
+            return False
+        start, end = match.groups()
+        try:
+            return (pd.Timestamp(end) - pd.DateOffset(years=15)).strftime("%Y-%m-%d") == start
+        except ValueError:
+            return False
+
+    def _write_frame(self, path: str, frame: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        frame.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.root, MANIFEST_FILE), "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            manifest = None
+        if not manifest or manifest.get("version") != MANIFEST_VERSION:
+            manifest = {"version": MANIFEST_VERSION, "entries": {}}
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _update_manifest(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            manifest["entries"][key] = entry
+            self._write_manifest(manifest)
+
+
+_cache_instance: Optional[OhlcvCache] = None
+_cache_key: Optional[Tuple] = None
+_cache_lock = threading.Lock()
+
+
+def get_ohlcv_cache(config: Optional[Mapping[str, Any]] = None) -> OhlcvCache:
+    """Return the process-wide OHLCV cache for ``config`` (default: the active config)."""
+    global _cache_instance, _cache_key
+
+    config = config or get_config()
+    data_cache_dir = config.get("data_cache_dir", "data_cache")
+    key = (
+        os.path.abspath(data_cache_dir),
+        int(config.get("ohlcv_history_years", 15)),
+        int(config.get("ohlcv_cache_max_idle_days", 30)),
+    )
+    with _cache_lock:
+        if _cache_instance is None or _cache_key != key:
+            _cache_instance = OhlcvCache(
+                os.path.join(key[0], "ohlcv"),
+                history_years=key[1],
+                max_idle_days=key[2],
+                legacy_dir=key[0],
+            )
+            _cache_key = key
+        return _cache_instance
@@ -0,0 +1,219 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Columnar OHLCV store backed by memory-mapped NumPy arrays.
+
+Each price CSV is converted once into a directory holding one ``.npy`` file per
+column plus a sorted ``int64`` day index (days since the Unix epoch). Later reads
+memory-map the columns, and date-range slices are two binary searches that return
+views into the mapped arrays instead of re-parsing the CSV. Conversions are
+published as versioned directories (see :mod:`.store_dirs`), so concurrent
+runners never read a store that another one is replacing.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+from .store_dirs import current_version, new_version, publish_version, store_lock
+
+DAY_INDEX_FILE = "_days.npy"
+MANIFEST_FILE = "manifest.json"
+STORE_VERSION = 1
+
+
+def to_day_number(date_str: str) -> int:
+    """Convert a ``YYYY-MM-DD`` (or longer timestamp) string to days since the epoch."""
+    return int(np.datetime64(str(date_str)[:10], "D").astype(np.int64))
+
+
+def day_number_to_str(day: int) -> str:
+    """Inverse of :func:`to_day_number`."""
+    return str(np.datetime64(int(day), "D"))
+
+
+class PriceTable:
+    """Immutable view over a converted price table."""
+
+    def __init__(self, days: np.ndarray, columns: Dict[str, np.ndarray], column_order: List[str]):
+        self.days = days
+        self.columns = columns
+        self.column_order = column_order
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    def bounds(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[int, int]:
+        """Return the ``[lo, hi)`` row range covering ``start_date..end_date`` inclusive."""
+        lo = 0 if start_date is None else int(np.searchsorted(self.days, to_day_number(start_date), side="left"))
+        hi = len(self) if end_date is None else int(np.searchsorted(self.days, to_day_number(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def column(self, name: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> np.ndarray:
+        """Zero-copy view of one column restricted to a date range."""
+        lo, hi = self.bounds(start_date, end_date)
+        return self.columns[name][lo:hi]
+
+    def slice(self, start_date: Optional[str] = None, end_date: Optional[str] = None, keep_index: bool = False):
+        """Materialize a date range as a DataFrame with the original CSV column order.
+
+        ``keep_index`` preserves the row numbers of the source CSV, matching a
+        boolean-mask filter on the full frame.
+        """
+        import pandas as pd
+
+        lo, hi = self.bounds(start_date, end_date)
+        data = {name: self.columns[name][lo:hi] for name in self.column_order}
+        index = pd.RangeIndex(lo, hi) if keep_index else None
+        frame = pd.DataFrame(data, index=index)
+        for name in self.column_order:
+            if frame[name].dtype.kind == "U":
+                frame[name] = frame[name].astype(object)
+        return frame
+
+    def to_frame(self):
+        """Materialize the whole table as a DataFrame."""
+        return self.slice()
+
+
+def _source_fingerprint(source_path: str) -> Dict[str, float]:
+    stat = os.stat(source_path)
+    return {"source_mtime": stat.st_mtime, "source_size": stat.st_size}
+
+
+def _current_store(store_dir: str) -> Tuple[Optional[str], Optional[Dict]]:
+    version_dir = current_version(store_dir)
+    return version_dir, read_manifest(version_dir) if version_dir else None
+
+
+def _is_current(manifest: Optional[Dict], fingerprint: Dict[str, float]) -> bool:
+    return manifest is not None and all(manifest.get(key) == value for key, value in fingerprint.items())
+
+
+def _store_dir_for(source_path: str, cache_root: str) -> str:
+    absolute = os.path.abspath(source_path)
+    digest = hashlib.sha1(absolute.encode("utf-8")).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(absolute))[0]
+    return os.path.join(cache_root, f"{stem}-{digest}")
+
+
+def _column_array(series) -> np.ndarray:
+    values = series.to_numpy()
+    if values.dtype.kind in "biuf":
+        return np.ascontiguousarray(values)
+    return np.asarray(series.astype(str).to_numpy(), dtype=str)
+
+
+def write_table(frame, store_dir: str, date_column: str = "Date", extra_manifest: Optional[Dict] = None) -> str:
+    """Persist a DataFrame as a new version of the columnar store ``store_dir``.
+
+    The columns are written to a fresh version directory that is published once
+    complete. Call under :func:`~.store_dirs.store_lock`. Returns the version
+    directory.
+    """
+    date_strings = frame[date_column].astype(str).str[:10].to_numpy()
+    days = date_strings.astype("datetime64[D]").astype(np.int64)
+    order = np.argsort(days, kind="stable")
+    frame = frame.iloc[order].reset_index(drop=True)
+    days = days[order]
+
+    version_dir = new_version(store_dir)
+    np.save(os.path.join(version_dir, DAY_INDEX_FILE), days)
+    columns_meta = []
+    for position, name in enumerate(frame.columns):
+        filename = f"col_{position}.npy"
+        np.save(os.path.join(version_dir, filename), _column_array(frame[name]))
+        columns_meta.append({"name": str(name), "file": filename})
+
+    manifest = {
+        "version": STORE_VERSION,
+        "rows": int(len(frame)),
+        "columns": columns_meta,
+        **(extra_manifest or {}),
+    }
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle)
+
+    publish_version(store_dir, version_dir)
+    return version_dir
+
+
+def read_manifest(store_dir: str) -> Optional[Dict]:
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != STORE_VERSION:
+        return None
+    return manifest
+
+
+def open_table(store_dir: str, manifest: Optional[Dict] = None) -> PriceTable:
+    """Memory-map one version directory of a converted store."""
+    manifest = manifest or read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No price store found at {store_dir}")
+
+    days = np.load(os.path.join(store_dir, DAY_INDEX_FILE), mmap_mode="r")
+    columns: Dict[str, np.ndarray] = {}
+    order: List[str] = []
+    for meta in manifest["columns"]:
+        columns[meta["name"]] = np.load(os.path.join(store_dir, meta["file"]), mmap_mode="r")
+        order.append(meta["name"])
+    return PriceTable(days, columns, order)
+
+
+_tables: Dict[str, Tuple[Tuple[float, float], PriceTable]] = {}
+_tables_lock = threading.Lock()
+
+
+def load_price_table(source_path: str, cache_root: Optional[str] = None, date_column: str = "Date") -> PriceTable:
+    """Return the columnar table for a price CSV, converting it on first use.
+
+    Conversions are reused across processes (on disk) and within a process
+    (memoized by source mtime/size), and rebuilt when the CSV changes.
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+
+    fingerprint = _source_fingerprint(source_path)
+    fingerprint_key = (fingerprint["source_mtime"], fingerprint["source_size"])
+    absolute = os.path.abspath(source_path)
+
+    with _tables_lock:
+        cached = _tables.get(absolute)
+        if cached is not None and cached[0] == fingerprint_key:
+            return cached[1]
+
+        if cache_root is None:
+            cache_root = os.path.join(get_config().get("data_cache_dir", "data_cache"), "price_store")
+        store_dir = _store_dir_for(absolute, cache_root)
+
+        version_dir, manifest = _current_store(store_dir)
+        if not _is_current(manifest, fingerprint):
+            with store_lock(store_dir):
+                # Another process may have converted the CSV while this one waited
+                version_dir, manifest = _current_store(store_dir)
+                if not _is_current(manifest, fingerprint):
+                    import pandas as pd
+
+                    frame = pd.read_csv(absolute)
+                    version_dir = write_table(
+                        frame, store_dir, date_column=date_column, extra_manifest={"source": absolute, **fingerprint}
+                    )
+                    manifest = None
+
+        table = open_table(version_dir, manifest)
+        _tables[absolute] = (fingerprint_key, table)
+        return table
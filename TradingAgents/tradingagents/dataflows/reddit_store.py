@@ -0,0 +1,239 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Date-partitioned index over the Reddit JSONL dumps.
+
+Each category directory (``reddit_data/<category>/*.jsonl``, one file per
+subreddit) is ingested once into a store directory holding:
+
+- ``posts.jsonl``: only the fields the news tools use (title, selftext, url,
+  ups, created_utc), sorted by UTC day, then subreddit, then upvotes;
+- ``_days.npy`` / ``_subs.npy``: the day number and subreddit of every row;
+- ``_offsets.npy``: the byte offset of every row in ``posts.jsonl``;
+- with an entity matcher, ``_mention_rows.npy`` / ``_mention_offsets.npy``: an
+  inverted index from ticker (``manifest["mention_tickers"]``) to the sorted
+  ids of the rows whose title or selftext mentions it.
+
+A date-range query is two binary searches on the day index and one seek and
+read of exactly the matching rows, instead of parsing every post in the
+category once per day; a company-mention query intersects the ticker's row
+ids with that range and reads only those rows. The store is rebuilt when a
+source file is added, removed or modified, or the matcher's universe changes.
+Stores are published as versioned directories (see :mod:`.store_dirs`).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+from .entity_matcher import EntityMatcher
+from .price_store import day_number_to_str, to_day_number
+from .store_dirs import current_version, new_version, publish_version, store_lock
+
+STORE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+POSTS_FILE = "posts.jsonl"
+_FIELDS = ("title", "selftext", "url", "ups", "created_utc")
+
+
+def _source_manifest(category_dir: str, matcher: Optional[EntityMatcher] = None) -> Dict:
+    entries = os.listdir(category_dir)
+    files = []
+    for name in entries:
+        if not name.endswith(".jsonl"):
+            continue
+        stat = os.stat(os.path.join(category_dir, name))
+        files.append({"name": name, "mtime": stat.st_mtime, "size": stat.st_size})
+    # ``files`` keeps listdir order: it decides the subreddit order within a day.
+    return {
+        "entry_count": len(entries),
+        "files": files,
+        "entities": matcher.fingerprint if matcher is not None else None,
+    }
+
+
+class RedditStore:
+    """Read-only view over one ingested category."""
+
+    def __init__(self, store_dir: str, manifest: Dict):
+        self.store_dir = store_dir
+        self.manifest = manifest
+        self.subreddits: List[str] = [entry["name"] for entry in manifest["files"]]
+        self.days = np.load(os.path.join(store_dir, "_days.npy"), mmap_mode="r")
+        self.subs = np.load(os.path.join(store_dir, "_subs.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(store_dir, "_offsets.npy"), mmap_mode="r")
+        self.mention_tickers: Dict[str, int] = {
+            ticker: index for index, ticker in enumerate(manifest.get("mention_tickers") or [])
+        }
+        if self.mention_tickers:
+            self.mention_rows = np.load(os.path.join(store_dir, "_mention_rows.npy"), mmap_mode="r")
+            self.mention_offsets = np.load(os.path.join(store_dir, "_mention_offsets.npy"), mmap_mode="r")
+
+    @property
+    def entry_count(self) -> int:
+        """Number of directory entries in the source category (as ``os.listdir`` saw them)."""
+        return int(self.manifest["entry_count"])
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    def bounds(self, start_date: str, end_date: str) -> Tuple[int, int]:
+        lo = int(np.searchsorted(self.days, to_day_number(start_date), side="left"))
+        hi = int(np.searchsorted(self.days, to_day_number(end_date), side="right"))
+        return lo, max(lo, hi)
+
+    def _decode(self, row: int, line: bytes) -> Dict:
+        post = json.loads(line)
+        post["posted_date"] = day_number_to_str(int(self.days[row]))
+        post["subreddit"] = self.subreddits[int(self.subs[row])]
+        return post
+
+    def rows(self, lo: int, hi: int) -> List[Dict]:
+        """Decode rows ``[lo, hi)`` with a single seek and read."""
+        if hi <= lo:
+            return []
+        start, end = int(self.offsets[lo]), int(self.offsets[hi])
+        with open(os.path.join(self.store_dir, POSTS_FILE), "rb") as handle:
+            handle.seek(start)
+            blob = handle.read(end - start)
+        return [self._decode(row, line) for row, line in zip(range(lo, hi), blob.splitlines())]
+
+    def rows_at(self, row_ids: Iterable[int]) -> List[Dict]:
+        """Decode the given (ascending) row ids, one seek per row."""
+        posts = []
+        with open(os.path.join(self.store_dir, POSTS_FILE), "rb") as handle:
+            for row in row_ids:
+                row = int(row)
+                start = int(self.offsets[row])
+                handle.seek(start)
+                posts.append(self._decode(row, handle.read(int(self.offsets[row + 1]) - start)))
+        return posts
+
+    def mentions(self, ticker: str, start_date: str, end_date: str) -> List[Dict]:
+        """Posts in the date range that mention ``ticker``, in :meth:`posts` order."""
+        index = self.mention_tickers.get(ticker.upper())
+        if index is None:
+            return []
+        ids = self.mention_rows[int(self.mention_offsets[index]) : int(self.mention_offsets[index + 1])]
+        lo, hi = self.bounds(start_date, end_date)
+        first, last = np.searchsorted(ids, lo, side="left"), np.searchsorted(ids, hi, side="left")
+        return self.rows_at(ids[first:last])
+
+    def posts(self, start_date: str, end_date: str) -> List[Dict]:
+        """All posts from ``start_date`` to ``end_date`` inclusive, ordered by day, subreddit, upvotes."""
+        return self.rows(*self.bounds(start_date, end_date))
+
+
+def build_store(category_dir: str, store_dir: str, manifest: Dict, matcher: Optional[EntityMatcher] = None) -> str:
+    """Ingest every subreddit file of a category into a new version of ``store_dir``.
+
+    Call under :func:`~.store_dirs.store_lock`. Returns the version directory.
+    """
+    records: List[Tuple[int, int, float, int, bytes, Tuple[str, ...]]] = []
+    for sub_index, entry in enumerate(manifest["files"]):
+        with open(os.path.join(category_dir, entry["name"]), "rb") as handle:
+            for line_no, line in enumerate(handle):
+                if not line.strip():
+                    continue
+                parsed = json.loads(line)
+                compact = {field: parsed.get(field) for field in _FIELDS}
+                day = int(float(compact["created_utc"]) // 86400)
+                encoded = json.dumps(compact, ensure_ascii=False).encode("utf-8")
+                mentioned = tuple(matcher.find(compact["title"], compact["selftext"])) if matcher is not None else ()
+                records.append((day, sub_index, -float(compact["ups"] or 0), line_no, encoded, mentioned))
+    # Upvotes descending with source order on ties, matching the per-file stable sort of the old scan.
+    records.sort(key=lambda record: record[:4])
+
+    version_dir = new_version(store_dir)
+
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    with open(os.path.join(version_dir, POSTS_FILE), "wb") as handle:
+        position = 0
+        for index, record in enumerate(records):
+            handle.write(record[4] + b"\n")
+            position += len(record[4]) + 1
+            offsets[index + 1] = position
+    np.save(os.path.join(version_dir, "_days.npy"), np.array([r[0] for r in records], dtype=np.int64))
+    np.save(os.path.join(version_dir, "_subs.npy"), np.array([r[1] for r in records], dtype=np.int32))
+    np.save(os.path.join(version_dir, "_offsets.npy"), offsets)
+
+    extra: Dict = {}
+    if matcher is not None:
+        postings: Dict[str, List[int]] = {}
+        for row, record in enumerate(records):
+            for ticker in record[5]:
+                postings.setdefault(ticker, []).append(row)
+        tickers = sorted(postings)
+        mention_offsets = np.zeros(len(tickers) + 1, dtype=np.int64)
+        mention_offsets[1:] = np.cumsum([len(postings[ticker]) for ticker in tickers])
+        mention_rows = np.array([row for ticker in tickers for row in postings[ticker]], dtype=np.int64)
+        np.save(os.path.join(version_dir, "_mention_rows.npy"), mention_rows)
+        np.save(os.path.join(version_dir, "_mention_offsets.npy"), mention_offsets)
+        extra["mention_tickers"] = tickers
+
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w", encoding="utf-8") as handle:
+        json.dump({"version": STORE_VERSION, "source": os.path.abspath(category_dir), **manifest, **extra}, handle)
+
+    publish_version(store_dir, version_dir)
+    return version_dir
+
+
+def _read_manifest(store_dir: Optional[str]) -> Optional[Dict]:
+    if store_dir is None:
+        return None
+    try:
+        with open(os.path.join(store_dir, MANIFEST_FILE), "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == STORE_VERSION else None
+
+
+_stores: Dict[str, Tuple[Dict, RedditStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def load_reddit_store(
+    category_dir: str,
+    cache_root: Optional[str] = None,
+    matcher: Optional[EntityMatcher] = None,
+) -> RedditStore:
+    """Return the index for a category directory, ingesting it on first use or after changes.
+
+    With ``matcher`` the store also carries the ticker -> row ids mention index
+    for the matcher's universe.
+    """
+    absolute = os.path.abspath(category_dir)
+    source = _source_manifest(absolute, matcher)
+
+    with _stores_lock:
+        cached = _stores.get(absolute)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+
+        if cache_root is None:
+            cache_root = os.path.join(get_config().get("data_cache_dir", "data_cache"), "reddit_store")
+        digest = hashlib.sha1(absolute.encode("utf-8")).hexdigest()[:10]
+        store_dir = os.path.join(cache_root, f"{os.path.basename(absolute)}-{digest}")
+
+        version_dir = current_version(store_dir)
+        manifest = _read_manifest(version_dir)
+        if manifest is None or {key: manifest.get(key) for key in source} != source:
+            with store_lock(store_dir):
+                # Another process may have ingested the category while this one waited
+                version_dir = current_version(store_dir)
+                manifest = _read_manifest(version_dir)
+                if manifest is None or {key: manifest.get(key) for key in source} != source:
+                    version_dir = build_store(absolute, store_dir, source, matcher)
+                    manifest = _read_manifest(version_dir)
+
+        store = RedditStore(version_dir, manifest)
+        _stores[absolute] = (source, store)
+        return store
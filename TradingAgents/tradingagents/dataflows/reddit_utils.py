@@ -1,11 +1,18 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 import requests
 import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, Tuple
 import os
-import re
+
+from .entity_matcher import EntityMatcher, get_entity_matcher
+from .reddit_store import load_reddit_store
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +56,77 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from."],
+    end_date: Annotated[str, "Last date to fetch top posts from (inclusive)."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
-
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    """Top posts per subreddit for every day in a range, read from the date index.
+
+    Returns the same posts, in the same order, as calling
+    :func:`fetch_top_from_category` once per day and concatenating the results.
+    For company news, posts come from the store's ticker mention index; a
+    ticker outside the configured universe is matched on its symbol alone.
+    """
+    company_query = query if "company" in category and query else None
+    matcher = get_entity_matcher() if company_query else None
+    store = load_reddit_store(os.path.join(data_path, category), matcher=matcher)
+
+    if max_limit < store.entry_count:
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // store.entry_count
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
+    all_content = []
+    taken: Dict[Tuple[str, str], int] = {}
+    if company_query is None:
+        posts = store.posts(start_date, end_date)
+    elif company_query in matcher:
+        posts = store.mentions(company_query, start_date, end_date)
+    else:
+        symbol = EntityMatcher({company_query: []})
+        posts = [post for post in store.posts(start_date, end_date) if symbol.find(post["title"], post["selftext"])]
+
+    # Rows arrive ordered by day, subreddit and upvotes (descending).
+    for post in posts:
+        key = (post["posted_date"], post["subreddit"])
+        if taken.get(key, 0) >= limit_per_subreddit:
             continue
+        taken[key] = taken.get(key, 0) + 1
+
+        all_content.append(
+            {
+                "title": post["title"],
+                "content": post["selftext"],
+                "url": post["url"],
+                "upvotes": post["ups"],
+                "posted_date": post["posted_date"],
+            }
+        )
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    return all_content
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
-    return all_content
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(category, date, date, max_limit, query, data_path)
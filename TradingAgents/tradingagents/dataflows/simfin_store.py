@@ -0,0 +1,152 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Per-ticker partitions of the SimFin bulk statement CSVs with as-of lookup.
+
+Each ``us-<statement>-<freq>.csv`` (every US company in one file) is converted
+once into a store directory holding, per ticker, a pickled frame of its rows
+(dates already parsed and normalized, sorted by publish date) and an ``int64``
+array of publish days. An as-of query loads one small partition on first use
+and binary-searches its publish days, instead of parsing the whole CSV and
+its date columns on every call. Stores are published as versioned directories
+(see :mod:`.store_dirs`), like the price store.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+from .price_store import to_day_number
+from .store_dirs import current_version, new_version, publish_version, store_lock
+
+STORE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class SimfinStatements:
+    """Read-only view over one converted statement file."""
+
+    def __init__(self, store_dir: str, manifest: Dict):
+        self.store_dir = store_dir
+        self.partitions: Dict[str, str] = manifest["partitions"]
+        self._loaded: Dict[str, Tuple[np.ndarray, object]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.partitions
+
+    def _partition(self, ticker: str):
+        with self._lock:
+            loaded = self._loaded.get(ticker)
+        if loaded is not None:
+            return loaded
+        import pandas as pd
+
+        stem = os.path.join(self.store_dir, self.partitions[ticker])
+        loaded = (np.load(f"{stem}.npy"), pd.read_pickle(f"{stem}.pkl"))
+        with self._lock:
+            self._loaded[ticker] = loaded
+        return loaded
+
+    def as_of(self, ticker: str, date: str):
+        """Latest statement row (a Series) published on or before ``date``, or None.
+
+        Ties on the publish date resolve to the row that came first in the CSV.
+        """
+        if ticker not in self.partitions:
+            return None
+        days, frame = self._partition(ticker)
+        hi = int(np.searchsorted(days, to_day_number(date), side="right"))
+        if hi == 0:
+            return None
+        first = int(np.searchsorted(days, days[hi - 1], side="left"))
+        return frame.iloc[first]
+
+
+def build_store(source_path: str, store_dir: str, fingerprint: Dict) -> str:
+    """Split a SimFin statement CSV into per-ticker partitions in a new version of ``store_dir``.
+
+    Call under :func:`~.store_dirs.store_lock`. Returns the version directory.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(source_path, sep=";")
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    df = df[df["Publish Date"].notna()]
+
+    version_dir = new_version(store_dir)
+
+    partitions: Dict[str, str] = {}
+    for index, (ticker, rows) in enumerate(df.groupby("Ticker", sort=True)):
+        rows = rows.sort_values("Publish Date", kind="stable")
+        days = rows["Publish Date"].dt.tz_localize(None).to_numpy().astype("datetime64[D]").astype(np.int64)
+        name = f"part-{index:05d}"
+        np.save(os.path.join(version_dir, f"{name}.npy"), days)
+        rows.to_pickle(os.path.join(version_dir, f"{name}.pkl"))
+        partitions[str(ticker)] = name
+
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w", encoding="utf-8") as handle:
+        json.dump({"version": STORE_VERSION, "source": os.path.abspath(source_path), **fingerprint, "partitions": partitions}, handle)
+
+    publish_version(store_dir, version_dir)
+    return version_dir
+
+
+def _read_manifest(store_dir: Optional[str]) -> Optional[Dict]:
+    if store_dir is None:
+        return None
+    try:
+        with open(os.path.join(store_dir, MANIFEST_FILE), "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == STORE_VERSION else None
+
+
+_stores: Dict[str, Tuple[Tuple[float, int], SimfinStatements]] = {}
+_stores_lock = threading.Lock()
+
+
+def load_simfin_statements(source_path: str, cache_root: Optional[str] = None) -> SimfinStatements:
+    """Return the partitioned store for a SimFin CSV, converting it on first use or after changes."""
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+
+    absolute = os.path.abspath(source_path)
+    stat = os.stat(absolute)
+    fingerprint = {"source_mtime": stat.st_mtime, "source_size": stat.st_size}
+    fingerprint_key = (stat.st_mtime, stat.st_size)
+
+    with _stores_lock:
+        cached = _stores.get(absolute)
+        if cached is not None and cached[0] == fingerprint_key:
+            return cached[1]
+
+        if cache_root is None:
+            cache_root = os.path.join(get_config().get("data_cache_dir", "data_cache"), "simfin_store")
+        digest = hashlib.sha1(absolute.encode("utf-8")).hexdigest()[:10]
+        stem = os.path.splitext(os.path.basename(absolute))[0]
+        store_dir = os.path.join(cache_root, f"{stem}-{digest}")
+
+        version_dir = current_version(store_dir)
+        manifest = _read_manifest(version_dir)
+        if manifest is None or {key: manifest.get(key) for key in fingerprint} != fingerprint:
+            with store_lock(store_dir):
+                # Another process may have converted the CSV while this one waited
+                version_dir = current_version(store_dir)
+                manifest = _read_manifest(version_dir)
+                if manifest is None or {key: manifest.get(key) for key in fingerprint} != fingerprint:
+                    version_dir = build_store(absolute, store_dir, fingerprint)
+                    manifest = _read_manifest(version_dir)
+
+        store = SimfinStatements(version_dir, manifest)
+        _stores[absolute] = (fingerprint_key, store)
+        return store
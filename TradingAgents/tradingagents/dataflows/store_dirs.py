@@ -0,0 +1,93 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Versioned store directories shared by the converted CSV stores.
+
+A conversion is written to a fresh ``<store_dir>.v-<token>`` directory and
+published by atomically replacing the ``<store_dir>.current`` pointer file, so
+readers in any process see either the previous complete version or the new
+one, never a directory being deleted or half written. Conversions of one store
+are serialized with :func:`store_lock` (``flock`` where available), so
+concurrent first uses convert once and the rest reuse the winner's version.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+POINTER_SUFFIX = ".current"
+LOCK_SUFFIX = ".lock"
+VERSION_MARKER = ".v-"
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` across processes, where ``fcntl`` exists."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def store_lock(store_dir: str):
+    """Serialize conversions of ``store_dir`` across processes."""
+    return file_lock(f"{store_dir}{LOCK_SUFFIX}")
+
+
+def current_version(store_dir: str) -> Optional[str]:
+    """Directory of the published version of ``store_dir``, or None."""
+    try:
+        with open(f"{store_dir}{POINTER_SUFFIX}", "r", encoding="utf-8") as handle:
+            name = handle.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(os.path.dirname(store_dir), name)
+    return path if name and os.path.isdir(path) else None
+
+
+def new_version(store_dir: str) -> str:
+    """Create an empty, uniquely named directory for the next version of ``store_dir``."""
+    parent = os.path.dirname(store_dir) or "."
+    os.makedirs(parent, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"{os.path.basename(store_dir)}{VERSION_MARKER}", dir=parent)
+
+
+def publish_version(store_dir: str, version_dir: str) -> None:
+    """Point ``store_dir`` at the complete ``version_dir`` and drop older versions.
+
+    Call it while holding :func:`store_lock`, so no other writer's version is
+    still being built. The version being replaced is kept, since readers that
+    resolved the pointer just before the swap may still be opening its files.
+    """
+    previous = current_version(store_dir)
+    pointer = f"{store_dir}{POINTER_SUFFIX}"
+    tmp_path = f"{pointer}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(os.path.basename(version_dir))
+    os.replace(tmp_path, pointer)
+
+    parent = os.path.dirname(store_dir) or "."
+    prefix = f"{os.path.basename(store_dir)}{VERSION_MARKER}"
+    keep = {os.path.abspath(version_dir), os.path.abspath(previous) if previous else None}
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if name.startswith(prefix) and os.path.abspath(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+    # Unversioned layout written by earlier releases
+    shutil.rmtree(store_dir, ignore_errors=True)
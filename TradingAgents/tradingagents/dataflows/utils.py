@@ -1,11 +1,21 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 import os
 import json
 import pandas as pd
 from datetime import date, timedelta, datetime
-from typing import Annotated
+from typing import Annotated, Iterable, List, Sequence, Tuple
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
+
+class UnsupportedArgumentError(ValueError):
+    """A vendor function rejected its arguments (e.g. an unknown indicator) before any request."""
+
+
 def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) -> None:
     if save_path:
         data.to_csv(save_path)
@@ -37,3 +47,34 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+def dedupe_indicators(indicators) -> List[str]:
+    """Indicator names from a list (or comma-separated string), stripped, lowercased, first occurrence kept."""
+    if isinstance(indicators, str):
+        indicators = indicators.split(",")
+    names: List[str] = []
+    for name in indicators:
+        name = str(name).strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def format_indicator_table(
+    symbol: str,
+    indicators: Sequence[str],
+    start_date: str,
+    end_date: str,
+    rows: Iterable[Tuple[str, Sequence[str]]],
+    notes: Sequence[str] = (),
+) -> str:
+    """One CSV table of several indicator windows, a row per trading day (oldest first)."""
+    lines = [",".join(["date", *indicators])]
+    lines.extend(",".join([day, *values]) for day, values in rows)
+    if len(lines) == 1:
+        lines.append("No data available for the specified date range.")
+    result = f"## {symbol.upper()} technical indicators from {start_date} to {end_date} (trading days):\n\n" + "\n".join(lines)
+    if notes:
+        result += "\n\n" + "\n".join(notes)
+    return result
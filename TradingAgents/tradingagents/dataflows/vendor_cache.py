@@ -0,0 +1,275 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Persistent, TTL-aware cache for vendor responses dispatched by ``route_to_vendor``.
+
+Entries are keyed on ``(method, vendor, implementation, normalized arguments)`` and
+stored in a single SQLite file so that every analyst, run and process on the host
+shares the same responses. Expiry is category based: historical price data never
+expires, while news and fundamentals are refreshed after a configurable period.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import get_config
+
+# Seconds before an entry expires, per tool category. ``None`` means the entry never expires.
+DEFAULT_CATEGORY_TTLS: Dict[str, Optional[int]] = {
+    "core_stock_apis": None,
+    "technical_indicators": None,
+    "fundamental_data": 3 * 24 * 60 * 60,
+    "news_data": 15 * 60,
+}
+
+# Requests whose date arguments reach today are still moving, even for price data.
+LIVE_DATA_TTL = 15 * 60
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ERROR_MARKERS = ("Error Message", "Error retrieving", "Error getting", "Error:")
+# "No data found for symbol ...", "No balance sheet data found ...": the vendor had nothing for a
+# request that should have data, which is as likely transient as an error
+_NO_DATA_PATTERN = re.compile(r"\bNo (?:[A-Za-z]+ )*data found\b")
+# Valid but empty answers (e.g. an indicator window without trading days) are cached only briefly,
+# since categories like core_stock_apis otherwise never expire
+_EMPTY_MARKERS = ("No data available",)
+EMPTY_RESULT_TTL = LIVE_DATA_TTL
+
+
+def _normalize_value(value: Any) -> Any:
+    """Reduce an argument to a stable, JSON-friendly representation."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize_value(val) for key, val in sorted(value.items())}
+    return str(value)
+
+
+def normalize_arguments(func: Callable, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """Bind call arguments to ``func``'s signature so positional/keyword/default forms match."""
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except (TypeError, ValueError):
+        arguments = {"args": list(args), **kwargs}
+    return {key: _normalize_value(value) for key, value in arguments.items()}
+
+
+def _looks_like_error(result: Any) -> bool:
+    """Vendors sometimes return error text instead of raising; never cache those."""
+    if result is None:
+        return True
+    if isinstance(result, str):
+        stripped = result.strip()
+        if not stripped:
+            return True
+        head = stripped[:200]
+        return any(marker in head for marker in _ERROR_MARKERS) or _NO_DATA_PATTERN.search(head) is not None
+    empty = getattr(result, "empty", None)
+    return empty is True
+
+
+def _looks_empty(result: Any) -> bool:
+    return isinstance(result, str) and any(marker in result for marker in _EMPTY_MARKERS)
+
+
+class VendorCache:
+    """SQLite-backed response cache with per-category TTLs and hit/miss counters."""
+
+    def __init__(self, path: str, category_ttls: Optional[Dict[str, Optional[int]]] = None):
+        self.path = path
+        self.category_ttls = dict(DEFAULT_CATEGORY_TTLS)
+        if category_ttls:
+            self.category_ttls.update(category_ttls)
+
+        self._lock = threading.Lock()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vendor_responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                vendor TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                value BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, vendor: str, func: Callable, args: tuple, kwargs: dict) -> str:
+        """Build a stable cache key for one vendor implementation call."""
+        payload = json.dumps(
+            {
+                "method": method,
+                "vendor": vendor,
+                "impl": getattr(func, "__qualname__", getattr(func, "__name__", repr(func))),
+                "arguments": normalize_arguments(func, args, kwargs),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, category: str, arguments: Dict[str, Any]) -> Optional[int]:
+        """Resolve the TTL for a call, shortening it when the requested range touches today."""
+        ttl = self.category_ttls.get(category, LIVE_DATA_TTL)
+        today = date.today().isoformat()
+        touches_today = any(
+            isinstance(value, str) and _DATE_PATTERN.match(value) and value >= today
+            for value in arguments.values()
+        )
+        if touches_today:
+            return LIVE_DATA_TTL if ttl is None else min(ttl, LIVE_DATA_TTL)
+        return ttl
+
+    def get(self, key: str, method: str) -> Tuple[bool, Any]:
+        """Return ``(hit, value)`` for a key, evicting it if it has expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM vendor_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] is not None and row[0] <= now:
+                self._conn.execute("DELETE FROM vendor_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self._misses[method] += 1
+                return False, None
+
+        try:
+            value = pickle.loads(row[1])
+        except Exception:
+            with self._lock:
+                self._misses[method] += 1
+            return False, None
+
+        with self._lock:
+            self._hits[method] += 1
+        return True, value
+
+    def set(self, key: str, method: str, vendor: str, value: Any, ttl: Optional[int]) -> bool:
+        """Store a response; error-looking payloads are skipped. Returns True when stored."""
+        if _looks_like_error(value):
+            return False
+        if _looks_empty(value):
+            ttl = EMPTY_RESULT_TTL if ttl is None else min(ttl, EMPTY_RESULT_TTL)
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vendor_responses (key, method, vendor, created_at, expires_at, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, method, vendor, now, expires_at, sqlite3.Binary(blob)),
+            )
+            self._conn.commit()
+        return True
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM vendor_responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM vendor_responses")
+            self._conn.commit()
+            self._hits.clear()
+            self._misses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters overall and per method."""
+        with self._lock:
+            methods = sorted(set(self._hits) | set(self._misses))
+            by_method = {
+                method: {"hits": self._hits[method], "misses": self._misses[method]}
+                for method in methods
+            }
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            entries = self._conn.execute("SELECT COUNT(*) FROM vendor_responses").fetchone()[0]
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "entries": entries,
+            "by_method": by_method,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache_instance: Optional[VendorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vendor_cache() -> Optional[VendorCache]:
+    """Return the process-wide cache for the active config, or None when disabled."""
+    global _cache_instance
+
+    config = get_config()
+    if not config.get("vendor_cache_enabled", False):
+        return None
+
+    path = config.get("vendor_cache_path") or os.path.join(
+        config.get("data_cache_dir", "data_cache"), "vendor_cache.sqlite3"
+    )
+    ttls = config.get("vendor_cache_ttls") or {}
+
+    with _cache_lock:
+        if _cache_instance is None or _cache_instance.path != path:
+            if _cache_instance is not None:
+                _cache_instance.close()
+            _cache_instance = VendorCache(path, ttls)
+        else:
+            _cache_instance.category_ttls.update(ttls)
+        return _cache_instance
+
+
+def get_vendor_cache_stats() -> Dict[str, Any]:
+    """Convenience accessor for hit/miss counters (empty when caching is disabled)."""
+    cache = get_vendor_cache()
+    if cache is None:
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0, "by_method": {}}
+    return cache.stats()
@@ -0,0 +1,173 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Per-``(method, vendor)`` health and circuit breakers for ``route_to_vendor``.
+
+Every vendor call that reaches the network is recorded as a success or failure
+with its latency, over a rolling window of the last ``WINDOW`` calls. A circuit
+opens after ``failure_threshold`` consecutive failures, or when at least
+``ERROR_RATE`` of a half-full window failed, and the vendor is then skipped for
+that method for ``cooldown`` seconds. Next, one probe call is let through
+(half-open): success closes the circuit, failure reopens it with the cooldown
+doubled, up to ``MAX_COOLDOWN``.
+
+:meth:`VendorHealth.order` keeps the configured primary vendors first and sorts
+the fallbacks by mean latency, so an outage of the primary is served by the
+fastest healthy fallback instead of by a failed round-trip on every call.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .config import get_config
+
+WINDOW = 20
+ERROR_RATE = 0.5
+MAX_COOLDOWN = 900.0
+# Successful calls needed before a vendor's latency is used for ordering
+MIN_LATENCY_SAMPLES = 3
+
+
+class _Circuit:
+    def __init__(self):
+        self.outcomes: Deque[Tuple[bool, float]] = deque(maxlen=WINDOW)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.cooldown = 0.0
+        self.probe_at: Optional[float] = None
+
+    def mean_latency(self) -> Optional[float]:
+        latencies = [latency for ok, latency in self.outcomes if ok]
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return sum(latencies) / len(latencies)
+
+
+class VendorHealth:
+    """Rolling latency/error statistics and a circuit breaker per (method, vendor)."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_cooldown = max(0.0, float(cooldown))
+        self._clock = clock
+        self._circuits: Dict[Tuple[str, str], _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, method: str, vendor: str) -> _Circuit:
+        circuit = self._circuits.get((method, vendor))
+        if circuit is None:
+            circuit = self._circuits[(method, vendor)] = _Circuit()
+        return circuit
+
+    def _state(self, circuit: _Circuit, now: float) -> str:
+        if circuit.opened_at is None:
+            return "closed"
+        return "open" if now - circuit.opened_at < circuit.cooldown else "half_open"
+
+    def order(self, method: str, vendors: Sequence[str], primary: Sequence[str]) -> List[str]:
+        """``vendors`` with the configured primaries first, then fallbacks fastest first."""
+        with self._lock:
+            latency = {
+                vendor: self._circuits[(method, vendor)].mean_latency() if (method, vendor) in self._circuits else None
+                for vendor in vendors
+            }
+        primaries = [vendor for vendor in vendors if vendor in primary]
+        # Vendors without enough samples keep their configured position ahead of measured ones
+        fallbacks = sorted(
+            (vendor for vendor in vendors if vendor not in primary),
+            key=lambda vendor: latency[vendor] if latency[vendor] is not None else 0.0,
+        )
+        return primaries + fallbacks
+
+    def allow(self, method: str, vendor: str) -> bool:
+        """Whether to call ``vendor`` now; claims the single probe of a half-open circuit."""
+        with self._lock:
+            now = self._clock()
+            circuit = self._circuit(method, vendor)
+            state = self._state(circuit, now)
+            if state == "closed":
+                return True
+            if state == "open":
+                return False
+            # A probe that never reported back (e.g. served from cache) expires after one cooldown
+            if circuit.probe_at is not None and now - circuit.probe_at < circuit.cooldown:
+                return False
+            circuit.probe_at = now
+            return True
+
+    def record(self, method: str, vendor: str, ok: bool, latency: float) -> Optional[str]:
+        """Record one call outcome; returns "opened" or "closed" when the circuit changes state."""
+        with self._lock:
+            now = self._clock()
+            circuit = self._circuit(method, vendor)
+            circuit.outcomes.append((ok, latency))
+            circuit.probe_at = None
+            if ok:
+                circuit.consecutive_failures = 0
+                if circuit.opened_at is None:
+                    return None
+                circuit.opened_at, circuit.cooldown = None, 0.0
+                return "closed"
+
+            circuit.consecutive_failures += 1
+            if circuit.opened_at is not None:
+                # Failed probe: back off further
+                circuit.opened_at = now
+                circuit.cooldown = min(MAX_COOLDOWN, max(circuit.cooldown, self.base_cooldown) * 2)
+                return "opened"
+            failures = sum(1 for outcome, _ in circuit.outcomes if not outcome)
+            error_rate_tripped = (
+                len(circuit.outcomes) >= WINDOW // 2 and failures / len(circuit.outcomes) >= ERROR_RATE
+            )
+            if circuit.consecutive_failures >= self.failure_threshold or error_rate_tripped:
+                circuit.opened_at, circuit.cooldown = now, self.base_cooldown
+                return "opened"
+            return None
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Health per method and vendor, e.g. for monitoring."""
+        report: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            now = self._clock()
+            for (method, vendor), circuit in sorted(self._circuits.items()):
+                failures = sum(1 for ok, _ in circuit.outcomes if not ok)
+                latency = circuit.mean_latency()
+                state = self._state(circuit, now)
+                report.setdefault(method, {})[vendor] = {
+                    "state": state,
+                    "calls": len(circuit.outcomes),
+                    "error_rate": round(failures / len(circuit.outcomes), 3) if circuit.outcomes else 0.0,
+                    "mean_latency_seconds": round(latency, 3) if latency is not None else None,
+                    "retry_in_seconds": (
+                        round(max(0.0, circuit.opened_at + circuit.cooldown - now), 3) if state == "open" else 0.0
+                    ),
+                }
+        return report
+
+
+_health: Optional[VendorHealth] = None
+_health_key: Optional[Tuple] = None
+_health_lock = threading.Lock()
+
+
+def get_vendor_health() -> Optional[VendorHealth]:
+    """Return the process-wide registry for the configured breaker settings (None when disabled)."""
+    global _health, _health_key
+    config = get_config()
+    if not config.get("vendor_health_enabled", True):
+        return None
+    key = (int(config.get("vendor_circuit_failures", 5)), float(config.get("vendor_circuit_cooldown", 60)))
+    with _health_lock:
+        if _health is None or _health_key != key:
+            _health = VendorHealth(failure_threshold=key[0], cooldown=key[1])
+            _health_key = key
+        return _health
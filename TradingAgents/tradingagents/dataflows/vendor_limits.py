@@ -0,0 +1,172 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Process-wide per-vendor rate and concurrency limits for ``route_to_vendor``.
+
+Limits are configured as calls per minute under ``vendor_rate_limits`` (for
+example ``{"alpha_vantage": 75}``). Every thread in the process draws from the
+same token bucket per vendor, so batch runs with several workers stay within a
+vendor's quota without coordinating among themselves.
+
+``vendor_concurrency`` (for example ``{"alpha_vantage": 2}``) caps how many
+calls to a vendor may be in flight at once. Analyst tool calls run in parallel,
+so this keeps a burst of calls from one turn from tripping a vendor's limits.
+A call that has to wait (for a rate token, or for the cross-process quota via
+:func:`outside_vendor_slot`) does so without holding one of these slots.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping, Optional
+
+from .config import get_config
+
+
+class _TokenBucket:
+    def __init__(self, calls_per_minute: float):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1.0, float(calls_per_minute))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1.0
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class VendorRateLimiter:
+    """Token bucket and concurrency slots per vendor; vendors without a limit are never throttled."""
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, float]] = None,
+        concurrency: Optional[Mapping[str, int]] = None,
+    ):
+        self.limits: Dict[str, float] = {
+            vendor: float(rate) for vendor, rate in (limits or {}).items() if rate and float(rate) > 0
+        }
+        self.concurrency: Dict[str, int] = {
+            vendor: int(slots) for vendor, slots in (concurrency or {}).items() if slots and int(slots) > 0
+        }
+        self._buckets = {vendor: _TokenBucket(rate) for vendor, rate in self.limits.items()}
+        self._slots = {vendor: threading.BoundedSemaphore(slots) for vendor, slots in self.concurrency.items()}
+        # Vendors whose slot the current thread holds
+        self._held = threading.local()
+        self._lock = threading.Lock()
+        self._waited: Dict[str, float] = {}
+
+    def acquire(self, vendor: str) -> float:
+        """Block until a call to ``vendor`` is allowed; returns seconds waited."""
+        bucket = self._buckets.get(vendor)
+        if bucket is None:
+            return 0.0
+        with self._lock:
+            wait = bucket.reserve()
+            if wait > 0:
+                self._waited[vendor] = self._waited.get(vendor, 0.0) + wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    @contextmanager
+    def slot(self, vendor: str) -> Iterator[None]:
+        """Hold one of ``vendor``'s concurrent-call slots for the duration of a call."""
+        semaphore = self._slots.get(vendor)
+        if semaphore is None:
+            yield
+            return
+        semaphore.acquire()
+        held = self._held_vendors()
+        held.add(vendor)
+        try:
+            yield
+        finally:
+            if vendor in held:
+                held.discard(vendor)
+                semaphore.release()
+
+    @contextmanager
+    def released(self, vendor: str) -> Iterator[None]:
+        """Give up the calling thread's slot for ``vendor`` while it waits, then take it back."""
+        semaphore = self._slots.get(vendor)
+        held = self._held_vendors()
+        if semaphore is None or vendor not in held:
+            yield
+            return
+        held.discard(vendor)
+        semaphore.release()
+        try:
+            yield
+        finally:
+            semaphore.acquire()
+            held.add(vendor)
+
+    def _held_vendors(self) -> set:
+        held = getattr(self._held, "vendors", None)
+        if held is None:
+            held = self._held.vendors = set()
+        return held
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            report: Dict[str, Dict[str, float]] = {
+                vendor: {"calls_per_minute": rate, "seconds_waited": round(self._waited.get(vendor, 0.0), 3)}
+                for vendor, rate in self.limits.items()
+            }
+        for vendor, slots in self.concurrency.items():
+            report.setdefault(vendor, {})["max_concurrent"] = slots
+        return report
+
+
+_limiter: Optional[VendorRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_vendor_limiter() -> Optional[VendorRateLimiter]:
+    """Return the shared limiter for the configured limits (None when unset)."""
+    global _limiter
+    config = get_config()
+    limits = config.get("vendor_rate_limits") or {}
+    concurrency = config.get("vendor_concurrency") or {}
+    if not limits and not concurrency:
+        return None
+    with _limiter_lock:
+        configured = {vendor: float(rate) for vendor, rate in limits.items() if rate and float(rate) > 0}
+        slots = {vendor: int(count) for vendor, count in concurrency.items() if count and int(count) > 0}
+        if _limiter is None or _limiter.limits != configured or _limiter.concurrency != slots:
+            _limiter = VendorRateLimiter(configured, slots)
+        return _limiter
+
+
+@contextmanager
+def outside_vendor_slot(vendor: str) -> Iterator[None]:
+    """Run a wait (e.g. for shared quota) without holding the caller's concurrency slot."""
+    limiter = _limiter
+    if limiter is None:
+        yield
+        return
+    with limiter.released(vendor):
+        yield
+
+
+def parse_rate_limits(values) -> Dict[str, float]:
+    """Parse ``vendor=calls_per_minute`` strings (CLI flags or env lists)."""
+    limits: Dict[str, float] = {}
+    for value in values or []:
+        for item in str(value).split(","):
+            if not item.strip():
+                continue
+            vendor, _, rate = item.partition("=")
+            if not rate:
+                raise ValueError(f"Invalid vendor rate limit '{item}', expected vendor=calls_per_minute")
+            limits[vendor.strip()] = float(rate)
+    return limits
@@ -0,0 +1,197 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+"""Cross-process API quota governor.
+
+``vendor_limits`` paces the threads of one process; this module paces every
+process that shares an API key. Budgets are configured per vendor under
+``vendor_quotas`` (for example ``{"alpha_vantage": {"per_minute": 75,
+"per_day": 25}}``), and their state lives in one SQLite file
+(``<data_cache_dir>/vendor_quota.sqlite3``) updated in ``BEGIN IMMEDIATE``
+transactions, so concurrent runners draw from the same buckets:
+
+- ``per_minute``: a token bucket refilled continuously, holding up to one
+  minute of calls;
+- ``per_day``: calls counted per UTC day.
+
+Callers take a token before each request with :meth:`QuotaGovernor.acquire`,
+either waiting up to ``max_wait`` seconds for one or, with ``max_wait=0``,
+learning immediately that they should use a fallback vendor. When a vendor
+rejects a call anyway, :meth:`QuotaGovernor.penalize` blocks it for every
+process. :meth:`QuotaGovernor.remaining` reports what is left of each budget.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .config import get_config
+
+
+def _utc_day(now: float) -> str:
+    return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _seconds_to_next_utc_day(now: float) -> float:
+    current = datetime.fromtimestamp(now, timezone.utc)
+    midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(0.0, (midnight - current).total_seconds())
+
+
+class QuotaGovernor:
+    """Per-minute token buckets and per-day counters shared through SQLite."""
+
+    def __init__(self, path: str, budgets: Mapping[str, Mapping[str, Any]]):
+        self.path = path
+        self.budgets: Dict[str, Dict[str, Optional[float]]] = {
+            vendor: {
+                "per_minute": float(budget["per_minute"]) if budget.get("per_minute") else None,
+                "per_day": int(budget["per_day"]) if budget.get("per_day") else None,
+            }
+            for vendor, budget in budgets.items()
+            if budget and (budget.get("per_minute") or budget.get("per_day"))
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_state ("
+            "vendor TEXT PRIMARY KEY, tokens REAL NOT NULL, refilled_at REAL NOT NULL, "
+            "day TEXT NOT NULL, day_used INTEGER NOT NULL, blocked_until REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def _state(self, vendor: str, now: float) -> Tuple[float, str, int, float]:
+        """Current (tokens, day, day_used, blocked_until), refilled to ``now``."""
+        budget = self.budgets[vendor]
+        row = self._conn.execute(
+            "SELECT tokens, refilled_at, day, day_used, blocked_until FROM quota_state WHERE vendor = ?",
+            (vendor,),
+        ).fetchone()
+        per_minute = budget["per_minute"]
+        capacity = per_minute or 0.0
+        if row is None:
+            return capacity, _utc_day(now), 0, 0.0
+        tokens, refilled_at, day, day_used, blocked_until = row
+        if per_minute:
+            tokens = min(capacity, tokens + max(0.0, now - refilled_at) * per_minute / 60.0)
+        if day != _utc_day(now):
+            day, day_used = _utc_day(now), 0
+        return tokens, day, int(day_used), float(blocked_until)
+
+    def _save(self, vendor: str, now: float, tokens: float, day: str, day_used: int, blocked_until: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO quota_state (vendor, tokens, refilled_at, day, day_used, blocked_until) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (vendor, tokens, now, day, day_used, blocked_until),
+        )
+
+    def try_acquire(self, vendor: str) -> Tuple[bool, float]:
+        """Take one call from ``vendor``'s budgets if available.
+
+        Returns ``(granted, wait)`` where ``wait`` is how long until a call may
+        be granted (0 when granted).
+        """
+        budget = self.budgets.get(vendor)
+        if budget is None:
+            return True, 0.0
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, day, day_used, blocked_until = self._state(vendor, now)
+                if blocked_until > now:
+                    granted, wait = False, blocked_until - now
+                elif budget["per_day"] and day_used >= budget["per_day"]:
+                    granted, wait = False, _seconds_to_next_utc_day(now)
+                elif budget["per_minute"] and tokens < 1.0:
+                    granted, wait = False, (1.0 - tokens) * 60.0 / budget["per_minute"]
+                else:
+                    granted, wait = True, 0.0
+                    tokens -= 1.0 if budget["per_minute"] else 0.0
+                    day_used += 1
+                self._save(vendor, now, tokens, day, day_used, blocked_until)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return granted, wait
+
+    def acquire(self, vendor: str, max_wait: float = 0.0) -> bool:
+        """Take one call, waiting up to ``max_wait`` seconds; False means use a fallback."""
+        deadline = time.monotonic() + max(0.0, max_wait)
+        while True:
+            granted, wait = self.try_acquire(vendor)
+            if granted:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def penalize(self, vendor: str, seconds: float = 60.0, until_next_day: bool = False) -> None:
+        """Block ``vendor`` for every process after it rejected a call for exceeding its limit."""
+        if vendor not in self.budgets:
+            return
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                _, day, day_used, blocked_until = self._state(vendor, now)
+                block = _seconds_to_next_utc_day(now) if until_next_day else seconds
+                self._save(vendor, now, 0.0, day, day_used, max(blocked_until, now + block))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def remaining(self) -> Dict[str, Dict[str, Any]]:
+        """Remaining budget per vendor, e.g. for planning batch runs."""
+        report: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            now = time.time()
+            for vendor, budget in self.budgets.items():
+                tokens, _, day_used, blocked_until = self._state(vendor, now)
+                report[vendor] = {
+                    "per_minute": budget["per_minute"],
+                    "minute_remaining": int(tokens) if budget["per_minute"] else None,
+                    "per_day": budget["per_day"],
+                    "day_used": day_used,
+                    "day_remaining": max(0, budget["per_day"] - day_used) if budget["per_day"] else None,
+                    "day_resets_in_seconds": round(_seconds_to_next_utc_day(now)),
+                    "blocked_for_seconds": round(max(0.0, blocked_until - now), 3),
+                }
+        return report
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_governor: Optional[QuotaGovernor] = None
+_governor_key: Optional[Tuple] = None
+_governor_lock = threading.Lock()
+
+
+def get_vendor_quota(config: Optional[Mapping[str, Any]] = None) -> Optional[QuotaGovernor]:
+    """Return the process-wide governor for the configured budgets (None when unset)."""
+    global _governor, _governor_key
+    config = config or get_config()
+    budgets = config.get("vendor_quotas") or {}
+    if not budgets:
+        return None
+    path = config.get("vendor_quota_path") or os.path.join(
+        config.get("data_cache_dir", "data_cache"), "vendor_quota.sqlite3"
+    )
+    key = (os.path.abspath(path), repr(sorted((vendor, sorted(budget.items())) for vendor, budget in budgets.items())))
+    with _governor_lock:
+        if _governor is None or _governor_key != key:
+            if _governor is not None:
+                _governor.close()
+            _governor = QuotaGovernor(path, budgets)
+            _governor_key = key
+        return _governor
@@ -1,9 +1,22 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
+import logging
 from typing import Annotated
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+import pandas as pd
 import yfinance as yf
 import os
 from .stockstats_utils import StockstatsUtils
+from .indicator_engine import SUPPORTED_INDICATORS, load_indicator_matrix
+from .utils import UnsupportedArgumentError, dedupe_indicators, format_indicator_table
+from .ohlcv_cache import get_ohlcv_cache
+
+logger = logging.getLogger(__name__)
+
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -12,23 +25,21 @@ def get_YFin_data_online(
 ):
 
     datetime.strptime(start_date, "%Y-%m-%d")
-    datetime.strptime(end_date, "%Y-%m-%d")
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
-
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    # Slice the shared incremental cache (Ticker.history rows; the end date is exclusive as before)
+    rows = get_ohlcv_cache().frame(
+        symbol, "yfinance", start_date, (end_dt - relativedelta(days=1)).strftime("%Y-%m-%d")
+    )
 
     # Check if data is empty
-    if data.empty:
+    if rows.empty:
         return (
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
+    data = rows.drop(columns="Date")
+    data.index = pd.DatetimeIndex(pd.to_datetime(rows["Date"]), name="Date")
 
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
@@ -129,7 +140,7 @@ def get_stock_stats_indicators_window(
     }
 
     if indicator not in best_ind_params:
-        raise ValueError(
+        raise UnsupportedArgumentError(
             f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
         )
 
@@ -137,33 +148,38 @@ def get_stock_stats_indicators_window(
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    # Indicators are precomputed once per symbol; only the window is sliced here
     try:
-        indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
+        matrix = load_indicator_matrix(symbol, _get_ohlcv_source(symbol))
+        indicator_data = matrix.window(
+            indicator, before.strftime("%Y-%m-%d"), curr_date_dt.strftime("%Y-%m-%d")
+        )
+
         # Generate the date range we need
         current_dt = curr_date_dt
         date_values = []
-        
+
         while current_dt >= before:
             date_str = current_dt.strftime('%Y-%m-%d')
-            
+
             # Look up the indicator value for this date
             if date_str in indicator_data:
                 indicator_value = indicator_data[date_str]
             else:
                 indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
+
             date_values.append((date_str, indicator_value))
             current_dt = current_dt - relativedelta(days=1)
-        
+
         # Build the result string
         ind_string = ""
         for date_str, value in date_values:
             ind_string += f"{date_str}: {value}\n"
         
     except Exception as e:
-        print(f"Error getting bulk stockstats data: {e}")
+        logger.warning(
+            "Precomputed %s data for %s unavailable, computing day by day: %s", indicator, symbol, e
+        )
         # Fallback to original implementation if bulk method fails
         ind_string = ""
         curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
@@ -184,87 +200,65 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
-def _get_stock_stats_bulk(
+def get_stock_stats_indicators_batch(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+    indicators: Annotated[list, "technical indicators to report, e.g. ['rsi', 'macd']"],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"] = 30,
+) -> str:
+    """Windows of several indicators as one table, sliced from the precomputed matrix in one pass."""
+    indicators = dedupe_indicators(indicators)
+    unsupported = [name for name in indicators if name not in SUPPORTED_INDICATORS]
+    if unsupported:
+        raise UnsupportedArgumentError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(SUPPORTED_INDICATORS)}"
+        )
+
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    start_date = (curr_date_dt - relativedelta(days=look_back_days)).strftime("%Y-%m-%d")
+    end_date = curr_date_dt.strftime("%Y-%m-%d")
+
+    try:
+        matrix = load_indicator_matrix(symbol, _get_ohlcv_source(symbol))
+        rows = matrix.table(indicators, start_date, end_date)
+    except Exception as e:
+        logger.warning(
+            "Precomputed indicator data for %s unavailable, fetching one indicator at a time: %s", symbol, e
+        )
+        # Fall back to one window per indicator
+        return "\n\n".join(
+            get_stock_stats_indicators_window(symbol, name, curr_date, look_back_days) for name in indicators
+        )
+
+    return format_indicator_table(symbol, indicators, start_date, end_date, rows)
+
+
+def _get_ohlcv_source(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> str:
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Return the path of the OHLCV CSV that technical indicators are computed from.
+    Online, this is the shared incremental cache, which downloads history once
+    and afterwards only the trailing days.
     """
     from .config import get_config
-    import pandas as pd
-    from stockstats import wrap
-    import os
-    
+
     config = get_config()
     online = config["data_vendors"]["technical_indicators"] != "local"
-    
+
     if not online:
         # Local data path
-        try:
-            data = pd.read_csv(
-                os.path.join(
-                    config.get("data_cache_dir", "data"),
-                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                )
-            )
-            df = wrap(data)
-        except FileNotFoundError:
-            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-    else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
         data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
+            config.get("data_cache_dir", "data"),
+            f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
-        df = wrap(data)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
-    # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        date_str = row["Date"]
-        indicator_value = row[indicator]
-        
-        # Handle NaN/None values
-        if pd.isna(indicator_value):
-            result_dict[date_str] = "N/A"
-        else:
-            result_dict[date_str] = str(indicator_value)
-    
-    return result_dict
+        if not os.path.exists(data_file):
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        return data_file
+
+    return get_ohlcv_cache(config).ensure(symbol, "yfinance")
 
 
 def get_stockstats_indicator(
@@ -284,9 +278,9 @@ def get_stockstats_indicator(
             indicator,
             curr_date,
         )
-    except Exception as e:
-        print(
-            f"Error getting stockstats indicator data for indicator {indicator} on {curr_date}: {e}"
+    except Exception:
+        logger.exception(
+            "Error getting stockstats indicator data for indicator %s on %s", indicator, curr_date
         )
         return ""
 
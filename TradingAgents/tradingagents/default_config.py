@@ -1,7 +1,7 @@
 """
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-19
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 """
@@ -29,6 +29,29 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Run the analyst team concurrently (isolated subgraphs joined before the Bull Researcher)
+    "parallel_analysts": os.getenv("TRADINGAGENTS_PARALLEL_ANALYSTS", "false").lower() in ("1", "true", "yes", "on"),
+    # Agent memories: "chroma" (process-wide client) or "numpy" (in-process float32 index); both persist across runs
+    "memory_backend": os.getenv("TRADINGAGENTS_MEMORY_BACKEND", "chroma"),
+    "memory_persist": os.getenv("TRADINGAGENTS_MEMORY_PERSIST", "true").lower() in ("1", "true", "yes", "on"),
+    "memory_path": os.getenv("TRADINGAGENTS_MEMORY_PATH"),  # Default: <data_cache_dir>/chroma or <data_cache_dir>/memory_index
+    "memory_mmap": os.getenv("TRADINGAGENTS_MEMORY_MMAP", "false").lower() in ("1", "true", "yes", "on"),  # numpy backend only
+    "memory_namespace": os.getenv("TRADINGAGENTS_MEMORY_NAMESPACE", "tradingagents"),
+    # Memory embeddings: "openai" (OpenAI API, or the Ollama backend_url when it is localhost)
+    # or "local" (in-process hashed n-gram embeddings; no network or API key)
+    "memory_embedding_provider": os.getenv("TRADINGAGENTS_MEMORY_EMBEDDING_PROVIDER", "openai"),
+    "local_embedding_dim": int(os.getenv("TRADINGAGENTS_LOCAL_EMBEDDING_DIM", "768")),
+    # Embedding/summary cache shared by all agent memories (in-memory LRU + optional SQLite file)
+    "embedding_cache_enabled": os.getenv("TRADINGAGENTS_EMBEDDING_CACHE", "true").lower() in ("1", "true", "yes", "on"),
+    "embedding_cache_path": os.getenv("TRADINGAGENTS_EMBEDDING_CACHE_PATH"),  # Default: <data_cache_dir>/embedding_cache.sqlite3, "memory": no file
+    "embedding_cache_size": int(os.getenv("TRADINGAGENTS_EMBEDDING_CACHE_SIZE", "1024")),
+    # How memories embed situations longer than the embedding model's input limit:
+    # "summarize" (LLM summary, then embed) or "chunk_pool" (embed token-bounded chunks in one batch and pool them)
+    "memory_embedding_mode": os.getenv("TRADINGAGENTS_MEMORY_EMBEDDING_MODE", "summarize"),
+    "memory_chunk_tokens": int(os.getenv("TRADINGAGENTS_MEMORY_CHUNK_TOKENS", "2000")),
+    "memory_chunk_pooling": os.getenv("TRADINGAGENTS_MEMORY_CHUNK_POOLING", "mean"),  # mean or weighted (by chunk length)
+    # Concurrent reflection LLM calls in reflect_and_remember / reflect_and_remember_many
+    "reflection_concurrency": int(os.getenv("TRADINGAGENTS_REFLECTION_CONCURRENCY", "5")),
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -42,4 +65,67 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Vendor response cache (SQLite, shared across runs and processes)
+    "vendor_cache_enabled": os.getenv("TRADINGAGENTS_VENDOR_CACHE", "true").lower() in ("1", "true", "yes", "on"),
+    "vendor_cache_path": os.getenv("TRADINGAGENTS_VENDOR_CACHE_PATH"),  # Default: <data_cache_dir>/vendor_cache.sqlite3
+    # Per-category TTL overrides in seconds (None = never expires). Defaults live in dataflows/vendor_cache.py:
+    # core_stock_apis/technical_indicators never expire, fundamental_data 3 days, news_data 15 minutes.
+    "vendor_cache_ttls": {},
+    # Per-vendor call limits in calls per minute, shared by every thread in the process.
+    # Example: {"alpha_vantage": 75, "openai": 60}. Env: TRADINGAGENTS_VENDOR_RATE_LIMITS="alpha_vantage=75,openai=60"
+    "vendor_rate_limits": {
+        vendor.strip(): float(rate)
+        for vendor, _, rate in (
+            item.partition("=") for item in os.getenv("TRADINGAGENTS_VENDOR_RATE_LIMITS", "").split(",")
+        )
+        if vendor.strip() and rate
+    },
+    # Per-vendor cap on calls in flight at once, shared by every thread in the process.
+    # Example: {"alpha_vantage": 2}. Env: TRADINGAGENTS_VENDOR_CONCURRENCY="alpha_vantage=2,openai=4"
+    "vendor_concurrency": {
+        vendor.strip(): int(slots)
+        for vendor, _, slots in (
+            item.partition("=") for item in os.getenv("TRADINGAGENTS_VENDOR_CONCURRENCY", "").split(",")
+        )
+        if vendor.strip() and slots
+    },
+    # Vendor circuit breakers (dataflows/vendor_health.py): a vendor is skipped for a method after
+    # vendor_circuit_failures consecutive failures, then probed again after vendor_circuit_cooldown seconds
+    "vendor_health_enabled": os.getenv("TRADINGAGENTS_VENDOR_HEALTH", "true").lower() in ("1", "true", "yes", "on"),
+    "vendor_circuit_failures": int(os.getenv("TRADINGAGENTS_VENDOR_CIRCUIT_FAILURES", "5")),
+    "vendor_circuit_cooldown": float(os.getenv("TRADINGAGENTS_VENDOR_CIRCUIT_COOLDOWN", "60")),
+    # Worker threads a ToolNode runs one analyst turn's tool calls on (the graph's max_concurrency,
+    # which also caps concurrent graph tasks in async runs). None: the executor default
+    "tool_max_concurrency": int(os.getenv("TRADINGAGENTS_TOOL_MAX_CONCURRENCY", "4")) or None,
+    # Shared daily OHLCV cache (<data_cache_dir>/ohlcv): history downloaded on first use, then only the
+    # trailing days once a day; symbols unused for ohlcv_cache_max_idle_days are garbage-collected
+    "ohlcv_history_years": int(os.getenv("TRADINGAGENTS_OHLCV_HISTORY_YEARS", "15")),
+    "ohlcv_cache_max_idle_days": int(os.getenv("TRADINGAGENTS_OHLCV_MAX_IDLE_DAYS", "30")),
+    # Reddit company news: JSON file of {"TICKER": ["Company name", ...]} extending the built-in
+    # ticker universe matched at ingest (dataflows/entity_matcher.py). None: built-in universe only
+    "entity_universe_path": os.getenv("TRADINGAGENTS_ENTITY_UNIVERSE"),
+    # Cross-process call budgets per vendor, shared through SQLite by every runner using the same key.
+    # Example: {"alpha_vantage": {"per_minute": 75, "per_day": None}}. A call waits up to
+    # vendor_quota_max_wait seconds for budget, then falls back to the next vendor (0: fall back at once)
+    "vendor_quotas": {
+        vendor: budget
+        for vendor, budget in {
+            "alpha_vantage": {
+                "per_minute": float(os.getenv("TRADINGAGENTS_ALPHA_VANTAGE_PER_MINUTE", "0")) or None,
+                "per_day": int(os.getenv("TRADINGAGENTS_ALPHA_VANTAGE_PER_DAY", "0")) or None,
+            },
+        }.items()
+        if any(budget.values())
+    },
+    "vendor_quota_path": os.getenv("TRADINGAGENTS_VENDOR_QUOTA_PATH"),  # Default: <data_cache_dir>/vendor_quota.sqlite3
+    "vendor_quota_max_wait": float(os.getenv("TRADINGAGENTS_VENDOR_QUOTA_MAX_WAIT", "5")),
+    # Alpha Vantage HTTP client: request timeout (seconds) and keep-alive connections pooled across threads
+    "alpha_vantage_timeout": float(os.getenv("TRADINGAGENTS_ALPHA_VANTAGE_TIMEOUT", "30")),
+    "alpha_vantage_pool_size": int(os.getenv("TRADINGAGENTS_ALPHA_VANTAGE_POOL_SIZE", "10")),
+    # State streaming: send appended report/debate text as offset+delta instead of the full text,
+    # with a full keyframe every N emitted state events
+    "stream_delta_encoding": os.getenv("TRADINGAGENTS_STREAM_DELTAS", "true").lower() in ("1", "true", "yes", "on"),
+    "stream_keyframe_interval": int(os.getenv("TRADINGAGENTS_STREAM_KEYFRAME_INTERVAL", "25")),
+    # Batch runner (tradingagents.runner.run_graph --batch-file): worker threads, each with a warm graph
+    "batch_concurrency": int(os.getenv("TRADINGAGENTS_BATCH_CONCURRENCY", "2")),
 }
@@ -1,3 +1,8 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 # TradingAgents/graph/propagation.py
 
 from typing import Dict, Any
@@ -11,9 +16,14 @@ from tradingagents.agents.utils.agent_states import (
 class Propagator:
     """Handles state initialization and propagation through the graph."""
 
-    def __init__(self, max_recur_limit=100):
-        """Initialize with configuration parameters."""
+    def __init__(self, max_recur_limit=100, max_concurrency=None):
+        """Initialize with configuration parameters.
+
+        ``max_concurrency`` bounds the thread pool each ToolNode runs one turn's
+        tool calls on (None: the executor default).
+        """
         self.max_recur_limit = max_recur_limit
+        self.max_concurrency = max_concurrency
 
     def create_initial_state(
         self, company_name: str, trade_date: str
@@ -43,7 +53,10 @@ class Propagator:
 
     def get_graph_args(self) -> Dict[str, Any]:
         """Get arguments for the graph invocation."""
+        config: Dict[str, Any] = {"recursion_limit": self.max_recur_limit}
+        if self.max_concurrency:
+            config["max_concurrency"] = self.max_concurrency
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
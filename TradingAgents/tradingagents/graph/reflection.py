@@ -1,15 +1,31 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
 from langchain_openai import ChatOpenAI
 
+# Memory key -> (component label, report extractor) for every reflected role.
+REFLECTION_COMPONENTS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], str]]] = {
+    "bull": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda state: state["trader_investment_plan"]),
+    "invest_judge": ("INVEST JUDGE", lambda state: state["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda state: state["risk_debate_state"]["judge_decision"]),
+}
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize the reflector with an LLM."""
+    def __init__(self, quick_thinking_llm: ChatOpenAI, max_workers: int = 5):
+        """Initialize the reflector with an LLM and the number of concurrent reflection calls."""
         self.quick_thinking_llm = quick_thinking_llm
+        self.max_workers = max(1, int(max_workers))
         self.reflection_system_prompt = self._get_reflection_prompt()
 
     def _get_reflection_prompt(self) -> str:
@@ -119,3 +135,41 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
+
+    def reflect_many(
+        self,
+        states_and_returns: Iterable[Tuple[Dict[str, Any], Any]],
+        memories: Mapping[str, Any],
+    ) -> Dict[str, int]:
+        """Reflect every component on many ``(state, returns_losses)`` pairs at once.
+
+        The reflection LLM calls run concurrently on up to ``max_workers`` threads.
+        Each memory then receives all of its new situations in one
+        ``add_situations`` call, which embeds them in a single batch. Returns the
+        number of situations added per memory key.
+        """
+        jobs: List[Tuple[str, str, Dict[str, Any], Any]] = []
+        for state, returns_losses in states_and_returns:
+            situation = self._extract_current_situation(state)
+            for key in memories:
+                jobs.append((key, situation, state, returns_losses))
+
+        def run(job: Tuple[str, str, Dict[str, Any], Any]) -> Tuple[str, Tuple[str, str]]:
+            key, situation, state, returns_losses = job
+            label, extract_report = REFLECTION_COMPONENTS[key]
+            result = self._reflect_on_component(label, extract_report(state), situation, returns_losses)
+            return key, (situation, result)
+
+        if len(jobs) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+                outcomes = list(executor.map(run, jobs))
+        else:
+            outcomes = [run(job) for job in jobs]
+
+        grouped: Dict[str, List[Tuple[str, str]]] = {key: [] for key in memories}
+        for key, item in outcomes:
+            grouped[key].append(item)
+        for key, items in grouped.items():
+            if items:
+                memories[key].add_situations(items)
+        return {key: len(items) for key, items in grouped.items()}
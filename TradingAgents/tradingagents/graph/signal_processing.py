@@ -1,3 +1,8 @@
+# ============================================================
+# Modified: See CHANGELOG.md for complete modification history
+# Last Updated: 2026-10-17
+# Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
+# ============================================================
 # TradingAgents/graph/signal_processing.py
 
 from langchain_openai import ChatOpenAI
@@ -20,12 +25,19 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        return self.quick_thinking_llm.invoke(self._build_messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async variant of :meth:`process_signal`."""
+        response = await self.quick_thinking_llm.ainvoke(self._build_messages(full_signal))
+        return response.content
+
+    @staticmethod
+    def _build_messages(full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
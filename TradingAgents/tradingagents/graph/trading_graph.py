@@ -1,6 +1,6 @@
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-26
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 # TradingAgents/graph/trading_graph.py
@@ -33,6 +33,7 @@ from .openrouter_patch import apply_openrouter_responses_patch
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicators_batch,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -182,8 +183,11 @@ class TradingAgentsGraph:
             self.conditional_logic,
         )
 
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
+        self.propagator = Propagator(max_concurrency=self.config.get("tool_max_concurrency"))
+        self.reflector = Reflector(
+            self.quick_thinking_llm,
+            max_workers=int(self.config.get("reflection_concurrency", 5)),
+        )
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
 
         # State tracking
@@ -192,10 +196,17 @@ class TradingAgentsGraph:
         self.log_states_dict = {}  # date to full state dict
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=bool(self.config.get("parallel_analysts", False)),
+        )
 
     def _resolve_memory_namespace(self, provided: Optional[str]) -> str:
-        """Determine a per-run namespace for Chroma collections."""
+        """Determine the namespace for Chroma collections.
+
+        Collections live in a shared (by default on-disk) Chroma client, so runs
+        that resolve to the same namespace share and accumulate their memories.
+        """
 
         def _normalize(value: str) -> str:
             cleaned = value.strip()
@@ -226,11 +237,15 @@ class TradingAgentsGraph:
         return f"ta_run_{uuid.uuid4().hex}"
 
     def _memory_name(self, base: str) -> str:
-        """Compose a namespaced collection identifier for this run."""
+        """Compose a namespaced collection identifier.
+
+        FinancialSituationMemory appends a digest of the embedding model and
+        dimension, so memories built with different embedders never share a collection.
+        """
         return f"{self.memory_namespace}_{base}"
 
     def cleanup(self) -> None:
-        """Tear down any Chroma collections created for this run."""
+        """Release memory collection handles; stored memories persist across runs."""
         for memory in getattr(self, "_memories", []):
             try:
                 memory.cleanup()
@@ -239,13 +254,20 @@ class TradingAgentsGraph:
                 pass
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
-        """Create tool nodes for different data sources using abstract methods."""
+        """Create tool nodes for different data sources using abstract methods.
+
+        A ToolNode runs the tool calls of one AIMessage concurrently (a thread pool
+        bounded by the graph's ``max_concurrency``, or ``asyncio.gather`` when the
+        graph is streamed asynchronously) and returns their messages in call order;
+        ``route_to_vendor`` applies the per-vendor limits in ``vendor_concurrency``.
+        """
         return {
             "market": ToolNode(
                 [
                     # Core stock data tools
                     get_stock_data,
                     # Technical indicators
+                    get_indicators_batch,
                     get_indicators,
                 ]
             ),
@@ -377,6 +399,31 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    async def apropagate(self, company_name, trade_date):
+        """Async variant of :meth:`propagate` built on ``graph.astream``.
+
+        LLM calls are awaited on the event loop; blocking tool and memory work is
+        dispatched to worker threads only for the duration of each call.
+        """
+
+        self.ticker = company_name
+
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        final_state = None
+        async for chunk in self.graph.astream(init_agent_state, **args):
+            if self.debug and len(chunk["messages"]) > 0:
+                chunk["messages"][-1].pretty_print()
+            final_state = chunk
+
+        self.curr_state = final_state
+        self._log_state(trade_date, final_state)
+
+        return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
+
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
         self.log_states_dict[str(trade_date)] = {
@@ -421,22 +468,29 @@ class TradingAgentsGraph:
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+        self.reflect_and_remember_many([(self.curr_state, returns_losses)])
+
+    def reflect_and_remember_many(self, states_and_returns):
+        """Reflect on many ``(final_state, returns_losses)`` pairs, e.g. a whole backtest.
+
+        All component reflections run concurrently (``reflection_concurrency``)
+        and each memory stores its new situations with one batched embedding call.
+        """
+        return self.reflector.reflect_many(
+            states_and_returns,
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async variant of :meth:`process_signal`."""
+        return await self.signal_processor.aprocess_signal(full_signal)
@@ -1,23 +1,29 @@
 """
 # ============================================================
 # Modified: See CHANGELOG.md for complete modification history
-# Last Updated: 2025-10-29
+# Last Updated: 2026-10-17
 # Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 # ============================================================
 """
 import argparse
+import asyncio
+import csv
 import json
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, List, TextIO, Tuple
 
 from dotenv import load_dotenv
 
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.vendor_limits import parse_rate_limits
+from tradingagents.dataflows.vendor_quota import get_vendor_quota
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 
 
@@ -33,12 +39,31 @@ def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run the TradingAgents graph and stream JSONL progress events."
     )
-    parser.add_argument("--ticker", required=True, help="Ticker symbol to analyze.")
+    parser.add_argument("--ticker", help="Ticker symbol to analyze.")
     parser.add_argument(
         "--date",
-        required=True,
         help="Trading date in YYYY-MM-DD format to evaluate the ticker.",
     )
+    parser.add_argument(
+        "--batch-file",
+        help="CSV file of ticker,date rows to run in one process instead of --ticker/--date.",
+    )
+    parser.add_argument(
+        "--batch-output",
+        help="Optional JSONL file for batch results (defaults to stdout).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Number of batch workers, each with its own warm graph (default: batch_concurrency config).",
+    )
+    parser.add_argument(
+        "--vendor-rate-limit",
+        action="append",
+        default=[],
+        metavar="VENDOR=CALLS_PER_MINUTE",
+        help="Per-vendor call limit shared by all batch workers. May be repeated.",
+    )
     parser.add_argument(
         "--config",
         help="Optional JSON string containing configuration overrides.",
@@ -51,7 +76,10 @@ def _parse_args() -> argparse.Namespace:
         "--result-path",
         help="Optional file path to persist the final result payload as JSON.",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.batch_file and not (args.ticker and args.date):
+        parser.error("--ticker and --date are required unless --batch-file is given")
+    return args
 
 
 def _load_config(
@@ -136,48 +164,93 @@ _REPORT_SECTIONS: Tuple[str, ...] = (
 )
 
 
-class _StreamAggregator:
-    """Aggregate streaming updates for SSE consumers."""
+_DEBATE_STATE_KEYS: Tuple[str, ...] = ("investment_debate_state", "risk_debate_state")
 
-    def __init__(self) -> None:
+
+class _StreamAggregator:
+    """Aggregate streaming updates for SSE consumers.
+
+    With ``delta_encoding`` enabled, text that only grew since the last emission
+    is sent under ``deltas`` as ``{"offset": n, "delta": appended}`` keyed by
+    ``reports.<section>`` or ``<debate_state>.<field>``; other changed debate
+    fields are sent as ``{"value": v}``. New or rewritten report sections and the
+    first sighting of a debate state are still sent in full. Every
+    ``keyframe_interval`` emitted payloads carry ``keyframe: true`` with all
+    reports and debate states in full, so late or lossy consumers can resync.
+    """
+
+    def __init__(self, *, delta_encoding: bool = True, keyframe_interval: int = 25) -> None:
         self.reports: Dict[str, str] = {}
         self.messages: List[Dict[str, Any]] = []
         self.latest_state: Optional[Dict[str, Any]] = None
+        self.delta_encoding = delta_encoding
+        self.keyframe_interval = max(1, int(keyframe_interval))
         self._last_message_signature: Optional[Tuple[str, str]] = None
-        self._last_invest_state: Optional[str] = None
-        self._last_risk_state: Optional[str] = None
+        # path -> (signature, value) of the last emitted value for change detection
+        self._emitted: Dict[str, Tuple[Any, Any]] = {}
+        self._debate_states: Dict[str, Dict[str, Any]] = {}
+        self._emitted_payloads = 0
 
     def process_chunk(self, chunk: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a graph chunk and return a payload for emission if changed."""
         self.latest_state = chunk
         payload: Dict[str, Any] = {}
+        deltas: Dict[str, Dict[str, Any]] = {}
 
         message_info = self._extract_message(chunk)
         if message_info is not None:
             payload["message"] = message_info
             self.messages.append(message_info)
 
-        report_updates = self._extract_reports(chunk)
+        report_updates = self._extract_reports(chunk, deltas)
         if report_updates:
             payload["reports"] = report_updates
 
-        invest_state = chunk.get("investment_debate_state")
-        if isinstance(invest_state, dict):
-            serializable = _to_serializable(invest_state)
-            digest = json.dumps(serializable, sort_keys=True)
-            if digest != self._last_invest_state:
-                payload["investment_debate_state"] = serializable
-                self._last_invest_state = digest
+        for key in _DEBATE_STATE_KEYS:
+            state = chunk.get(key)
+            if isinstance(state, dict):
+                full_state = self._extract_debate_state(key, state, deltas)
+                if full_state is not None:
+                    payload[key] = full_state
 
-        risk_state = chunk.get("risk_debate_state")
-        if isinstance(risk_state, dict):
-            serializable = _to_serializable(risk_state)
-            digest = json.dumps(serializable, sort_keys=True)
-            if digest != self._last_risk_state:
-                payload["risk_debate_state"] = serializable
-                self._last_risk_state = digest
+        if deltas:
+            payload["deltas"] = deltas
+        if not payload:
+            return None
 
-        return payload or None
+        self._emitted_payloads += 1
+        if self.delta_encoding and self._emitted_payloads % self.keyframe_interval == 0:
+            payload.pop("deltas", None)
+            payload["keyframe"] = True
+            if self.reports:
+                payload["reports"] = dict(self.reports)
+            for key, state in self._debate_states.items():
+                payload[key] = _to_serializable(state)
+        return payload
+
+    def _changed(self, path: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return how ``path`` changed since its last emission, or None if it did not.
+
+        Strings are compared by length and hash first, so unchanged text costs
+        O(1) and growing text only a prefix comparison.
+        """
+        signature = (len(value), hash(value)) if isinstance(value, str) else value
+        previous = self._emitted.get(path)
+        self._emitted[path] = (signature, value)
+        if previous is None:
+            return {"value": value}
+        previous_signature, previous_value = previous
+        if previous_signature == signature:
+            return None
+        if (
+            self.delta_encoding
+            and isinstance(value, str)
+            and isinstance(previous_value, str)
+            and len(value) > len(previous_value)
+            and value.startswith(previous_value)
+        ):
+            return {"offset": len(previous_value), "delta": value[len(previous_value):]}
+        return {"value": value}
 
     def _extract_message(self, chunk: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         messages = chunk.get("messages")
@@ -222,7 +295,7 @@ class _StreamAggregator:
 
         return message_payload
 
-    def _extract_reports(self, chunk: Dict[str, Any]) -> Dict[str, str]:
+    def _extract_reports(self, chunk: Dict[str, Any], deltas: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
         updates: Dict[str, str] = {}
         for section in _REPORT_SECTIONS:
             if section not in chunk:
@@ -230,12 +303,34 @@ class _StreamAggregator:
             normalized = _stringify_content(chunk.get(section)).strip()
             if not normalized:
                 continue
-            if self.reports.get(section) == normalized:
+            change = self._changed(f"reports.{section}", normalized)
+            if change is None:
                 continue
             self.reports[section] = normalized
-            updates[section] = normalized
+            if "delta" in change:
+                deltas[f"reports.{section}"] = change
+            else:
+                updates[section] = normalized
         return updates
 
+    def _extract_debate_state(
+        self, key: str, state: Dict[str, Any], deltas: Dict[str, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Record field-level changes of a debate state; returns it in full when new."""
+        first_sighting = key not in self._debate_states
+        self._debate_states[key] = state
+        changes: Dict[str, Dict[str, Any]] = {}
+        for field_name, value in state.items():
+            tracked = value if isinstance(value, str) else _to_serializable(value)
+            change = self._changed(f"{key}.{field_name}", tracked)
+            if change is not None:
+                changes[f"{key}.{field_name}"] = change
+
+        if first_sighting or (changes and not self.delta_encoding):
+            return _to_serializable(state)
+        deltas.update(changes)
+        return None
+
 
 def _build_result_payload(
     args: argparse.Namespace,
@@ -280,6 +375,92 @@ def _build_result_payload(
     return payload
 
 
+def _create_graph(config: Dict[str, Any]) -> TradingAgentsGraph:
+    """Build a TradingAgentsGraph honoring a ``selected_analysts`` override."""
+    selected_analysts_override = config.get("selected_analysts")
+    analysts_list: Optional[List[str]] = None
+    if isinstance(selected_analysts_override, list):
+        typed_values = [value for value in selected_analysts_override if isinstance(value, str)]
+        if typed_values:
+            analysts_list = typed_values
+
+    if analysts_list:
+        return TradingAgentsGraph(
+            selected_analysts=analysts_list,
+            debug=False,
+            config=config,
+        )
+    return TradingAgentsGraph(
+        debug=False,
+        config=config,
+    )
+
+
+def _final_decision_text(final_state: Optional[Dict[str, Any]]) -> str:
+    """Validate the streamed final state and return its normalized decision text."""
+    if final_state is None:
+        raise RuntimeError("TradingAgents graph produced no state during propagation.")
+
+    final_trade_decision_raw = final_state.get("final_trade_decision")
+    if isinstance(final_trade_decision_raw, str):
+        final_trade_decision_text = final_trade_decision_raw.strip()
+    else:
+        final_trade_decision_text = _stringify_content(final_trade_decision_raw).strip()
+
+    if not final_trade_decision_text:
+        raise RuntimeError("TradingAgents graph did not produce a final trade decision.")
+
+    final_state["final_trade_decision"] = final_trade_decision_text
+    return final_trade_decision_text
+
+
+def _complete_run(
+    emitter: Callable[..., None],
+    ticker: str,
+    trade_date: str,
+    final_state: Optional[Dict[str, Any]],
+    decision: Any,
+    config: Dict[str, Any],
+    result_path: Optional[str],
+    start_wall_clock: float,
+    start_monotonic: float,
+) -> Dict[str, Any]:
+    """Build, persist and announce the result payload of a finished run."""
+    if final_state is None or decision is None:
+        raise RuntimeError("TradingAgents graph did not complete successfully.")
+
+    emitter(
+        "progress",
+        message="Processing results",
+        percent=80,
+    )
+
+    result_payload = _build_result_payload(
+        args=argparse.Namespace(
+            ticker=ticker,
+            date=trade_date,
+        ),
+        final_state=final_state,
+        decision=decision,
+        started_ts=start_wall_clock,
+        duration_seconds=time.perf_counter() - start_monotonic,
+        config=config,
+    )
+
+    if result_path:
+        output_path = Path(result_path).expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("w", encoding="utf-8") as handle:
+            json.dump(result_payload, handle, indent=2)
+
+    emitter(
+        "complete",
+        status="success",
+        result=result_payload,
+    )
+    return result_payload
+
+
 def run_tradingagents(
     ticker: str,
     trade_date: str,
@@ -289,8 +470,14 @@ def run_tradingagents(
     config_path: Optional[str] = None,
     result_path: Optional[str] = None,
     event_callback: Optional[Callable[..., None]] = None,
+    graph: Optional[TradingAgentsGraph] = None,
 ) -> Dict[str, Any]:
-    """Execute the TradingAgents graph with optional event callback emission."""
+    """Execute the TradingAgents graph with optional event callback emission.
+
+    When ``graph`` is given it is reused as-is (its config wins over the config
+    arguments) and left alive for the caller; otherwise a graph is built for this
+    run and cleaned up afterwards.
+    """
     load_dotenv()
     emitter = event_callback or _emit
 
@@ -306,34 +493,24 @@ def run_tradingagents(
     )
 
     try:
-        config = _load_config(
-            config_json=config_json,
-            config_path=config_path,
-            config_overrides=config_overrides,
-        )
-
-        selected_analysts_override = config.get("selected_analysts")
-        analysts_list: Optional[List[str]] = None
-        if isinstance(selected_analysts_override, list):
-            typed_values = [value for value in selected_analysts_override if isinstance(value, str)]
-            if typed_values:
-                analysts_list = typed_values
+        owns_graph = graph is None
+        if owns_graph:
+            config = _load_config(
+                config_json=config_json,
+                config_path=config_path,
+                config_overrides=config_overrides,
+            )
+        else:
+            config = graph.config
 
-        graph: Optional[TradingAgentsGraph] = None
         final_state: Optional[Dict[str, Any]] = None
         decision: Any = None
         try:
-            if analysts_list:
-                graph = TradingAgentsGraph(
-                    selected_analysts=analysts_list,
-                    debug=False,
-                    config=config,
-                )
+            if owns_graph:
+                graph = _create_graph(config)
             else:
-                graph = TradingAgentsGraph(
-                    debug=False,
-                    config=config,
-                )
+                # Reused graphs must not carry state logs over from earlier jobs
+                graph.log_states_dict = {}
 
             emitter(
                 "progress",
@@ -341,7 +518,10 @@ def run_tradingagents(
                 percent=25,
             )
 
-            aggregator = _StreamAggregator()
+            aggregator = _StreamAggregator(
+                delta_encoding=bool(config.get("stream_delta_encoding", True)),
+                keyframe_interval=int(config.get("stream_keyframe_interval", 25)),
+            )
 
             graph.ticker = ticker
             initial_state = graph.propagator.create_initial_state(ticker, trade_date)
@@ -353,60 +533,130 @@ def run_tradingagents(
                 if stream_payload:
                     emitter("state", **stream_payload)
 
-            if final_state is None:
-                raise RuntimeError("TradingAgents graph produced no state during propagation.")
+            final_trade_decision_text = _final_decision_text(final_state)
 
             graph.curr_state = final_state
             graph._log_state(trade_date, final_state)
 
-            final_trade_decision_raw = final_state.get("final_trade_decision")
-            if isinstance(final_trade_decision_raw, str):
-                final_trade_decision_text = final_trade_decision_raw.strip()
-            else:
-                final_trade_decision_text = _stringify_content(final_trade_decision_raw).strip()
-
-            if not final_trade_decision_text:
-                raise RuntimeError("TradingAgents graph did not produce a final trade decision.")
-
-            final_state["final_trade_decision"] = final_trade_decision_text
             decision = graph.process_signal(final_trade_decision_text)
         finally:
-            if graph is not None:
+            if owns_graph and graph is not None:
                 graph.cleanup()
 
-        if final_state is None or decision is None:
-            raise RuntimeError("TradingAgents graph did not complete successfully.")
+        return _complete_run(
+            emitter,
+            ticker,
+            trade_date,
+            final_state,
+            decision,
+            config,
+            result_path,
+            start_wall_clock,
+            start_monotonic,
+        )
 
+    except Exception as exc:  # noqa: BLE001
         emitter(
-            "progress",
-            message="Processing results",
-            percent=80,
+            "error",
+            status="failed",
+            message=str(exc),
+            traceback=traceback.format_exc(),
         )
+        raise
 
-        result_payload = _build_result_payload(
-            args=argparse.Namespace(
-                ticker=ticker,
-                date=trade_date,
-            ),
-            final_state=final_state,
-            decision=decision,
-            started_ts=start_wall_clock,
-            duration_seconds=time.perf_counter() - start_monotonic,
-            config=config,
-        )
 
-        if result_path:
-            output_path = Path(result_path).expanduser().resolve()
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with output_path.open("w", encoding="utf-8") as handle:
-                json.dump(result_payload, handle, indent=2)
+async def arun_tradingagents(
+    ticker: str,
+    trade_date: str,
+    *,
+    config_overrides: Optional[Dict[str, Any]] = None,
+    config_json: Optional[str] = None,
+    config_path: Optional[str] = None,
+    result_path: Optional[str] = None,
+    event_callback: Optional[Callable[..., None]] = None,
+    graph: Optional[TradingAgentsGraph] = None,
+) -> Dict[str, Any]:
+    """Async variant of :func:`run_tradingagents` driven by ``graph.astream``.
 
-        emitter(
-            "complete",
-            status="success",
-            result=result_payload,
+    Model calls are awaited on the running event loop, so many runs can share one
+    loop. Graph construction/cleanup and blocking tool calls run in worker threads
+    only while they execute. ``event_callback`` is invoked on the event loop.
+    """
+    load_dotenv()
+    emitter = event_callback or _emit
+
+    start_monotonic = time.perf_counter()
+    start_wall_clock = time.time()
+
+    emitter(
+        "progress",
+        message="Initializing TradingAgentsGraph",
+        percent=5,
+        ticker=ticker,
+        trade_date=trade_date,
+    )
+
+    try:
+        owns_graph = graph is None
+        if owns_graph:
+            config = _load_config(
+                config_json=config_json,
+                config_path=config_path,
+                config_overrides=config_overrides,
+            )
+        else:
+            config = graph.config
+
+        final_state: Optional[Dict[str, Any]] = None
+        decision: Any = None
+        try:
+            if owns_graph:
+                graph = await asyncio.to_thread(_create_graph, config)
+            else:
+                graph.log_states_dict = {}
+
+            emitter(
+                "progress",
+                message="Running propagation",
+                percent=25,
+            )
+
+            aggregator = _StreamAggregator(
+                delta_encoding=bool(config.get("stream_delta_encoding", True)),
+                keyframe_interval=int(config.get("stream_keyframe_interval", 25)),
+            )
+
+            graph.ticker = ticker
+            initial_state = graph.propagator.create_initial_state(ticker, trade_date)
+            graph_args = graph.propagator.get_graph_args()
+
+            async for chunk in graph.graph.astream(initial_state, **graph_args):
+                final_state = chunk
+                stream_payload = aggregator.process_chunk(chunk)
+                if stream_payload:
+                    emitter("state", **stream_payload)
+
+            final_trade_decision_text = _final_decision_text(final_state)
+
+            graph.curr_state = final_state
+            graph._log_state(trade_date, final_state)
+
+            decision = await graph.aprocess_signal(final_trade_decision_text)
+        finally:
+            if owns_graph and graph is not None:
+                await asyncio.to_thread(graph.cleanup)
+
+        return _complete_run(
+            emitter,
+            ticker,
+            trade_date,
+            final_state,
+            decision,
+            config,
+            result_path,
+            start_wall_clock,
+            start_monotonic,
         )
-        return result_payload
 
     except Exception as exc:  # noqa: BLE001
         emitter(
@@ -418,14 +668,174 @@ def run_tradingagents(
         raise
 
 
+def _read_batch_file(batch_path: str) -> List[Tuple[str, str]]:
+    """Read ``ticker,date`` rows, skipping blanks, ``#`` comments and a header row."""
+    jobs: List[Tuple[str, str]] = []
+    file_path = Path(batch_path).expanduser().resolve()
+    with file_path.open("r", encoding="utf-8", newline="") as handle:
+        for row in csv.reader(handle):
+            cells = [cell.strip() for cell in row]
+            if not cells or not cells[0] or cells[0].startswith("#"):
+                continue
+            if cells[0].lower() in ("ticker", "symbol") and not jobs:
+                continue
+            if len(cells) < 2 or not cells[1]:
+                raise ValueError(f"Batch row {row!r} must contain a ticker and a date")
+            datetime.strptime(cells[1], "%Y-%m-%d")
+            jobs.append((cells[0].upper(), cells[1]))
+    return jobs
+
+
+def run_batch(
+    jobs: Iterable[Tuple[str, str]],
+    *,
+    concurrency: Optional[int] = None,
+    config_overrides: Optional[Dict[str, Any]] = None,
+    config_json: Optional[str] = None,
+    config_path: Optional[str] = None,
+    output: Optional[TextIO] = None,
+) -> Dict[str, Any]:
+    """Run many ``(ticker, date)`` jobs in one process and stream results as JSONL.
+
+    Jobs are spread over a bounded pool of worker threads. Each worker builds one
+    TradingAgentsGraph (LLM clients, memories, compiled graph) on its first job and
+    reuses it for every later job, so startup cost is paid once per worker rather
+    than once per job. Vendor calls from all workers share the process-wide limits
+    in ``vendor_rate_limits`` and the cross-process budgets in ``vendor_quotas``,
+    whose remaining quota is reported in the first and last lines.
+
+    One ``result`` line is written per job in completion order, followed by a
+    ``batch_complete`` summary, which is also returned.
+    """
+    load_dotenv()
+    config = _load_config(
+        config_json=config_json,
+        config_path=config_path,
+        config_overrides=config_overrides,
+    )
+    job_list = list(jobs)
+    workers = max(1, int(concurrency or config.get("batch_concurrency") or 1))
+    workers = min(workers, max(1, len(job_list)))
+    stream = output or sys.stdout
+
+    write_lock = threading.Lock()
+    build_lock = threading.Lock()
+    local = threading.local()
+    graphs: List[TradingAgentsGraph] = []
+    counts = {"succeeded": 0, "failed": 0}
+
+    def _write(record: Dict[str, Any]) -> None:
+        with write_lock:
+            stream.write(json.dumps(record, ensure_ascii=True) + "\n")
+            stream.flush()
+
+    def _worker_graph() -> TradingAgentsGraph:
+        graph = getattr(local, "graph", None)
+        if graph is None:
+            # Graph construction touches shared clients/config; build one at a time
+            with build_lock:
+                graph = _create_graph(config)
+                graphs.append(graph)
+            local.graph = graph
+        return graph
+
+    def _run_job(index: int, ticker: str, trade_date: str) -> None:
+        record: Dict[str, Any] = {
+            "event": "result",
+            "index": index,
+            "ticker": ticker,
+            "trade_date": trade_date,
+        }
+        try:
+            result = run_tradingagents(
+                ticker,
+                trade_date,
+                event_callback=lambda *_args, **_kwargs: None,
+                graph=_worker_graph(),
+            )
+            record.update(status="success", decision=result.get("decision"), result=result)
+        except Exception as exc:  # noqa: BLE001
+            record.update(status="failed", message=str(exc), traceback=traceback.format_exc())
+        with write_lock:
+            counts["succeeded" if record["status"] == "success" else "failed"] += 1
+        _write(record)
+
+    start_monotonic = time.perf_counter()
+    # Shared vendor budgets (vendor_quotas), reported so callers can size batches to what is left
+    governor = get_vendor_quota(config)
+    started: Dict[str, Any] = {"event": "batch_started", "total": len(job_list), "concurrency": workers}
+    if governor is not None:
+        started["vendor_quota"] = governor.remaining()
+    _write(started)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ta-batch") as executor:
+            futures = [
+                executor.submit(_run_job, index, ticker, trade_date)
+                for index, (ticker, trade_date) in enumerate(job_list)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        for graph in graphs:
+            graph.cleanup()
+
+    summary: Dict[str, Any] = {
+        "event": "batch_complete",
+        "total": len(job_list),
+        "succeeded": counts["succeeded"],
+        "failed": counts["failed"],
+        "concurrency": workers,
+        "duration_seconds": round(time.perf_counter() - start_monotonic, 3),
+    }
+    if governor is not None:
+        summary["vendor_quota"] = governor.remaining()
+    _write(summary)
+    return summary
+
+
 def main() -> int:
     """Entry point for the TradingAgents JSONL runner."""
     args = _parse_args()
+
+    overrides: Dict[str, Any] = {}
+    if args.vendor_rate_limit:
+        try:
+            overrides["vendor_rate_limits"] = {
+                **DEFAULT_CONFIG.get("vendor_rate_limits", {}),
+                **parse_rate_limits(args.vendor_rate_limit),
+            }
+        except ValueError as exc:
+            sys.stderr.write(f"{exc}\n")
+            return 2
+
+    if args.batch_file:
+        output_handle: Optional[TextIO] = None
+        try:
+            if args.batch_output:
+                output_path = Path(args.batch_output).expanduser().resolve()
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_handle = output_path.open("w", encoding="utf-8")
+            summary = run_batch(
+                _read_batch_file(args.batch_file),
+                concurrency=args.concurrency,
+                config_overrides=overrides or None,
+                config_json=args.config,
+                config_path=args.config_file,
+                output=output_handle,
+            )
+        except Exception as exc:  # noqa: BLE001
+            _emit("error", status="failed", message=str(exc), traceback=traceback.format_exc())
+            return 1
+        finally:
+            if output_handle is not None:
+                output_handle.close()
+        return 0 if summary["failed"] == 0 else 1
+
     try:
         run_tradingagents(
             ticker=args.ticker,
             trade_date=args.date,
-            config_overrides=None,
+            config_overrides=overrides or None,
             config_json=args.config,
             config_path=args.config_file,
             result_path=args.result_path,
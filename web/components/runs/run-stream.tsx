@@ -1,6 +1,6 @@
 // ============================================================
 // Modified: See CHANGELOG.md for complete modification history
-// Last Updated: 2025-10-29
+// Last Updated: 2026-10-17
 // Modified By: jimyungkoh<aqaqeqeq0511@gmail.com>
 // ============================================================
 
@@ -118,6 +118,39 @@ function coerceReportSections(
   return sections;
 }
 
+// Appended report text arrives as { offset, delta } under "reports.<section>".
+// A delta that does not line up with the local text is skipped; the next
+// keyframe carries the full section again.
+function applyReportDeltas(
+  sections: Record<string, string>,
+  deltas: Record<string, JsonValue> | null
+): boolean {
+  let changed = false;
+  for (const [path, value] of Object.entries(deltas ?? {})) {
+    if (!path.startsWith("reports.")) {
+      continue;
+    }
+    const key = path.slice("reports.".length);
+    const change = asObject(value);
+    if (!change) {
+      continue;
+    }
+    if (typeof change["value"] === "string") {
+      sections[key] = change["value"] as string;
+      changed = true;
+      continue;
+    }
+    const offset = change["offset"];
+    const delta = change["delta"];
+    const current = sections[key] ?? "";
+    if (typeof offset === "number" && typeof delta === "string" && offset === current.length) {
+      sections[key] = current + delta;
+      changed = true;
+    }
+  }
+  return changed;
+}
+
 function extractStreamMessage(
   payload?: Record<string, JsonValue>
 ): {
@@ -209,11 +242,12 @@ export function RunStream({ run }: RunStreamProps) {
 
         if (raw.event === "state" && raw.payload) {
           const reportUpdates = asObject(raw.payload["reports"]);
-          if (reportUpdates) {
+          const deltaUpdates = asObject(raw.payload["deltas"]);
+          if (reportUpdates || deltaUpdates) {
             setReportSections((prev) => {
               let changed = false;
               const next = { ...prev };
-              for (const [key, value] of Object.entries(reportUpdates)) {
+              for (const [key, value] of Object.entries(reportUpdates ?? {})) {
                 if (typeof value === "string" && value.trim().length > 0) {
                   if (next[key] !== value) {
                     next[key] = value;
@@ -221,6 +255,7 @@ export function RunStream({ run }: RunStreamProps) {
                   }
                 }
               }
+              changed = applyReportDeltas(next, deltaUpdates) || changed;
               return changed ? next : prev;
             });
           }